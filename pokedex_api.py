@@ -0,0 +1,74 @@
+import http.client
+import json
+
+from pokedex_extract import FieldExtractor, extract
+from pokedex_http import HttpClient
+from pokedex_perf import perf
+
+API_URL = "https://pokeapi.co/api/v2"
+# /pokemon 응답(moves, game_indices 때문에 수백 KB)에서 게임/번들/서버가 쓰는 필드. 이것만 뽑아서 쓰고 캐시에도 이것만 저장
+POKEMON_FIELDS = {"name": True, "height": True, "weight": True, "types": True, "sprites": {"front_default": True}}
+
+
+class OfflineMiss(Exception):
+    # 오프라인 모드에서 캐시에 없는 자원을 요청했을 때
+    pass
+
+
+class PokeApi:
+    # 게임에서 쓰는 모든 PokeAPI / 스프라이트 요청의 공용 창구 (디스크 캐시 우선)
+    def __init__(self, cache=None, http=None, offline=False):
+        self.cache = cache
+        self.http = http if http is not None else HttpClient()
+        self.offline = offline
+
+    def get_bytes(self, url, cancel=None):
+        return self._get(url, cancel)
+
+    def get_fields(self, url, fields, cancel=None):
+        # 응답을 받으면서 fields 만 뽑은 dict (전체 문서를 파싱하지 않음). 디스크 캐시에는 뽑은 결과만 저장한다
+        return self._get(url, cancel, fields)
+
+    def _get(self, url, cancel=None, fields=None):
+        if self.cache is not None:
+            data = self.cache.get(url, allow_stale=self.offline)
+            if data is not None: return self._from_cache(data, fields)
+        if self.offline:
+            raise OfflineMiss(url)
+        try:
+            with perf.span("net"):
+                result = self.http.get(url, cancel=cancel, extract=(lambda: FieldExtractor(fields)) if fields else None)
+        except (http.client.HTTPException, OSError):
+            # 네트워크가 안 될 때는 만료된 캐시라도 보여준다
+            data = self.cache.get(url, allow_stale=True) if self.cache is not None else None
+            if data is None: raise
+            return self._from_cache(data, fields)
+        if self.cache is not None:
+            self.cache.set(url, result if fields is None else json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode())
+        return result
+
+    def _from_cache(self, data, fields):
+        if fields is None: return data
+        # 예전에 통째로 저장된 응답도 같은 추출기로 (새로 받으면 뽑은 결과로 바뀜)
+        with perf.span("json"):
+            return extract(data, fields)
+
+    def is_cached(self, url):
+        return self.cache is not None and url in self.cache
+
+    def get_json(self, url, cancel=None):
+        data = self.get_bytes(url, cancel)
+        with perf.span("json"):
+            return json.loads(data.decode())
+
+    def pokemon_url(self, number):
+        return f"{API_URL}/pokemon/{number}"
+
+    def pokemon(self, number, cancel=None):
+        return self.get_fields(self.pokemon_url(number), POKEMON_FIELDS, cancel)
+
+    def species(self, number, cancel=None):
+        return self.get_json(f"{API_URL}/pokemon-species/{number}", cancel)
+
+    def item(self, name, cancel=None):
+        return self.get_json(f"{API_URL}/item/{name}", cancel)
@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import updown_engine as engine
+from pokedex_perf import perf
+
+# 스프라이트 아틀라스: 세대 범위마다 정면 스프라이트를 시트 이미지(PNG) 몇 장에 모아 두고, 위치는 색인(JSON)에 적어 둔다
+#   pokedex_atlas/index.json
+#     sheets : [{"file": "0001-0151-0.png", "group": "0001-0151"}, ...]  (도구 아이콘은 "items" 묶음)
+#     sprites: {"번호": [시트, x, y, w, h, ox, oy, 원래 너비, 원래 높이]}   (투명 여백을 잘라 낸 영역과 원래 이미지 안의 위치)
+#     items  : {"도구 키": [...]}
+# 게임은 세대를 고를 때 그 범위의 시트를 한 번 디코딩해 두고, 스프라이트는 시트에서 잘라 원래 크기로 되돌려 쓴다.
+# (추측/메뉴/도구 아이콘마다 PNG 를 받아 디코딩하던 것을 시트 디코딩 한 번으로 대신함)
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+MAX_SHEET = 1024  # 시트 최대 너비/높이 (넘치면 같은 묶음의 다음 시트)
+PADDING = 1
+
+
+def pack(sizes, max_size=MAX_SHEET, padding=PADDING):
+    # 선반(shelf) 배치: 높은 것부터 왼쪽 -> 오른쪽으로 채우고 줄이 차면 아래로, 시트가 차면 다음 시트로
+    # sizes: {키: (w, h)} -> ({키: (시트, x, y)}, [[시트 너비, 시트 높이], ...])
+    placed, sheets = {}, []
+    x = y = shelf = 0
+    for key, (w, h) in sorted(sizes.items(), key=lambda kv: (-kv[1][1], -kv[1][0], kv[0])):
+        if sheets and x + w > max_size:
+            x, y, shelf = 0, y + shelf + padding, 0
+        if not sheets or y + h > max_size:
+            sheets.append([0, 0])
+            x = y = shelf = 0
+        placed[key] = (len(sheets) - 1, x, y)
+        sheets[-1][0] = max(sheets[-1][0], x + w)
+        sheets[-1][1] = max(sheets[-1][1], y + h)
+        x += w + padding
+        shelf = max(shelf, h)
+    return placed, sheets
+
+
+def _trim(data):
+    # PNG -> (투명 여백을 잘라 낸 RGBA 이미지, ox, oy, 원래 너비, 원래 높이) (완전히 투명하면 None)
+    from PIL import Image
+    image = Image.open(BytesIO(data)).convert("RGBA")
+    box = image.getchannel("A").getbbox()
+    if box is None: return None
+    return image.crop(box), box[0], box[1], image.width, image.height
+
+
+def _write_group(out_dir, group, images, index, entries):
+    # images: {키: _trim 결과} -> 시트 PNG 저장, entries[키] 에 위치 기록
+    from PIL import Image
+    placed, sizes = pack({key: img[0].size for key, img in images.items()})
+    base = len(index["sheets"])
+    sheets = [Image.new("RGBA", tuple(size)) for size in sizes]
+    for key, (sheet, x, y) in placed.items():
+        part, ox, oy, fw, fh = images[key]
+        sheets[sheet].paste(part, (x, y))
+        entries[str(key)] = [base + sheet, x, y, part.width, part.height, ox, oy, fw, fh]
+    for i, sheet in enumerate(sheets):
+        name = f"{group}-{i}.png"
+        sheet.save(os.path.join(out_dir, name), optimize=True)
+        index["sheets"].append({"file": name, "group": group})
+
+
+def build(out_dir, sprite_source, item_source, ranges=None, items=engine.ITEMS, workers=8, log=print):
+    # sprite_source(번호) / item_source(도구 키) -> PNG 바이트 또는 None. ranges 기본값은 세대 프리셋 전체
+    os.makedirs(out_dir, exist_ok=True)
+    ranges = ranges or list(engine.GENERATIONS.values())
+    index = {"version": FORMAT_VERSION, "sheets": [], "sprites": {}, "items": {}}
+    failed = []
+
+    def load(fetch, key):
+        try:
+            data = fetch(key)
+            return _trim(data) if data else None
+        except Exception as e:
+            failed.append((key, e))
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for lo, hi in ranges:
+            images = {n: img for n, img in zip(range(lo, hi + 1), ex.map(lambda n: load(sprite_source, n), range(lo, hi + 1))) if img}
+            if images: _write_group(out_dir, f"{lo:04d}-{hi:04d}", images, index, index["sprites"])
+            log(f"  {lo}~{hi}: 스프라이트 {len(images)}개")
+        icons = {key: img for key, img in zip(items, ex.map(lambda k: load(item_source, k), items)) if img}
+        if icons: _write_group(out_dir, "items", icons, index, index["items"])
+
+    tmp = os.path.join(out_dir, INDEX_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp, os.path.join(out_dir, INDEX_FILE))
+    used = {s["file"] for s in index["sheets"]}
+    for name in os.listdir(out_dir):
+        if name.endswith(".png") and name not in used: os.remove(os.path.join(out_dir, name))
+    total = sum(os.path.getsize(os.path.join(out_dir, name)) for name in used)
+    log(f"완료: {out_dir} (시트 {len(index['sheets'])}장, 스프라이트 {len(index['sprites'])}개, 아이콘 {len(index['items'])}개, "
+        f"{total:,} bytes, 실패 {len(failed)}개)")
+    return failed
+
+
+class SpriteAtlas:
+    def __init__(self, path, max_sheets=4):
+        with open(os.path.join(path, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 아틀라스: {path}")
+        self.path = path
+        self.sheets = index["sheets"]
+        self.sprites = {int(k): v for k, v in index["sprites"].items()}
+        self.items = index["items"]
+        self.max_sheets = max_sheets  # 디코딩해 두는 시트 수 (오래 안 쓴 시트부터 버림)
+        self.decodes = 0
+        self.crops = 0
+        self._loaded = OrderedDict()  # 시트 번호 -> RGBA 이미지
+        self._lock = threading.Lock()
+        self._decode_lock = threading.Lock()  # 같은 시트를 두 스레드가 동시에 디코딩하지 않도록
+
+    @classmethod
+    def open(cls, path):
+        # 아틀라스가 없거나 형식이 다르면 None (개별 스프라이트를 받아서 사용)
+        try: return cls(path)
+        except (OSError, ValueError, KeyError): return None
+
+    def __contains__(self, number):
+        return number in self.sprites
+
+    def has_item(self, key):
+        return key in self.items
+
+    def _sheet(self, i):
+        with self._lock:
+            image = self._loaded.get(i)
+            if image is not None:
+                self._loaded.move_to_end(i)
+                return image
+        with self._decode_lock:
+            with self._lock: image = self._loaded.get(i)
+            if image is not None: return image
+            from PIL import Image
+            with perf.span("atlas.decode"):
+                image = Image.open(os.path.join(self.path, self.sheets[i]["file"]))
+                image.load()
+            with self._lock:
+                self._loaded[i] = image
+                self.decodes += 1
+                while len(self._loaded) > self.max_sheets: self._loaded.popitem(last=False)
+        return image
+
+    def preload(self, lo, hi):
+        # lo~hi 범위의 스프라이트가 든 시트를 미리 디코딩 (한 번에 들고 있을 수 있는 수보다 많으면 그때그때 디코딩)
+        sheets = sorted({self.sprites[n][0] for n in range(lo, hi + 1) if n in self.sprites})
+        if len(sheets) > self.max_sheets: return 0
+        for i in sheets: self._sheet(i)
+        return len(sheets)
+
+    def _crop(self, entry):
+        from PIL import Image
+        sheet, x, y, w, h, ox, oy, fw, fh = entry
+        part = self._sheet(sheet).crop((x, y, x + w, y + h))
+        image = Image.new("RGBA", (fw, fh))
+        image.paste(part, (ox, oy))
+        with self._lock: self.crops += 1
+        return image
+
+    def sprite(self, number):
+        # 원래 크기의 RGBA 스프라이트 (없으면 None)
+        entry = self.sprites.get(number)
+        return None if entry is None else self._crop(entry)
+
+    def item(self, key):
+        entry = self.items.get(key)
+        return None if entry is None else self._crop(entry)
+
+    def stats(self):
+        with self._lock:
+            return {"sheets": len(self.sheets), "loaded": len(self._loaded), "decodes": self.decodes, "crops": self.crops}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스프라이트 아틀라스 빌드/확인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="세대 프리셋별 스프라이트 시트와 도구 아이콘 시트 생성 (번들이 있으면 번들의 스프라이트 사용)")
+    p_build.add_argument("--out", default="pokedex_atlas")
+    p_build.add_argument("--bundle", default="pokedex.bundle")
+    p_build.add_argument("--last", type=int, default=1025, help="이 번호까지만 (예: 151 이면 1세대만)")
+    p_build.add_argument("--workers", type=int, default=8)
+    p_info = sub.add_parser("info", help="아틀라스 정보 출력")
+    p_info.add_argument("path", nargs="?", default="pokedex_atlas")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from pokedex_api import PokeApi
+        from pokedex_bundle import PokedexBundle
+        from pokedex_cache import DiskCache
+        from pokedex_http import HttpClient
+        api = PokeApi(DiskCache("pokedex_cache", max_bytes=512 * 1024 * 1024), HttpClient(pool_size=args.workers))
+        bundle = PokedexBundle.open(args.bundle)
+
+        def sprite_source(number):
+            data = bundle.sprite(number) if bundle is not None and number in bundle else None
+            if data: return bytes(data)
+            url = api.pokemon(number)["sprites"]["front_default"]
+            return api.get_bytes(url) if url else None
+
+        def item_source(key):
+            url = api.item(key)["sprites"]["default"]
+            return api.get_bytes(url) if url else None
+
+        ranges = [(lo, min(hi, args.last)) for lo, hi in engine.GENERATIONS.values() if lo <= args.last]
+        build(args.out, sprite_source, item_source, ranges, workers=args.workers)
+    else:
+        atlas = SpriteAtlas.open(args.path)
+        if atlas is None:
+            raise SystemExit(f"아틀라스를 열 수 없습니다: {args.path}")
+        for i, sheet in enumerate(atlas.sheets):
+            n = sum(1 for e in atlas.sprites.values() if e[0] == i) + sum(1 for e in atlas.items.values() if e[0] == i)
+            print(f"  {sheet['file']}: {n}개, {os.path.getsize(os.path.join(args.path, sheet['file'])):,} bytes")
+        print(f"{args.path}: 시트 {len(atlas.sheets)}장, 스프라이트 {len(atlas.sprites)}개, 아이콘 {len(atlas.items)}개")
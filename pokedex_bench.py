@@ -0,0 +1,278 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from io import BytesIO
+
+import updown_engine as engine
+from pokedex_api import API_URL, PokeApi
+from pokedex_cache import DiskCache, ImageCache
+from pokedex_log import AdventureLog, ReverseReader
+from pokedex_transport import FixtureServer, FixtureStore, ReplayTransport
+from pokedex_worker import PRIORITY_GUESS, WorkerPool
+
+# 성능 벤치마크 모음 (네트워크 없이 로컬 대역 서버 + 합성 픽스처로 실행)
+#   guess    : 추측 -> 상단 화면에 올릴 데이터/이미지 준비까지 (콜드 / 웜)
+#   history  : 기록 저장(save_record) / PC 박스 첫 두 페이지 읽기(ReverseReader, 표에 넣는 시간은 제외) / 전체 개수, 기록 수별
+#   decode   : 스프라이트 디코딩 + 리사이즈 (180/120/40px)
+#   engine   : 규칙 엔진 처리량
+# guess/decode 는 Pillow 가 필요하다 (실제 임포트는 그 항목을 실행할 때, 없으면 건너뜀).
+# 결과는 키 순서가 고정된 JSON 으로 저장되어, 기준선(bench_baseline.json)과의 차이가 그대로 diff 로 보인다.
+
+BASELINE_FILE = "bench_baseline.json"
+SPRITE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{}.png"
+SPRITE_SIZES = ((180, 180), (120, 120), (40, 40))  # 상단 화면 / 메인 메뉴 / 아이템 아이콘
+
+
+def _sprite_png(rng, size=96):
+    # 실제 스프라이트처럼 투명 배경 위에 색 덩어리가 있는 96px PNG
+    from PIL import Image
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    px = img.load()
+    cx, cy, r = size // 2, size // 2, size // 3
+    color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+    for y in range(size):
+        for x in range(size):
+            if (x - cx) ** 2 + (y - cy) ** 2 < r * r:
+                px[x, y] = color if rng.random() < 0.9 else (0, 0, 0, 255)
+    buf = BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def make_fixtures(path, numbers, seed=0):
+    # PokeAPI 와 비슷한 크기/모양의 합성 응답 (실제 /pokemon 응답은 moves 목록 때문에 수십~수백 KB)
+    rng = random.Random(seed)
+    store = FixtureStore(path)
+    for n in numbers:
+        moves = [{"move": {"name": f"move-{i}", "url": f"{API_URL}/move/{i}/"},
+                  "version_group_details": [{"level_learned_at": i % 50, "move_learn_method": {"name": "level-up", "url": ""},
+                                             "version_group": {"name": f"vg-{v}", "url": ""}} for v in range(8)]}
+                 for i in range(60)]
+        pokemon = {"id": n, "name": f"pokemon-{n}", "height": 4 + n % 20, "weight": 60 + n % 900,
+                   "types": [{"slot": 1, "type": {"name": ("normal", "fire", "water", "grass", "electric")[n % 5], "url": ""}}],
+                   "sprites": {"front_default": SPRITE_URL.format(n)}, "moves": moves}
+        species = {"id": n, "names": [{"language": {"name": "ko"}, "name": f"포켓몬{n}"}, {"language": {"name": "en"}, "name": f"Pokemon{n}"}],
+                   "flavor_text_entries": [{"language": {"name": "ko"}, "flavor_text": "합성 도감 설명입니다.\n벤치마크용."}] * 20}
+        store.put(f"{API_URL}/pokemon/{n}", 200, json.dumps(pokemon).encode())
+        store.put(f"{API_URL}/pokemon-species/{n}", 200, json.dumps(species, ensure_ascii=False).encode())
+        store.put(SPRITE_URL.format(n), 200, _sprite_png(rng))
+    return store
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _tk_root():
+    # 디스플레이가 있으면 PhotoImage 생성까지 측정 (없으면 디코딩까지만)
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+def bench_guess(results, count=30, latency_ms=20, jitter_ms=10, seed=0, log=print):
+    # 게임의 _get_pokemon_data 와 같은 흐름: pokemon/species 동시 요청 -> 스프라이트 -> 180px 디코딩 (-> PhotoImage)
+    from PIL import Image
+    tmp = tempfile.mkdtemp(prefix="pokedex-bench-")
+    numbers = list(range(1, count + 1))
+    root = _tk_root()
+    try:
+        store = make_fixtures(os.path.join(tmp, "fixtures"), numbers, seed)
+        server = FixtureServer(store, latency_ms=latency_ms, jitter_ms=jitter_ms, seed=seed).start()
+        api = PokeApi(DiskCache(os.path.join(tmp, "cache")), ReplayTransport(server.url))
+        workers = WorkerPool(max_workers=4)
+        images = ImageCache()
+
+        def guess_to_render(n):
+            f_p = workers.submit(("pokemon", n), api.pokemon, n, priority=PRIORITY_GUESS)
+            f_s = workers.submit(("species", n), api.species, n, priority=PRIORITY_GUESS)
+            url = f_p.result()["sprites"]["front_default"]
+            image = images.get(url, (180, 180))
+            if image is None:
+                data = workers.submit(("bytes", url), api.get_bytes, url, priority=PRIORITY_GUESS).result()
+                image = Image.open(BytesIO(data)).resize((180, 180), Image.NEAREST)
+                images.put(url, (180, 180), image)
+            f_s.result()
+            if root is not None:
+                from PIL import ImageTk
+                ImageTk.PhotoImage(image, master=root)
+
+        for phase in ("cold", "warm"):
+            samples = []
+            for n in numbers:
+                t0 = time.perf_counter()
+                guess_to_render(n)
+                samples.append((time.perf_counter() - t0) * 1000)
+            results[f"guess_to_render.{phase}.p50_ms"] = (statistics.median(samples), "ms", "lower")
+            results[f"guess_to_render.{phase}.p95_ms"] = (_percentile(samples, 0.95), "ms", "lower")
+            log(f"  추측 -> 화면 ({phase}): p50 {statistics.median(samples):.1f}ms, p95 {_percentile(samples, 0.95):.1f}ms")
+        workers.shutdown()
+        server.stop()
+    finally:
+        if root is not None: root.destroy()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return "tk" if root is not None else "headless"
+
+
+def _write_history(path, n):
+    record = {"date": "2026-01-01 12:00", "pokemon": "피카츄 (No.25)", "generation": "1세대: 관동 (1~151)",
+              "attempts": "5회", "items": "스코프렌즈"}
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    chunk = line * 10000
+    with open(path, "wb") as f:
+        for _ in range(n // 10000): f.write(chunk)
+        f.write(line * (n % 10000))
+
+
+def bench_history(results, sizes=(10_000, 100_000, 1_000_000), appends=100, page_size=50, log=print):
+    tmp = tempfile.mkdtemp(prefix="pokedex-bench-")
+    try:
+        for n in sizes:
+            path = os.path.join(tmp, f"log-{n}.jsonl")
+            _write_history(path, n)
+            history = AdventureLog(path)
+            history.compactor.join()  # 시작 시 정리 작업이 측정에 섞이지 않도록
+
+            # save_record: 기록 수와 무관하게 한 줄 덧붙이기 + fsync
+            record = {"date": datetime.now().strftime("%Y-%m-%d %H:%M"), "pokemon": "이상해씨 (No.1)",
+                      "generation": "1세대: 관동 (1~151)", "attempts": "3회", "items": "사용 안함"}
+            samples = []
+            for _ in range(appends):
+                t0 = time.perf_counter()
+                history.append(record)
+                samples.append((time.perf_counter() - t0) * 1000)
+            results[f"history.save_record.{n}.p50_ms"] = (statistics.median(samples), "ms", "lower")
+
+            # PC 박스 첫 화면에 필요한 최신 기록 두 페이지(화면 + 미리 읽기)를 읽는 시간 (행을 표에 넣는 시간은 제외)
+            samples = []
+            for _ in range(20):
+                t0 = time.perf_counter()
+                reader = ReverseReader(path)
+                reader.next_page(page_size * 2)
+                reader.close()
+                samples.append((time.perf_counter() - t0) * 1000)
+            results[f"history.first_page.{n}.p50_ms"] = (statistics.median(samples), "ms", "lower")
+
+            # 전체 개수 (PC 박스 상단, 백그라운드) - 캐시 없이 처음 셀 때
+            fresh = AdventureLog(path)
+            fresh.compactor.join()
+            t0 = time.perf_counter()
+            total = fresh.count()
+            results[f"history.count.{n}.ms"] = ((time.perf_counter() - t0) * 1000, "ms", "lower")
+            log(f"  기록 {n:,}건: 저장 p50 {results[f'history.save_record.{n}.p50_ms'][0]:.2f}ms, "
+                f"첫 페이지 p50 {results[f'history.first_page.{n}.p50_ms'][0]:.2f}ms, 개수({total:,}) {results[f'history.count.{n}.ms'][0]:.1f}ms")
+            os.remove(path)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_decode(results, seconds=1.0, log=print):
+    from PIL import Image
+    data = _sprite_png(random.Random(0))
+    for size in SPRITE_SIZES:
+        ops = 0
+        t0 = time.perf_counter()
+        while True:
+            Image.open(BytesIO(data)).resize(size, Image.NEAREST)
+            ops += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= seconds: break
+        results[f"decode.{size[0]}px.ops_per_s"] = (ops / elapsed, "ops/s", "higher")
+        log(f"  디코딩 + 리사이즈 {size[0]}px: {ops / elapsed:,.0f}회/초")
+
+
+def bench_engine(results, games=100_000, seed=0, log=print):
+    rand = random.Random(seed).random
+    lo, hi = engine.GENERATIONS["1세대: 관동 (1~151)"]
+    steps = 0
+    t0 = time.perf_counter()
+    for _ in range(games):
+        s = engine.GameState(lo, hi, lo + int(rand() * (hi - lo + 1)))
+        while True:
+            steps += 1
+            event = engine.guess(s, (s.lo + s.hi) // 2)
+            if event is engine.CAUGHT or event is engine.LOST: break
+    elapsed = time.perf_counter() - t0
+    results["engine.steps_per_s"] = (steps / elapsed, "steps/s", "higher")
+    results["engine.games_per_s"] = (games / elapsed, "games/s", "higher")
+    log(f"  규칙 엔진: {steps / elapsed:,.0f}스텝/초, {games / elapsed:,.0f}판/초")
+
+
+def run(only=None, quick=False, log=print):
+    results = {}
+    mode = "headless"
+    suites = only or ("guess", "history", "decode", "engine")
+    if importlib.util.find_spec("PIL") is None and {"guess", "decode"} & set(suites):
+        log("Pillow 가 없어 guess/decode 는 건너뜁니다 (pip install pillow)")
+        suites = [s for s in suites if s not in ("guess", "decode")]
+    if "guess" in suites:
+        log("[guess]")
+        mode = bench_guess(results, count=10 if quick else 30, log=log)
+    if "history" in suites:
+        log("[history]")
+        bench_history(results, sizes=(1_000, 10_000) if quick else (10_000, 100_000, 1_000_000), appends=20 if quick else 100, log=log)
+    if "decode" in suites:
+        log("[decode]")
+        bench_decode(results, seconds=0.2 if quick else 1.0, log=log)
+    if "engine" in suites:
+        log("[engine]")
+        bench_engine(results, games=10_000 if quick else 100_000, log=log)
+    return {
+        "meta": {"date": datetime.now().strftime("%Y-%m-%d %H:%M"), "python": platform.python_version(),
+                 "platform": platform.platform(), "render": mode, "quick": quick},
+        "results": {k: {"value": round(v, 3), "unit": unit, "better": better} for k, (v, unit, better) in sorted(results.items())},
+    }
+
+
+def compare(current, baseline, threshold=0.2, log=print):
+    # 기준선 대비 threshold(비율) 이상 나빠진 항목 목록
+    regressions = []
+    for key, cur in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None or not base["value"]: continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        worse = change > threshold if cur["better"] == "lower" else change < -threshold
+        mark = "  <-- 느려짐" if worse else ""
+        log(f"  {key:<40}{base['value']:>14,.3f} -> {cur['value']:>14,.3f} {cur['unit']:<8}{change:>+8.1%}{mark}")
+        if worse: regressions.append(key)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="포켓몬 도감 성능 벤치마크 (로컬 대역 서버 사용, 네트워크 불필요)")
+    parser.add_argument("--only", nargs="+", choices=["guess", "history", "decode", "engine"], help="일부 항목만 실행")
+    parser.add_argument("--quick", action="store_true", help="작은 규모로 빠르게 실행 (기록 1천/1만 건 등)")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", action="store_true", help=f"결과를 기준선({BASELINE_FILE})으로 저장")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_FILE, help="기준선과 비교 (나빠진 항목이 있으면 종료 코드 1)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 변화 비율 (기본 20%%)")
+    args = parser.parse_args()
+
+    report = run(args.only, args.quick)
+    for path in filter(None, [args.out, BASELINE_FILE if args.save_baseline else None]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"저장: {path}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n기준선 비교 ({args.compare}, {baseline['meta']['date']})")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 항목이 {args.threshold:.0%} 이상 나빠졌습니다.")
+            sys.exit(1)
@@ -0,0 +1,204 @@
+import argparse
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+# 오프라인 도감 번들 파일 구조 (리틀 엔디언)
+#   헤더 | 고정 폭 레코드 인덱스 (first~last 번호마다 1개) | 문자열 테이블(UTF-8) | 스프라이트 영역(PNG)
+# 번호 -> 레코드 위치가 곧바로 계산되므로 조회는 O(1)이고, mmap 으로 열어서 필요한 부분만 읽힌다.
+MAGIC = b"PKDXBNDL"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHIHHQQQQ")   # magic, 포맷 버전, 데이터 버전, first, last, 문자열 위치/크기, 스프라이트 위치/크기
+_RECORD = struct.Struct("<BBBxHHIHIHIHII")  # flags, type1, type2, 키, 몸무게, 한글 이름, 영어 이름, 설명(위치/길이), 스프라이트(위치/길이)
+_PRESENT = 1
+
+# 타입 번호표 (게임의 type_map 과 같은 순서)
+TYPE_NAMES = ("normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground", "flying",
+              "psychic", "bug", "rock", "ghost", "dragon", "steel", "dark", "fairy", "stellar")
+_NO_TYPE = 0xFF
+
+
+class PokedexBundle:
+    # 빌드된 번들을 mmap 으로 열어 번호별 도감 데이터를 네트워크 없이 돌려준다
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)  # 빈 파일이면 ValueError
+        except Exception:
+            self._file.close()
+            raise
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"지원하지 않는 번들 파일: {path}")
+        (magic, self.format_version, self.data_version, self.first, self.last,
+         self._str_off, self._str_size, self._spr_off, self._spr_size) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or self.format_version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 번들 파일: {path}")
+
+    @classmethod
+    def open(cls, path):
+        # 파일이 없거나 형식이 다르면 None (게임은 라이브 API 만 사용)
+        try: return cls(path)
+        except (OSError, ValueError): return None
+
+    def _record(self, number):
+        if not self.first <= number <= self.last: return None
+        rec = _RECORD.unpack_from(self._mm, _HEADER.size + (number - self.first) * _RECORD.size)
+        return rec if rec[0] & _PRESENT else None
+
+    def _string(self, off, length):
+        start = self._str_off + off
+        return self._mm[start:start + length].decode("utf-8")
+
+    def __contains__(self, number):
+        return self._record(number) is not None
+
+    def get(self, number):
+        rec = self._record(number)
+        if rec is None: return None
+        _, t1, t2, height, weight, ko_off, ko_len, en_off, en_len, fl_off, fl_len, spr_off, spr_len = rec
+        return {
+            "number": number,
+            "name_ko": self._string(ko_off, ko_len),
+            "name_en": self._string(en_off, en_len),
+            "types": [TYPE_NAMES[t] for t in (t1, t2) if t != _NO_TYPE],
+            "height": height,
+            "weight": weight,
+            "flavor": self._string(fl_off, fl_len),
+            "has_sprite": spr_len > 0,
+        }
+
+    def sprite(self, number):
+        rec = self._record(number)
+        if rec is None or rec[12] == 0: return None
+        start = self._spr_off + rec[11]
+        return self._mm[start:start + rec[12]]
+
+    def numbers(self):
+        return [n for n in range(self.first, self.last + 1) if n in self]
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+def fetch_entry(api, number, sprite=True):
+    # 게임 화면에 쓰는 필드만 뽑아서 번들 엔트리로 만든다 (sprite=False 면 스프라이트는 받지 않음)
+    d_m = api.pokemon(number)
+    d_s = api.species(number)
+    name_ko = name_en = d_m["name"]
+    for n in d_s["names"]:
+        if n["language"]["name"] == "ko": name_ko = n["name"]
+        elif n["language"]["name"] == "en": name_en = n["name"]
+    flavor = "설명 없음"
+    for d in d_s["flavor_text_entries"]:
+        if d["language"]["name"] == "ko":
+            flavor = d["flavor_text"].replace("\n", " ").replace("\f", " ")
+            break
+    img_url = d_m["sprites"]["front_default"]
+    return {
+        "number": number, "name_ko": name_ko, "name_en": name_en,
+        "types": [t["type"]["name"] for t in d_m["types"]],
+        "height": d_m["height"], "weight": d_m["weight"], "flavor": flavor,
+        "sprite": bytes(api.get_bytes(img_url)) if img_url and sprite else b"",
+    }
+
+
+def write_bundle(path, entries, first, last, data_version):
+    strings = bytearray()
+    sprites = bytearray()
+
+    def add_string(text):
+        raw = text.encode("utf-8")[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")  # 길이 한도에서 글자 중간이 잘리지 않게
+        off = len(strings)
+        strings.extend(raw)
+        return off, len(raw)
+
+    records = bytearray()
+    for number in range(first, last + 1):
+        e = entries.get(number)
+        if e is None:
+            records.extend(_RECORD.pack(0, _NO_TYPE, _NO_TYPE, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0))
+            continue
+        type_ids = [TYPE_NAMES.index(t) if t in TYPE_NAMES else _NO_TYPE for t in e["types"][:2]]
+        type_ids += [_NO_TYPE] * (2 - len(type_ids))
+        spr_off = len(sprites)
+        sprites.extend(e["sprite"])
+        records.extend(_RECORD.pack(_PRESENT, type_ids[0], type_ids[1],
+                                    min(e["height"], 0xFFFF), min(e["weight"], 0xFFFF),
+                                    *add_string(e["name_ko"]), *add_string(e["name_en"]), *add_string(e["flavor"]),
+                                    spr_off, len(e["sprite"])))
+
+    str_off = _HEADER.size + len(records)
+    spr_off = str_off + len(strings)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, data_version, first, last, str_off, len(strings), spr_off, len(sprites)))
+        f.write(records)
+        f.write(strings)
+        f.write(sprites)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def build(path, api, first=1, last=1025, workers=8, log=print):
+    # 기존 번들이 있으면 이미 들어 있는 번호는 그대로 재사용하고 빠진 번호만 새로 받는다 (증분 빌드)
+    # 요청 범위 밖의 기존 항목도 그대로 두고, 기존 범위와 합친 범위로 다시 쓴다
+    entries = {}
+    data_version = 1
+    out_first, out_last = first, last
+    old = PokedexBundle.open(path)
+    if old is not None:
+        data_version = old.data_version + 1
+        out_first, out_last = min(first, old.first), max(last, old.last)
+        for number in old.numbers():
+            e = old.get(number)
+            e["sprite"] = bytes(old.sprite(number) or b"")
+            entries[number] = e
+        old.close()
+
+    missing = [n for n in range(first, last + 1) if n not in entries]
+    log(f"번들 빌드: {len(entries)}개 재사용, {len(missing)}개 다운로드")
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {n: ex.submit(fetch_entry, api, n) for n in missing}
+        for i, (number, fut) in enumerate(futures.items(), 1):
+            try: entries[number] = fut.result()
+            except Exception as e: failed.append((number, e))
+            if i % 50 == 0: log(f"  {i}/{len(missing)}")
+
+    write_bundle(path, entries, out_first, out_last, data_version)
+    log(f"완료: {path} (데이터 버전 {data_version}, 범위 {out_first}~{out_last}, {len(entries)}개 수록, 실패 {len(failed)}개)")
+    return failed
+
+
+if __name__ == "__main__":
+    from pokedex_api import PokeApi
+    from pokedex_cache import DiskCache
+    from pokedex_http import HttpClient
+
+    parser = argparse.ArgumentParser(description="오프라인 도감 번들 빌드/확인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="PokeAPI 에서 받아 번들 생성 (기존 번들은 증분 갱신)")
+    p_build.add_argument("--out", default="pokedex.bundle")
+    p_build.add_argument("--first", type=int, default=1)
+    p_build.add_argument("--last", type=int, default=1025)
+    p_build.add_argument("--workers", type=int, default=8)
+    p_info = sub.add_parser("info", help="번들 정보 출력")
+    p_info.add_argument("path", nargs="?", default="pokedex.bundle")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        api = PokeApi(DiskCache("pokedex_cache", max_bytes=512 * 1024 * 1024), HttpClient(pool_size=args.workers))
+        build(args.out, api, args.first, args.last, args.workers)
+    else:
+        bundle = PokedexBundle.open(args.path)
+        if bundle is None:
+            raise SystemExit(f"번들을 열 수 없습니다: {args.path}")
+        count = len(bundle.numbers())
+        print(f"{args.path}: 포맷 v{bundle.format_version}, 데이터 버전 {bundle.data_version}, "
+              f"범위 {bundle.first}~{bundle.last}, 수록 {count}개, 크기 {os.path.getsize(args.path):,} bytes")
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+# 엔트리 파일 구조: [저장 시각(double, 8바이트)] + 원본 바이트
+# 파일 mtime 은 "마지막 사용 시각"으로 쓰이고, TTL 은 헤더의 저장 시각으로 판단한다.
+_HEADER = struct.Struct("<d")
+
+
+class DiskCache:
+    # PokeAPI 응답과 스프라이트를 함께 담는 디스크 캐시 (TTL + 용량 제한 LRU)
+    def __init__(self, path="pokedex_cache", max_bytes=64 * 1024 * 1024, ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = {}  # 파일명 -> [크기, 마지막 사용 시각]
+        self._total = 0
+        os.makedirs(self.path, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        for name in os.listdir(self.path):
+            full = os.path.join(self.path, name)
+            if name.endswith(".tmp"):  # 쓰다가 중단된 임시 파일 정리
+                try: os.remove(full)
+                except OSError: pass
+                continue
+            try: st = os.stat(full)
+            except OSError: continue
+            self._entries[name] = [st.st_size, st.st_mtime]
+            self._total += st.st_size
+
+    def _file_name(self, key):
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get(self, key, allow_stale=False):
+        name = self._file_name(key)
+        full = os.path.join(self.path, name)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self.misses += 1
+                return None
+        try:
+            with open(full, "rb") as f:
+                raw = f.read()
+        except OSError:
+            raw = b""
+        if len(raw) < _HEADER.size:  # 외부에서 지워졌거나 깨진 파일
+            self._forget(name)
+            with self._lock: self.misses += 1
+            return None
+
+        now = time.time()
+        saved_at, = _HEADER.unpack_from(raw)
+        if not allow_stale and self.ttl and now - saved_at > self.ttl:
+            # 만료된 엔트리는 지우지 않고 남겨둔다 (오프라인 모드에서 재사용)
+            with self._lock: self.misses += 1
+            return None
+
+        with self._lock:
+            entry[1] = now
+            self.hits += 1
+        try: os.utime(full, (now, now))
+        except OSError: pass
+        return raw[_HEADER.size:]
+
+    def set(self, key, data):
+        name = self._file_name(key)
+        full = os.path.join(self.path, name)
+        tmp = f"{full}.{threading.get_ident()}.tmp"
+        now = time.time()
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(now))
+                f.write(data)
+            os.replace(tmp, full)  # 읽는 쪽에서 반쯤 쓰인 파일을 보지 않도록 교체 방식으로 저장
+        except OSError:
+            try: os.remove(tmp)
+            except OSError: pass
+            return
+        size = _HEADER.size + len(data)
+        with self._lock:
+            old = self._entries.get(name)
+            if old: self._total -= old[0]
+            self._entries[name] = [size, now]
+            self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # 한 번 넘치면 90% 까지 비워서 매 저장마다 정리가 반복되지 않게 한다
+        target = self.max_bytes * 0.9
+        for name, (size, _) in sorted(self._entries.items(), key=lambda kv: kv[1][1]):
+            if self._total <= target: break
+            try: os.remove(os.path.join(self.path, name))
+            except OSError: pass
+            del self._entries[name]
+            self._total -= size
+            self.evictions += 1
+
+    def __contains__(self, key):
+        # 통계에 잡히지 않는 단순 존재 확인 (만료 여부는 보지 않음)
+        with self._lock: return self._file_name(key) in self._entries
+
+    def _forget(self, name):
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry: self._total -= entry[0]
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._entries):
+                try: os.remove(os.path.join(self.path, name))
+                except OSError: pass
+            self._entries.clear()
+            self._total = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class ImageCache:
+    # 디코딩 + 리사이즈가 끝난 PIL 이미지 메모리 캐시 ((자원, 크기) 키, 바이트 예산 LRU)
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()  # (자원, 크기) -> (이미지, 바이트 수)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _nbytes(image):
+        w, h = image.size
+        return w * h * len(image.getbands())
+
+    def get(self, resource, size):
+        key = (resource, size)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __contains__(self, key):
+        with self._lock: return key in self._items
+
+    def put(self, resource, size, image):
+        key = (resource, size)
+        nbytes = self._nbytes(image)
+        if nbytes > self.max_bytes: return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old: self._total -= old[1]
+            self._items[key] = (image, nbytes)
+            self._total += nbytes
+            while self._total > self.max_bytes:
+                _, (_, freed) = self._items.popitem(last=False)
+                self._total -= freed
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._total, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,62 @@
+import itertools
+import threading
+
+from pokedex_perf import perf
+
+# 백그라운드 작업 결과를 Tk 메인 스레드로 넘기는 창구
+# 작업 스레드(Future 완료 콜백)는 post() 로 콜백을 넣기만 하고 Tk 객체(라벨, PhotoImage)는 건드리지 않는다.
+# 메인 스레드의 after() 펌프가 frame_ms 마다 쌓인 콜백을 한 번에 실행하므로, 짧은 시간에 몰린 결과도
+# 프레임당 한 번의 처리로 끝난다. 같은 key 로 들어온 콜백은 마지막 것만 (merge 를 주면 인자를 합쳐서) 실행된다.
+
+
+class UiDispatcher:
+    def __init__(self, widget, frame_ms=16):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.posted = 0
+        self.coalesced = 0  # 같은 key 의 대기 중 콜백에 합쳐진 수
+        self.frames = 0     # 실제로 처리할 것이 있었던 프레임 수
+        self._pending = {}  # key -> [fn, args, kwargs] (삽입 순서대로 실행)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._job = None
+
+    def post(self, fn, *args, key=None, merge=None, **kwargs):
+        # 어느 스레드에서나 호출 가능. merge(이전 kwargs, 새 kwargs) -> 합친 kwargs (args 가 같을 때만)
+        with self._lock:
+            self.posted += 1
+            if key is None:
+                key = (None, next(self._seq))
+            else:
+                prev = self._pending.pop(key, None)
+                if prev is not None:
+                    self.coalesced += 1
+                    if merge is not None and prev[1] == args: kwargs = merge(prev[2], kwargs)
+            self._pending[key] = [fn, args, kwargs]
+
+    def start(self):
+        if self._job is None: self._job = self.widget.after(self.frame_ms, self._pump)
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _pump(self):
+        self.flush()
+        self._job = self.widget.after(self.frame_ms, self._pump)
+
+    def flush(self):
+        # 메인 스레드 전용: 대기 중인 콜백을 모두 실행
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch: return
+        self.frames += 1
+        with perf.span("ui.frame"):
+            for fn, args, kwargs in batch.values():
+                try: fn(*args, **kwargs)
+                except Exception as e: print(f"화면 갱신 오류: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {"posted": self.posted, "coalesced": self.coalesced, "frames": self.frames, "pending": len(self._pending)}
@@ -0,0 +1,172 @@
+import json
+import re
+
+# 큰 JSON 응답에서 필요한 필드만 꺼내는 점진(스트리밍) 추출기
+# 응답을 조각(bytes) 단위로 받으면서 훑고, fields 에 적힌 값만 json.loads 로 만들고 나머지(moves, game_indices 등)는
+# 파이썬 객체를 만들지 않고 건너뛴다. 필요한 값을 모두 찾으면 그 자리에서 멈추므로 나머지 응답은 읽지 않아도 된다.
+#   fields: {"키": True, "하위 객체 키": {"키": True}}  (최상위는 객체여야 함)
+# 건너뛰기는 정규식(소유 한정자)으로 C 수준에서 처리하고, 파이썬 반복은 정규식이 한 번에 넘지 못한 깊은 괄호에서만 돈다.
+
+_STR = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'  # 문자열 (루프를 펼친 형태가 교대(|) 형태보다 두 배쯤 빠름)
+_PLAIN = rb'[^"\[\]{}]*+'
+
+
+def _nested(levels):
+    # 괄호가 levels 단계까지 중첩된 값들을 한 번에 넘는 패턴 (더 깊거나 조각 경계에서 잘린 괄호에서는 멈춤)
+    alts = _STR
+    if levels > 0:
+        inner = _nested(levels - 1)
+        alts += rb'|\{' + inner + rb'\}|\[' + inner + rb'\]'
+    return _PLAIN + rb'(?:(?:' + alts + rb')' + _PLAIN + rb')*+'
+
+
+_STRING = re.compile(_STR)
+_RUN = re.compile(_nested(3))  # 더 깊게 해도 /pokemon 응답에서는 빨라지지 않음
+_SCALAR = re.compile(rb'[^,}\]\s]+')
+_WS = re.compile(rb'[ \t\r\n]*+')
+
+_QUOTE, _COLON, _COMMA = ord('"'), ord(":"), ord(",")
+_OPEN, _CLOSE = frozenset(b"{["), frozenset(b"}]")
+_LBRACE, _RBRACE = ord("{"), ord("}")
+_KEY, _AFTER_KEY, _VALUE, _NEXT = range(4)
+
+
+def _leaves(fields):
+    return sum(_leaves(v) if isinstance(v, dict) else 1 for v in fields.values())
+
+
+class FieldExtractor:
+    def __init__(self, fields):
+        self.fields = fields
+        self.result = {}
+        self.done = False
+        self.bytes_fed = 0
+        self._buf = b""
+        self._pos = 0
+        self._started = False
+        self._stack = []     # 열려 있는 객체: [fields, 결과 dict, 상태, 현재 키, 본 키 집합]
+        self._value = None   # 건너뛰거나 꺼내는 중인 값: [시작 위치, 이어 읽을 위치, 괄호 깊이, 꺼낼지]
+        self._left = _leaves(fields)
+
+    def feed(self, chunk):
+        # 조각을 더 읽는다. 필요한 필드를 다 찾았거나 최상위 객체가 닫혔으면 True (더 넣을 필요 없음)
+        if self.done: return True
+        self.bytes_fed += len(chunk)
+        self._buf = self._buf[self._pos:] + chunk if self._pos else self._buf + chunk
+        if self._value is not None:
+            self._value[0] -= self._pos
+            self._value[1] -= self._pos
+        self._pos = 0
+        self._run()
+        # 처리가 끝난 앞부분은 버린다 (꺼내는 중인 값은 시작부터, 건너뛰는 값은 이어 읽을 위치부터 남김)
+        if self._value is not None:
+            self._pos = self._value[0] if self._value[3] else self._value[1]
+        return self.done
+
+    def close(self):
+        # 입력이 끝났을 때 호출. 꺼낸 dict (최상위 객체가 닫히기 전에 끝났으면 ValueError)
+        if not self.done: raise ValueError("JSON 이 끝나기 전에 입력이 끝났습니다")
+        return self.result
+
+    def _run(self):
+        buf, pos, n = self._buf, self._pos, len(self._buf)
+        while not self.done:
+            if self._value is not None:
+                end = self._scan_value(buf, n)
+                if end is None: return
+                start, capture = self._value[0], self._value[3]
+                self._value = None
+                frame = self._stack[-1]
+                if capture:
+                    spec = frame[0][frame[3]]
+                    frame[1][frame[3]] = json.loads(buf[start:end])
+                    self._found(_leaves(spec) if isinstance(spec, dict) else 1)
+                frame[2] = _NEXT
+                pos = self._pos = end
+                continue
+            pos = _WS.match(buf, pos).end()
+            self._pos = pos
+            if pos >= n: return
+            c = buf[pos]
+            if not self._stack:
+                if self._started or c != _LBRACE: raise ValueError("최상위 값이 객체가 아닙니다")
+                self._started = True
+                self._stack.append([self.fields, self.result, _KEY, None, set()])
+                pos += 1
+                continue
+            frame = self._stack[-1]
+            state = frame[2]
+            if state == _KEY:
+                if c == _RBRACE:
+                    self._close_object()
+                    pos += 1
+                    continue
+                if c != _QUOTE: raise ValueError(f"키가 와야 할 자리: {pos}")
+                m = _STRING.match(buf, pos)
+                if m is None: return  # 조각 경계에서 잘린 키
+                frame[3] = json.loads(m.group())
+                frame[4].add(frame[3])
+                frame[2] = _AFTER_KEY
+                pos = m.end()
+            elif state == _AFTER_KEY:
+                if c != _COLON: raise ValueError(f"':' 가 와야 할 자리: {pos}")
+                frame[2] = _VALUE
+                pos += 1
+            elif state == _VALUE:
+                spec = frame[0].get(frame[3])
+                if isinstance(spec, dict) and c == _LBRACE:
+                    # 필요한 하위 객체는 안으로 들어가서 필요한 키만 꺼낸다
+                    frame[2] = _NEXT
+                    child = frame[1][frame[3]] = {}
+                    self._stack.append([spec, child, _KEY, None, set()])
+                    pos += 1
+                else:
+                    self._value = [pos, pos, 0, spec is not None]
+                    self._pos = pos
+            else:
+                if c == _COMMA: frame[2] = _KEY
+                elif c == _RBRACE: self._close_object()
+                else: raise ValueError(f"',' 또는 '}}' 가 와야 할 자리: {pos}")
+                pos += 1
+        self._pos = pos
+
+    def _scan_value(self, buf, n):
+        # 값 하나의 끝 위치 (조각이 더 필요하면 None, 이어 읽을 위치와 깊이는 self._value 에 남김)
+        v = self._value
+        i, depth = v[1], v[2]
+        if depth == 0:
+            c = buf[i]
+            if c == _QUOTE:
+                m = _STRING.match(buf, i)
+                return None if m is None else m.end()
+            if c not in _OPEN:
+                m = _SCALAR.match(buf, i)
+                if m is None: raise ValueError(f"값이 와야 할 자리: {i}")
+                return None if m.end() >= n else m.end()  # 숫자는 다음 조각에서 이어질 수 있음
+            depth = 1
+            i += 1
+        while True:
+            i = _RUN.match(buf, i).end()
+            if i >= n or buf[i] == _QUOTE:  # 끝까지 읽었거나 조각 경계에서 잘린 문자열
+                v[1], v[2] = i, depth
+                return None
+            depth += 1 if buf[i] in _OPEN else -1
+            i += 1
+            if depth == 0: return i
+
+    def _close_object(self):
+        spec, _, _, _, seen = self._stack.pop()
+        # 이 객체에 없던 필드는 더 기다리지 않는다
+        self._found(sum(_leaves(v) if isinstance(v, dict) else 1 for k, v in spec.items() if k not in seen))
+        if not self._stack: self.done = True
+
+    def _found(self, count):
+        self._left -= count
+        if self._left <= 0: self.done = True
+
+
+def extract(data, fields):
+    # 메모리에 있는 JSON 바이트에서 필드만 꺼낸다
+    ex = FieldExtractor(fields)
+    ex.feed(data)
+    return ex.close()
@@ -0,0 +1,247 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+
+from pokedex_log import AdventureLog
+from pokedex_stats import AdventureStats, parse_record, region_name
+
+# SQLite 모험 기록 저장소 (--history sqlite)
+# AdventureLog 와 같은 창구(append/reverse_reader/count/is_empty/clear/stats_summary)에 더해
+# 기간/지역/결과/포켓몬 필터와 정렬을 색인 조회로 처리하는 query() 를 제공한다.
+# 한 행에는 원래 기록(JSON)과 필터/정렬용 열(date, generation, outcome, number, name, tries)을 함께 저장하고,
+# 통계 집계(AdventureStats)는 기록을 넣는 같은 트랜잭션에서 meta 표에 갱신하므로 항상 기록과 일치한다.
+# 기록은 AdventureLog 저널(.jsonl)에 먼저 쓰고 DB 에는 저널에서 새로 늘어난 줄만 옮긴다 (저널이 원본).
+
+# 정렬 이름 -> (열, 내림차순 여부). 같은 값끼리는 id 로 순서를 정해 페이지 경계가 흔들리지 않게 한다
+SORTS = {
+    "recent": ("date", True),
+    "oldest": ("date", False),
+    "tries": ("tries", False),
+    "tries_desc": ("tries", True),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    generation TEXT NOT NULL,
+    outcome TEXT,
+    number INTEGER,
+    name TEXT,
+    tries INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# 색인은 기존 기록을 옮긴 뒤에 만든다 (행마다 색인을 갱신하는 것보다 한 번에 만드는 편이 훨씬 빠름)
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_records_date ON records(date);
+CREATE INDEX IF NOT EXISTS idx_records_generation ON records(generation, date);
+CREATE INDEX IF NOT EXISTS idx_records_outcome ON records(outcome, date);
+CREATE INDEX IF NOT EXISTS idx_records_number ON records(number);
+CREATE INDEX IF NOT EXISTS idx_records_name ON records(name);
+CREATE INDEX IF NOT EXISTS idx_records_tries ON records(tries);
+"""
+
+_INSERT = "INSERT INTO records (date, generation, outcome, number, name, tries, data) VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+def _row(record, data=None):
+    # data: 저널에서 읽은 원래 줄 (있으면 다시 직렬화하지 않음)
+    r = parse_record(record)
+    return (record.get("date", ""), region_name(record.get("generation")), r.get("outcome"), r.get("number"),
+            r.get("name"), r.get("tries") or 0, data or json.dumps(record, ensure_ascii=False))
+
+
+def _where(filters):
+    # filters: date_from/date_to ("2026", "2026-01", "2026-01-15" 처럼 앞부분만 줘도 됨), generation(지역 이름),
+    #          outcome, pokemon(숫자면 도감 번호, 아니면 이름 앞부분). 빈 값은 무시
+    clauses, params = [], []
+    f = filters or {}
+    if f.get("date_from"):
+        clauses.append("date >= ?"); params.append(f["date_from"])
+    if f.get("date_to"):
+        clauses.append("date <= ?"); params.append(f["date_to"] + "~")  # '~' 는 숫자/공백보다 커서 그 날(달, 해) 전체를 포함
+    if f.get("generation"):
+        clauses.append("generation = ?"); params.append(region_name(f["generation"]))
+    if f.get("outcome"):
+        clauses.append("outcome = ?"); params.append(f["outcome"])
+    pokemon = str(f.get("pokemon") or "").strip()
+    if pokemon.isdigit():
+        clauses.append("number = ?"); params.append(int(pokemon))
+    elif pokemon:
+        # 이름 앞부분 일치를 범위 조건으로 (LIKE 와 달리 색인을 탄다)
+        clauses.append("name >= ? AND name < ?"); params += [pokemon, pokemon + "\U0010ffff"]
+    return clauses, params
+
+
+class HistoryQuery:
+    # 필터/정렬된 기록을 한 페이지씩 돌려준다 (ReverseReader 와 같은 창구). 마지막으로 돌려준 행 다음부터 색인으로 이어 읽는다
+    def __init__(self, db, filters=None, sort="recent"):
+        self._db = db
+        self._col, self._desc = SORTS[sort]
+        self._clauses, self._params = _where(filters)
+        self._after = None  # (정렬 값, id)
+        self.exhausted = False
+
+    def next_page(self, size):
+        if self.exhausted: return []
+        op, order = ("<", "DESC") if self._desc else (">", "ASC")
+        clauses, params = list(self._clauses), list(self._params)
+        if self._after is not None:
+            clauses.append(f"({self._col}, id) {op} (?, ?)"); params += self._after
+        sql = f"SELECT {self._col}, id, data FROM records"
+        if clauses: sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {self._col} {order}, id {order} LIMIT ?"
+        rows = self._db._fetchall(sql, params + [size])
+        if len(rows) < size: self.exhausted = True
+        if rows: self._after = [rows[-1][0], rows[-1][1]]
+        page = []
+        for _, _, data in rows:
+            try: page.append(json.loads(data))
+            except ValueError: continue
+        return page
+
+    def close(self):
+        self.exhausted = True
+
+
+class HistoryDB:
+    def __init__(self, path="pokedex_adventure_log.db", journal_path=None, legacy_path=None):
+        self.path = path
+        journal_path = journal_path or os.path.splitext(path)[0] + ".jsonl"
+        self._lock = threading.Lock()
+        # 메인 스레드(PC 박스), 작업 스레드(전체 개수)가 함께 쓰므로 연결 하나를 잠금으로 보호한다
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA secure_delete=OFF")  # 일부 배포판 기본값이 ON 이라 초기화 때 지운 페이지를 전부 0 으로 다시 쓴다
+        self._conn.executescript(_SCHEMA)
+        self.stats_ready = True
+        self.stats = self._load_stats()
+        self._migrate(journal_path, legacy_path)
+        self._conn.executescript(_INDEXES)
+
+    def _fetchall(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _load_stats(self):
+        raw = self._meta("stats")
+        if raw is not None:
+            try: return AdventureStats.from_dict(json.loads(raw))
+            except (ValueError, TypeError): pass
+        # 집계가 없거나 깨졌으면 표 전체로 다시 만든다 (처음 한 번)
+        stats = AdventureStats()
+        for (data,) in self._conn.execute("SELECT data FROM records ORDER BY id"):
+            try: stats.add(json.loads(data))
+            except ValueError: continue
+        with self._conn:
+            self._set_meta("stats", json.dumps(stats.to_dict(), ensure_ascii=False))
+        return stats
+
+    def _migrate(self, journal_path, legacy_path):
+        # 저널(.jsonl)이 기록의 원본이고 이 DB 는 저널을 옮겨 담은 검색용 사본이다. append/clear 도 저널을 먼저 고치고
+        # 그 결과를 옮기므로 --history jsonl 로 돌아가도 같은 기록이 보인다 (예전 JSON 배열은 AdventureLog 가 먼저 저널로 바꿈)
+        self.journal = AdventureLog(journal_path, legacy_path=legacy_path)
+        self._import_journal()
+
+    def _read_mark(self):
+        # 지난번에 옮긴 마지막 줄의 끝 위치, 길이, crc32
+        try: mark = json.loads(self._meta("journal") or "{}")
+        except ValueError: mark = {}
+        if not isinstance(mark, dict) or not all(isinstance(mark.get(k), int) for k in ("size", "last_len", "last_crc")):
+            mark = {"size": 0, "last_len": 0, "last_crc": 0}
+        return mark
+
+    @staticmethod
+    def _resumable(f, mark):
+        # 저널의 mark["size"] 까지가 지난번에 옮긴 내용 그대로인지 (그 자리의 마지막 줄로 확인)
+        if mark["size"] == 0: return True
+        if f.seek(0, os.SEEK_END) < mark["size"]: return False
+        f.seek(mark["size"] - mark["last_len"])
+        return zlib.crc32(f.read(mark["last_len"])) == mark["last_crc"]
+
+    def _import_journal(self):
+        # 저널에서 지난번 이후에 추가된 완전한 줄만 옮긴다 (기록, 집계, 위치 표시를 한 트랜잭션으로)
+        # 저널이 그 사이 다시 쓰였으면(jsonl 쪽의 초기화/정리) 같은 줄이 여러 번 있을 수 있어 위치를 찾지 않고 표 전체를 다시 만든다
+        try: f = open(self.journal.path, "rb")
+        except FileNotFoundError: return
+        with f, self._lock, self._conn:
+            mark = self._read_mark()
+            if self._resumable(f, mark):
+                pos = mark["size"]
+            else:
+                self._conn.execute("DELETE FROM records")
+                self.stats = AdventureStats()
+                pos = 0
+            f.seek(pos)
+            def rows():
+                nonlocal pos
+                for line in f:
+                    if not line.endswith(b"\n"): break  # 쓰는 중이던 마지막 줄은 다음에
+                    pos += len(line)
+                    mark.update(size=pos, last_len=len(line), last_crc=zlib.crc32(line))
+                    try: record = json.loads(line)
+                    except ValueError: continue
+                    if not isinstance(record, dict): continue
+                    self.stats.add(record)
+                    yield _row(record, line.decode("utf-8").rstrip("\n"))
+            self._conn.executemany(_INSERT, rows())
+            self._set_meta("stats", json.dumps(self.stats.to_dict(), ensure_ascii=False))
+            self._set_meta("journal", json.dumps(mark))
+
+    def append(self, record):
+        # 저널에 먼저 쓰고 (다른 프로세스가 덧붙인 줄과 함께) 꼬리를 옮긴다
+        self.journal.append(record)
+        self._import_journal()
+
+    def query(self, filters=None, sort="recent"):
+        return HistoryQuery(self, filters, sort)
+
+    def reverse_reader(self, chunk_size=None):
+        return HistoryQuery(self)
+
+    def records(self, page_size=256):
+        # 최신 기록부터
+        reader = self.reverse_reader()
+        while True:
+            page = reader.next_page(page_size)
+            if not page: return
+            yield from page
+
+    def count(self, filters=None):
+        clauses, params = _where(filters)
+        sql = "SELECT COUNT(*) FROM records"
+        if clauses: sql += " WHERE " + " AND ".join(clauses)
+        return self._fetchall(sql, params)[0][0]
+
+    def is_empty(self):
+        return not self._fetchall("SELECT 1 FROM records LIMIT 1")
+
+    def stats_summary(self):
+        with self._lock:
+            return self.stats.summary()
+
+    def clear(self):
+        # 저널을 비우고 표도 비운다. 조건 없는 DELETE 는 SQLite 가 표를 통째로 비우는 방식으로 처리한다 (행마다 지우지 않음, 파일은 그대로)
+        with self._lock, self._conn:
+            self.journal.clear()
+            self._conn.execute("DELETE FROM records")
+            self.stats = AdventureStats()
+            self._set_meta("stats", json.dumps(self.stats.to_dict(), ensure_ascii=False))
+            self._set_meta("journal", json.dumps({"size": 0, "last_len": 0, "last_crc": 0}))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
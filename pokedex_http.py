@@ -0,0 +1,166 @@
+import gzip
+import http.client
+import ssl
+import threading
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+
+class HttpError(OSError):
+    # 4xx/5xx 응답
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.url = url
+
+
+class RequestCancelled(Exception):
+    # cancel() 이 True 를 돌려줘서 응답을 끝까지 받지 않고 중단했을 때
+    pass
+
+
+class _HostPool:
+    # 호스트 하나에 대한 keep-alive 연결 묶음 (동시 연결 수는 size 로 제한)
+    def __init__(self, scheme, host, port, size, timeout, ssl_context):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            if self._idle: return self._idle.pop(), True
+        return self._connect(), False
+
+    def release(self, conn, reusable):
+        if reusable:
+            with self._lock: self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self):
+        with self._lock:
+            for conn in self._idle: conn.close()
+            self._idle.clear()
+
+
+class HttpClient:
+    # pokeapi.co / 스프라이트 호스트에 대한 연결을 재사용하는 공용 HTTP 클라이언트
+    def __init__(self, pool_size=4, timeout=5, verify=False):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        # SSL 컨텍스트는 한 번만 만든다 (기존 코드와 같이 인증서 검증은 끔)
+        self.ssl_context = ssl.create_default_context()
+        if not verify:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "gzip", "Connection": "keep-alive"}
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, scheme, host, port):
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(scheme, host, port, self.pool_size, self.timeout, self.ssl_context)
+            return pool
+
+    def get(self, url, max_redirects=3, cancel=None, timeout=None, extract=None):
+        # cancel: 응답을 읽는 도중 주기적으로 확인하는 함수 (True 면 연결을 끊고 RequestCancelled)
+        # timeout: 이 요청에만 쓰는 소켓 타임아웃(초, 기본값은 self.timeout). 재사용하는 연결에도 다시 설정한다
+        # extract: 추출기(pokedex_extract.FieldExtractor)를 만드는 함수. 주면 200 응답을 조각 단위로 추출기에 넣고
+        #          필요한 필드를 다 찾으면 그만 읽는다. 본문 대신 추출 결과(dict)를 돌려준다
+        parts = urlsplit(url)
+        pool = self._pool(parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        for attempt in range(2):
+            conn, reused = pool.acquire()
+            if timeout is not None:
+                conn.timeout = timeout
+                if conn.sock is not None: conn.sock.settimeout(timeout)
+            elif reused and conn.sock is not None:
+                conn.sock.settimeout(self.timeout)
+            try:
+                if cancel is not None and cancel(): raise RequestCancelled()
+                conn.request("GET", path, headers=self.headers)
+                resp = conn.getresponse()
+                if extract is not None and resp.status == 200:
+                    body, reusable = self._read_fields(resp, cancel, extract())
+                else:
+                    body, reusable = self._read(resp, cancel), True
+            except RequestCancelled:
+                pool.release(conn, False)
+                raise
+            except TimeoutError:
+                pool.release(conn, False)
+                raise
+            except (http.client.HTTPException, OSError):
+                pool.release(conn, False)
+                # 서버가 먼저 끊은 keep-alive 연결이면 새 연결로 한 번만 다시 시도
+                if reused and attempt == 0: continue
+                raise
+            except Exception:
+                pool.release(conn, False)
+                raise
+            pool.release(conn, reusable and not resp.will_close)
+            break
+
+        if resp.status in (301, 302, 303, 307, 308) and max_redirects > 0:
+            location = resp.getheader("Location")
+            if location: return self.get(urljoin(url, location), max_redirects - 1, cancel, timeout, extract=extract)
+        if resp.status >= 400:
+            raise HttpError(resp.status, url)
+        if extract is not None and resp.status == 200: return body
+        if resp.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    def _read(self, resp, cancel, chunk_size=64 * 1024):
+        if cancel is None: return resp.read()
+        chunks = []
+        while True:
+            if cancel(): raise RequestCancelled()
+            chunk = resp.read(chunk_size)
+            if not chunk: break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _read_fields(self, resp, cancel, extractor, chunk_size=16 * 1024, drain_limit=64 * 1024):
+        # (추출 결과, 연결 재사용 가능 여부). gzip 은 조각마다 풀어서 넣으므로 전체 본문을 메모리에 두지 않는다
+        inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if resp.getheader("Content-Encoding") == "gzip" else None
+        done = False
+        while not done:
+            if cancel is not None and cancel(): raise RequestCancelled()
+            chunk = resp.read(chunk_size)
+            if not chunk: return extractor.close(), True
+            if inflate is None:
+                done = extractor.feed(chunk)
+                continue
+            # JSON 은 압축률이 높아서 조각 하나가 수백 KB 로 풀릴 수 있으므로 풀어낸 양도 chunk_size 씩 나눈다
+            while chunk and not done:
+                done = extractor.feed(inflate.decompress(chunk, chunk_size))
+                chunk = inflate.unconsumed_tail
+        # 남은 본문이 적으면 마저 읽어서 연결을 재사용하고, 많으면 연결을 끊는다 (새 연결 비용 < 남은 전송량)
+        left = drain_limit
+        while left > 0 and not resp.isclosed():
+            chunk = resp.read(min(chunk_size, left))
+            if not chunk: break
+            left -= len(chunk)
+        return extractor.close(), resp.isclosed()
+
+    def close(self):
+        with self._lock:
+            for pool in self._pools.values(): pool.close()
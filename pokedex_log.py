@@ -0,0 +1,259 @@
+import copy
+import json
+import os
+import threading
+import time
+
+from pokedex_stats import AdventureStats
+
+
+def migrate_legacy(path, legacy_path):
+    # 예전 형식(최신 기록이 앞에 오는 JSON 배열)을 한 번만 저널로 옮긴다 (저널이 이미 있으면 그대로 둠)
+    if not legacy_path or os.path.exists(path) or not os.path.exists(legacy_path):
+        return
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            history_list = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(history_list, list): return  # 알아볼 수 없는 파일은 건드리지 않는다
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for record in reversed(history_list):
+            if not isinstance(record, dict): continue
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    os.replace(legacy_path, legacy_path + ".migrated")
+
+
+class ReverseReader:
+    # 저널을 파일 끝에서부터 블록 단위로 읽어 최신 기록부터 페이지씩 돌려준다
+    # 열어 둔 시점의 파일 크기까지만 읽으므로, 이후 추가된 기록은 다음에 새로 열 때 보인다
+    def __init__(self, path, chunk_size=64 * 1024):
+        self.chunk_size = chunk_size
+        try:
+            self._f = open(path, "rb")
+            self._pos = self._f.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            self._f = None
+            self._pos = 0
+        self._head = b""   # 아직 앞부분이 안 읽힌 줄 조각
+        self._lines = []   # 읽어 둔 완전한 줄 (파일 순서, 뒤에서부터 꺼냄)
+
+    @property
+    def exhausted(self):
+        return self._pos == 0 and not self._head and not self._lines
+
+    def _fill(self):
+        if self._pos == 0:
+            self._lines = [self._head] if self._head else []
+            self._head = b""
+            return
+        step = min(self.chunk_size, self._pos)
+        self._pos -= step
+        self._f.seek(self._pos)
+        parts = (self._f.read(step) + self._head).split(b"\n")
+        self._head = parts[0]
+        self._lines = [line for line in parts[1:] if line]
+
+    def next_page(self, size):
+        page = []
+        while len(page) < size and not self.exhausted:
+            if not self._lines:
+                self._fill()
+                continue
+            try: page.append(json.loads(self._lines.pop()))
+            except ValueError: continue
+        if self.exhausted: self.close()
+        return page
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+class AdventureLog:
+    # 모험 기록 저널: 한 줄에 기록 하나(JSON)씩 파일 끝에만 덧붙인다 (오래된 것 -> 최신 순)
+    # 저장 비용이 기록 개수와 무관하고, 쓰다가 꺼져도 마지막 한 줄만 잘릴 뿐 이전 기록은 안전하다
+    def __init__(self, path="pokedex_adventure_log.jsonl", legacy_path=None, stats_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        # 집계 색인 (append 마다 O(1) 갱신). 저널과 어긋나 있으면 시작 시 백그라운드에서 뒷부분만 읽거나 새로 만든다
+        self.stats_path = stats_path or path + ".stats"
+        self.stats = AdventureStats.load(self.stats_path)
+        self.stats_ready = False
+        self.stats_save_interval = 1.0  # 색인 파일은 최대 이 간격(초)으로만 다시 쓴다 (못 쓴 꼬리는 다음 시작 때 이어서 읽음)
+        self._stats_saved_at = 0.0
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()  # 정리 작업은 한 번에 하나만
+        self._fd = None
+        self._epoch = 0  # clear() 할 때마다 증가
+        self._count = None  # 기록 개수 캐시 (_count_size 크기의 파일 기준)
+        self._count_size = -1
+        migrate_legacy(self.path, self.legacy_path)
+        self._repair_tail()
+        self.compactor = threading.Thread(target=self._startup, daemon=True)  # 시작 시 정리 + 집계 맞추기 (끝날 때까지 기다리려면 join)
+        self.compactor.start()
+
+    def _startup(self):
+        self.compact()
+        self.sync_stats()
+
+    def _repair_tail(self):
+        # 마지막 줄이 개행 없이 끝났다면 쓰다가 중단된 것이므로 잘라낸다
+        try:
+            with open(self.path, "rb+") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0: return
+                f.seek(size - 1)
+                if f.read(1) == b"\n": return
+                pos = size
+                while pos > 0:
+                    step = min(4096, pos)
+                    f.seek(pos - step)
+                    block = f.read(step)
+                    idx = block.rfind(b"\n")
+                    if idx >= 0:
+                        pos = pos - step + idx + 1
+                        break
+                    pos -= step
+                f.truncate(pos)
+                f.flush()
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+
+    def append(self, record):
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, data)
+            os.fsync(self._fd)
+            size = os.fstat(self._fd).st_size
+            if self._count is not None and self._count_size == size - len(data):
+                self._count += 1
+                self._count_size = size
+            if self.stats_ready and self.stats.size == size - len(data):
+                self.stats.add(record, data, size)
+                if time.monotonic() - self._stats_saved_at >= self.stats_save_interval: self._save_stats()
+
+    def _save_stats(self):
+        self._stats_saved_at = time.monotonic()
+        try: self.stats.save(self.stats_path)
+        except OSError: pass
+
+    def sync_stats(self):
+        # 집계를 저널 끝까지 맞춘다. 대부분은 잠금 없이 읽고, 교체 직전에 그 사이 추가된 꼬리만 잠금 안에서 읽는다
+        epoch = self._epoch
+        stats = copy.deepcopy(self.stats)
+        try:
+            with open(self.path, "rb") as f:
+                if not stats.matches(f): stats = AdventureStats()
+                stats.scan(f)
+                with self._lock:
+                    if epoch != self._epoch: return  # 그 사이 초기화됨 (clear 가 집계도 비움)
+                    stats.scan(f)
+                    self.stats = stats
+                    self.stats_ready = True
+                    self._save_stats()
+        except FileNotFoundError:
+            with self._lock:
+                if epoch != self._epoch: return
+                self.stats = AdventureStats()
+                self.stats_ready = True
+
+    def stats_summary(self):
+        # 집계 요약 (시작 시 집계를 맞추는 중이면 None)
+        with self._lock:
+            return self.stats.summary() if self.stats_ready else None
+
+    def reverse_reader(self, chunk_size=64 * 1024):
+        return ReverseReader(self.path, chunk_size)
+
+    def records(self, page_size=256):
+        # 최신 기록부터 돌려준다 (파일 전체를 한 번에 읽지 않음)
+        reader = self.reverse_reader()
+        while True:
+            page = reader.next_page(page_size)
+            if not page: return
+            yield from page
+
+    def count(self):
+        # 전체 기록 수 (= 줄 수): 한 번 센 뒤에는 append 때마다 갱신되는 캐시를 쓴다
+        try: size = os.path.getsize(self.path)
+        except OSError: return 0
+        with self._lock:
+            if self._count is not None and self._count_size == size: return self._count
+        n = 0
+        with open(self.path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                n += block.count(b"\n")
+        with self._lock:
+            try: unchanged = os.path.getsize(self.path) == size
+            except OSError: unchanged = False
+            if unchanged: self._count, self._count_size = n, size
+        return n
+
+    def is_empty(self):
+        try: return os.path.getsize(self.path) == 0
+        except OSError: return True
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            with open(self.path, "wb") as f:
+                os.fsync(f.fileno())
+            self._count, self._count_size = 0, 0
+            self.stats = AdventureStats()
+            self.stats_ready = True
+            self._save_stats()
+
+    @staticmethod
+    def _is_valid_line(line):
+        # 대부분의 줄은 모양만 보고 통과시키고, 의심스러운 줄만 실제로 파싱해 본다
+        if line.startswith(b"{") and line.endswith(b"}\n"): return True
+        try:
+            json.loads(line)
+            return line.endswith(b"\n")
+        except ValueError:
+            return False
+
+    def compact(self):
+        # 백그라운드 정리: 깨진 줄(외부 편집, 디스크 오류 등)이 있으면 유효한 줄만 남겨 새 파일로 교체한다
+        # 복사는 잠금 없이 하고, 교체하는 짧은 순간에만 append 를 막는다 (그 사이 추가된 기록은 그대로 이어 붙임)
+        if not self._compact_lock.acquire(blocking=False): return False
+        try: return self._compact()
+        finally: self._compact_lock.release()
+
+    def _compact(self):
+        epoch = self._epoch
+        try:
+            with open(self.path, "rb") as f:
+                if all(self._is_valid_line(line) for line in f): return False
+        except FileNotFoundError:
+            return False
+
+        tmp = self.path + ".compact"
+        with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+            for line in src:
+                if self._is_valid_line(line): dst.write(line)
+            copied = src.tell()
+        with self._lock:
+            if epoch != self._epoch:  # 정리하는 사이 기록이 초기화됨
+                os.remove(tmp)
+                return False
+            with open(self.path, "rb") as src, open(tmp, "ab") as dst:
+                src.seek(copied)
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp, self.path)
+            self._count = None
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        return True
@@ -0,0 +1,199 @@
+import argparse
+import bisect
+import os
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+# 다국어(한국어/영어/일본어) 포켓몬 이름 색인
+# 파일(UTF-8 텍스트): 첫 줄 "PKDXNAMES\t포맷 버전\tfirst\tlast", 이후 번호 순서대로 한 줄에 "한국어\t영어\t일본어"
+# 열 때 이름을 검색 키로 바꿔 정렬된 배열 두 개(전체 키, 한글 초성 키)를 만들고, 접두어 검색은 이분 탐색 + 연속 구간 읽기로 끝난다.
+# 한글은 자모 단위로 풀어서 비교하므로 입력 중인 글자("핔" -> "피카츄")나 겹모음/겹받침도 이어서 맞고,
+# 자음만 입력하면("ㅍㅋㅊ") 초성으로 찾는다. 영어는 대소문자/공백/기호/악센트를, 일본어는 히라가나/가타카나를 구분하지 않는다.
+MAGIC = "PKDXNAMES"
+FORMAT_VERSION = 1
+LANGS = ("ko", "en", "ja")
+
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_SPLIT = {"ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ",
+          "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ",
+          "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ"}
+_JUNG = [_SPLIT.get(c, c) for c in "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"]
+_JONG = [""] + [_SPLIT.get(c, c) for c in "ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"]
+_KEEP = set("♀♂")  # 니드런♀/니드런♂ 구분
+
+
+def normalize(text):
+    # 검색 키: 한글 음절은 자모로 풀고, 히라가나는 가타카나로, 라틴 문자는 악센트를 떼고 소문자로 (그 밖의 기호/공백은 버림)
+    out = []
+    for ch in text.casefold():
+        code = ord(ch)
+        if 0xAC00 <= code <= 0xD7A3:
+            code -= 0xAC00
+            out += (_CHO[code // 588], _JUNG[code // 28 % 21], _JONG[code % 28])
+        elif 0x3041 <= code <= 0x3096:
+            out.append(chr(code + 0x60))
+        elif ch in _SPLIT:
+            out.append(_SPLIT[ch])
+        elif code < 0x250:
+            ch = unicodedata.normalize("NFD", ch)[0]
+            if ch.isalnum(): out.append(ch)
+        elif ch.isalnum() or ch in _KEEP:
+            out.append(ch)
+    return "".join(out)
+
+
+def initials(text):
+    # 한글 음절의 초성만 ("피카츄" -> "ㅍㅋㅊ")
+    return "".join(_CHO[(ord(ch) - 0xAC00) // 588] for ch in text if 0xAC00 <= ord(ch) <= 0xD7A3)
+
+
+def _is_initials(text):
+    return all(ch in _CHO for ch in text)
+
+
+class NameIndex:
+    def __init__(self, names, first=1):
+        # names: 번호 순서대로 (한국어, 영어, 일본어) 튜플 (없는 이름은 "")
+        self.first = first
+        self.last = first + len(names) - 1
+        self._names = names
+        keys = sorted((normalize(name), first + i, lang) for i, row in enumerate(names) for lang, name in enumerate(row) if name)
+        self._keys = [k for k, _, _ in keys]
+        self._refs = [(n, lang) for _, n, lang in keys]
+        chos = sorted((initials(row[0]), first + i) for i, row in enumerate(names) if row[0])
+        self._cho_keys = [k for k, _ in chos]
+        self._cho_refs = [(n, 0) for _, n in chos]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            magic, version, first, last = f.readline().rstrip("\n").split("\t")
+            if magic != MAGIC or int(version) != FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 이름 색인 파일: {path}")
+            names = [tuple((line.rstrip("\n").split("\t") + ["", "", ""])[:3]) for line in f]
+        if len(names) != int(last) - int(first) + 1:
+            raise ValueError(f"이름 색인 파일이 잘렸습니다: {path}")
+        return cls(names, int(first))
+
+    @classmethod
+    def open(cls, path):
+        # 파일이 없거나 형식이 다르면 None (게임은 번호 입력만 사용)
+        try: return cls.load(path)
+        except (OSError, ValueError): return None
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"{MAGIC}\t{FORMAT_VERSION}\t{self.first}\t{self.last}\n")
+            for row in self._names:
+                f.write("\t".join(name.replace("\t", " ").replace("\n", " ") for name in row) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def __contains__(self, number):
+        return self.first <= number <= self.last and any(self._names[number - self.first])
+
+    def __len__(self):
+        return sum(1 for row in self._names if any(row))
+
+    def name(self, number, lang="ko"):
+        # 번호 -> 이름 (없으면 None)
+        if not self.first <= number <= self.last: return None
+        return self._names[number - self.first][LANGS.index(lang)] or None
+
+    def lookup(self, text):
+        # 이름(어느 언어든)이 정확히 일치하는 번호 (없으면 None)
+        key = normalize(text)
+        i = bisect.bisect_left(self._keys, key)
+        if key and i < len(self._keys) and self._keys[i] == key: return self._refs[i][0]
+        return None
+
+    def search(self, text, lo=None, hi=None, limit=8):
+        # 접두어가 일치하는 (번호, 일치한 이름, 언어) 목록 (lo~hi 범위 안의 번호만, 번호마다 한 번씩)
+        # 자모 단위로 맞다 보니 "피" 가 "필..." 에도 맞으므로, 입력한 글자 그대로 시작하는 이름을 앞에 둔다
+        text = text.strip()
+        if not text: return []
+        if _is_initials(text): keys, refs, key = self._cho_keys, self._cho_refs, text
+        else: keys, refs, key = self._keys, self._refs, normalize(text)
+        if not key: return []
+        lo = self.first if lo is None else lo
+        hi = self.last if hi is None else hi
+        results, seen = [], set()
+        for i in range(bisect.bisect_left(keys, key), len(keys)):
+            if not keys[i].startswith(key): break
+            number, lang = refs[i]
+            if lo <= number <= hi and number not in seen:
+                seen.add(number)
+                results.append((number, self._names[number - self.first][lang], LANGS[lang]))
+                if len(results) >= limit * 4: break
+        prefix = text.casefold()
+        results.sort(key=lambda r: not r[1].casefold().startswith(prefix))
+        return results[:limit]
+
+
+def species_names(d_s):
+    # species 응답 -> (한국어, 영어, 일본어) (일본어는 가타카나 표기 ja-Hrkt 우선)
+    names = {n["language"]["name"]: n["name"] for n in d_s["names"]}
+    return names.get("ko", ""), names.get("en", d_s.get("name", "")), names.get("ja-Hrkt") or names.get("ja", "")
+
+
+def build(path, api, first=1, last=1025, workers=8, log=print):
+    # 기존 색인에 세 언어가 다 있는 번호는 재사용하고 나머지만 species 를 받는다 (디스크 캐시가 있으면 캐시에서)
+    # 요청 범위 밖의 기존 이름도 그대로 두고, 기존 범위와 합친 범위로 다시 쓴다
+    rows = {}
+    out_first, out_last = first, last
+    old = NameIndex.open(path)
+    if old is not None:
+        out_first, out_last = min(first, old.first), max(last, old.last)
+        for number in range(old.first, old.last + 1):
+            row = old._names[number - old.first]
+            if any(row): rows[number] = row
+    missing = [n for n in range(first, last + 1) if not all(rows.get(n, ("",)))]
+    log(f"이름 색인 빌드: {len(rows) - len(set(missing) & rows.keys())}개 재사용, {len(missing)}개 다운로드")
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {n: ex.submit(api.species, n) for n in missing}
+        for i, (number, fut) in enumerate(futures.items(), 1):
+            try: rows[number] = species_names(fut.result())
+            except Exception as e: failed.append((number, e))
+            if i % 100 == 0: log(f"  {i}/{len(missing)}")
+    index = NameIndex([rows.get(n, ("", "", "")) for n in range(out_first, out_last + 1)], out_first)
+    index.save(path)
+    log(f"완료: {path} ({len(index)}개 수록, 실패 {len(failed)}개, {os.path.getsize(path):,} bytes)")
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다국어 포켓몬 이름 색인 빌드/검색")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="PokeAPI species 데이터로 이름 색인 생성 (기존 색인은 증분 갱신)")
+    p_build.add_argument("--out", default="pokedex_names.idx")
+    p_build.add_argument("--first", type=int, default=1)
+    p_build.add_argument("--last", type=int, default=1025)
+    p_build.add_argument("--workers", type=int, default=8)
+    p_search = sub.add_parser("search", help="이름 검색 (접두어/초성)")
+    p_search.add_argument("query")
+    p_search.add_argument("--path", default="pokedex_names.idx")
+    p_search.add_argument("--range", type=int, nargs=2, metavar=("MIN", "MAX"))
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from pokedex_api import PokeApi
+        from pokedex_cache import DiskCache
+        from pokedex_http import HttpClient
+        api = PokeApi(DiskCache("pokedex_cache", max_bytes=512 * 1024 * 1024), HttpClient(pool_size=args.workers))
+        build(args.out, api, args.first, args.last, args.workers)
+    else:
+        t0 = time.perf_counter()
+        index = NameIndex.open(args.path)
+        if index is None:
+            raise SystemExit(f"이름 색인을 열 수 없습니다: {args.path}")
+        t1 = time.perf_counter()
+        lo, hi = args.range or (None, None)
+        results = index.search(args.query, lo, hi)
+        t2 = time.perf_counter()
+        for number, name, lang in results:
+            print(f"No.{number:04d} {index.name(number)} ({lang}: {name})")
+        print(f"열기 {(t1 - t0) * 1000:.1f}ms, 검색 {(t2 - t1) * 1000:.3f}ms")
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# 내장 성능 계측 (구간 시간, Tk 이벤트 루프 지연)
+# 모든 모듈이 같은 계측기(perf)를 공유한다. 꺼져 있을 때 span() 은 아무것도 하지 않는 공용 객체를 돌려주므로
+# 계측 지점에 남는 비용은 메서드 호출 한 번뿐이다.
+
+_now = time.perf_counter
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("perf", "name", "t0")
+
+    def __init__(self, perf, name):
+        self.perf = perf
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = _now()
+        return self
+
+    def __exit__(self, *exc):
+        self.perf.record(self.name, (_now() - self.t0) * 1000)
+        return False
+
+
+class _Series:
+    # 한 구간의 누적 통계 + 최근 window 개 표본 (백분위수용)
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+class Perf:
+    def __init__(self, enabled=False, window=256):
+        self.enabled = enabled
+        self.window = window
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name):
+        # with perf.span("net"): ...  (꺼져 있으면 측정하지 않음)
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def record(self, name, ms):
+        with self._lock:
+            s = self._series.get(name)
+            if s is None: s = self._series[name] = _Series(self.window)
+            s.count += 1
+            s.total += ms
+            if ms > s.max: s.max = ms
+            s.recent.append(ms)
+
+    def reset(self):
+        with self._lock: self._series.clear()
+
+    def snapshot(self):
+        # {구간: {count, avg_ms, p50_ms, p95_ms, max_ms}} (백분위수는 최근 표본 기준)
+        with self._lock:
+            items = [(name, s.count, s.total, s.max, sorted(s.recent)) for name, s in self._series.items()]
+        out = {}
+        for name, count, total, peak, recent in sorted(items):
+            out[name] = {"count": count, "avg_ms": round(total / count, 3), "p50_ms": round(_percentile(recent, 0.5), 3),
+                         "p95_ms": round(_percentile(recent, 0.95), 3), "max_ms": round(peak, 3)}
+        return out
+
+
+perf = Perf()
+
+
+class LagMonitor:
+    # Tk after() 콜백이 예정 시각보다 얼마나 늦게 실행되는지 측정해서 "tk.lag" 구간으로 기록
+    # (메인 스레드가 막혀 있던 시간 = 사용자가 느끼는 멈춤)
+    def __init__(self, widget, perf=perf, interval_ms=100):
+        self.widget = widget
+        self.perf = perf
+        self.interval_ms = interval_ms
+        self._job = None
+        self._due = 0.0
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self):
+        if self._job is None: self._schedule()
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _schedule(self):
+        self._due = _now() + self.interval_ms / 1000
+        self._job = self.widget.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self.perf.record("tk.lag", max(0.0, (_now() - self._due) * 1000))
+        self._schedule()
+
+
+def hit_ratio(stats):
+    total = stats["hits"] + stats["misses"]
+    return stats["hits"] / total if total else None
+
+
+def dump_json(path, data):
+    # 읽는 쪽(모니터링 스크립트)이 반쯤 쓰인 파일을 보지 않도록 교체 방식으로 저장
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+
+from pokedex_worker import PRIORITY_PREFETCH, RequestSequencer, current_task_cancelled
+
+
+def likely_guesses(lo, hi, k=3):
+    # 이분 탐색을 하는 플레이어의 다음 추측 후보: 가운데 -> 4분점 -> 가운데 주변
+    mid = (lo + hi) // 2
+    quarter = (hi - lo) // 4
+    candidates = [mid, mid + 1, lo + quarter, hi - quarter, mid - 1, (lo + hi + 1) // 2]
+    picked = []
+    for n in candidates:
+        if lo <= n <= hi and n not in picked:
+            picked.append(n)
+            if len(picked) == k: break
+    return picked
+
+
+class Prefetcher:
+    # 범위가 바뀔 때마다 다음에 추측할 가능성이 높은 번호의 데이터와 스프라이트를 낮은 우선순위로 미리 받아 둔다
+    # 요청 key 가 실제 추측 조회와 같아서, 그 번호를 추측하면 진행 중인 미리 받기 작업에 그대로 합류한다
+    def __init__(self, workers, api, images, decode, size=(180, 180), k=3, max_inflight=2, max_fetch_per_min=30, skip=None, skip_sprite=None):
+        self.workers = workers
+        self.api = api
+        self.images = images
+        self.decode = decode  # (url, bytes, size) -> PIL 이미지 (메모리 캐시에 넣음)
+        self.size = size
+        self.k = k
+        self.max_inflight = max_inflight            # 동시에 미리 받는 번호 수
+        self.max_fetch_per_min = max_fetch_per_min  # 1분에 네트워크에서 새로 받을 수 있는 번호 수
+        self.skip = skip  # 미리 받을 필요가 없는 번호 판별 (예: 오프라인 번들에 있는 번호)
+        self.skip_sprite = skip_sprite  # 스프라이트만 받을 필요가 없는 번호 판별 (예: 아틀라스에 있는 번호)
+        self.sequencer = RequestSequencer()
+        self.issued = 0
+        self.completed = 0
+        self.skipped_budget = 0
+        self._pending = deque()
+        self._inflight = 0
+        self._window = deque()  # 최근 1분 동안 네트워크로 받은 시각
+        self._lock = threading.Lock()
+
+    def update(self, lo, hi):
+        # 이전 범위 기준으로 대기 중이던 미리 받기는 모두 취소하고 새 후보로 교체
+        token = self.sequencer.next()
+        self.workers.cancel_stale()
+        with self._lock:
+            self._pending = deque((n, token) for n in likely_guesses(lo, hi, self.k) if not (self.skip and self.skip(n)))
+        self._pump()
+
+    def cancel(self):
+        self.sequencer.next()
+        self.workers.cancel_stale()
+        with self._lock: self._pending.clear()
+
+    def _within_budget(self, number):
+        if self.api.is_cached(self.api.pokemon_url(number)): return True
+        now = time.monotonic()
+        while self._window and now - self._window[0] > 60: self._window.popleft()
+        if len(self._window) >= self.max_fetch_per_min: return False
+        self._window.append(now)
+        return True
+
+    def _pump(self):
+        start = []
+        with self._lock:
+            while self._inflight < self.max_inflight and self._pending:
+                number, token = self._pending.popleft()
+                if token.stale: continue
+                if not self._within_budget(number):
+                    self.skipped_budget += 1
+                    continue
+                self._inflight += 1
+                self.issued += 1
+                start.append((number, token))
+        # submit 콜백이 바로 실행될 수 있으므로 잠금 밖에서 시작한다
+        for number, token in start: self._start(number, token)
+
+    def _start(self, number, token):
+        state = {"left": 2}
+        f_m = self.workers.submit(("pokemon", number), self.api.pokemon, number, current_task_cancelled, priority=PRIORITY_PREFETCH, token=token)
+        f_s = self.workers.submit(("species", number), self.api.species, number, current_task_cancelled, priority=PRIORITY_PREFETCH, token=token)
+        f_m.add_done_callback(lambda f: self._on_pokemon(number, token, state, f))
+        f_s.add_done_callback(lambda f: self._step_done(state))
+
+    def _on_pokemon(self, number, token, state, future):
+        url = None
+        if self.skip_sprite and self.skip_sprite(number): pass
+        elif not future.cancelled() and future.exception() is None and not token.stale:
+            # 응답 모양이 예상과 달라도 _step_done 은 반드시 불러야 미리 받기가 멈추지 않는다
+            try: url = future.result()['sprites']['front_default']
+            except Exception: url = None
+        if url and (url, self.size) not in self.images:
+            with self._lock: state["left"] += 1
+            self.workers.submit(("bytes", url), self.api.get_bytes, url, current_task_cancelled, priority=PRIORITY_PREFETCH, token=token).add_done_callback(lambda f: self._on_sprite(url, token, state, f))
+        self._step_done(state)
+
+    def _on_sprite(self, url, token, state, future):
+        if not future.cancelled() and future.exception() is None and not token.stale:
+            try: self.decode(url, future.result(), self.size)
+            except Exception: pass
+        self._step_done(state)
+
+    def _step_done(self, state):
+        with self._lock:
+            state["left"] -= 1
+            if state["left"] > 0: return
+            self._inflight -= 1
+            self.completed += 1
+        self._pump()
+
+    def stats(self):
+        with self._lock:
+            return {"issued": self.issued, "completed": self.completed, "inflight": self._inflight,
+                    "skipped_budget": self.skipped_budget}
@@ -0,0 +1,264 @@
+import http.client
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+from pokedex_http import HttpError, RequestCancelled
+
+# 전송 계층(HttpClient/ReplayTransport/RecordingTransport)을 감싸는 꼬리 지연 제어 (같은 get(url, max_redirects, cancel, timeout, extract) 인터페이스)
+#   적응형 타임아웃: 호스트별 최근 응답 시간의 p99 x timeout_factor (min_timeout~max_timeout, 표본이 모이기 전에는 max_timeout)
+#   재시도: 연결 오류/타임아웃/5xx/429 만 지수 백오프 + 전체 흔들림(full jitter) 대기 후 다시 시도 (404 같은 응답은 그대로 올림)
+#   헤지 요청: 첫 요청이 p95 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 온 응답을 쓴다 (전체 요청의 hedge_budget 비율까지)
+#   회로 차단기: 요청 failure_threshold 개가 연속으로 실패하면 cooldown 동안 요청을 보내지 않고 바로 CircuitOpen 을 올리고,
+#                그 뒤 요청 하나로 상태를 확인해서 성공하면 다시 연다. 실패는 재시도 횟수와 상관없이 요청 하나당 한 번만 센다
+#                (응답 본문이 깨진 경우처럼 재시도하지 않는 오류도 실패로 셈). CircuitOpen 은 OSError 라서 PokeApi 가 만료된 캐시라도 돌려준다.
+# 상태 변화(closed/open/half_open)는 stats() 의 transitions 와 on_state_change 콜백으로 알린다.
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpen(OSError):
+    # 회로 차단 중이라 요청을 보내지 않았을 때
+    def __init__(self, host):
+        super().__init__(f"회로 차단 중: {host}")
+        self.host = host
+
+
+def _retryable(e):
+    if isinstance(e, HttpError): return e.status >= 500 or e.status == 429
+    return isinstance(e, (http.client.HTTPException, OSError)) and not isinstance(e, CircuitOpen)
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+class _Host:
+    # 호스트 하나의 응답 시간 표본과 차단기 상태
+    def __init__(self, window):
+        self.latencies = deque(maxlen=window)  # 성공한 요청의 응답 시간(초)
+        self.state = CLOSED
+        self.failures = 0      # 연속 실패 수
+        self.opened_at = 0.0
+        self.probing = False   # half_open 에서 상태 확인 요청이 나가 있는지
+        self.trips = 0
+
+
+class ResilientTransport:
+    def __init__(self, inner, min_timeout=0.5, max_timeout=5.0, timeout_factor=3.0, min_samples=20, window=200,
+                 retries=2, backoff=0.1, max_backoff=1.0, hedge=True, hedge_budget=0.1, hedge_workers=4,
+                 failure_threshold=5, cooldown=10.0, on_state_change=None, seed=None):
+        self.inner = inner
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_factor = timeout_factor
+        self.min_samples = min_samples  # 적응형 타임아웃/헤지에 필요한 최소 표본 수
+        self.window = window
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_budget = hedge_budget
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.on_state_change = on_state_change  # (호스트, 이전 상태, 새 상태) -> 작업 스레드에서 호출됨
+        self.counters = dict.fromkeys(("requests", "attempts", "retries", "hedges", "hedge_wins", "timeouts", "failures", "fast_fails"), 0)
+        self.transitions = deque(maxlen=20)
+        self._hosts = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._hedge_workers = hedge_workers
+        self._executor = None  # 헤지용 스레드는 처음 필요할 때 만든다
+
+    def _host(self, host):
+        with self._lock:
+            h = self._hosts.get(host)
+            if h is None: h = self._hosts[host] = _Host(self.window)
+            return h
+
+    def _count(self, key, n=1):
+        with self._lock: self.counters[key] += n
+
+    # ---- 응답 시간 / 타임아웃 ----
+
+    def _percentiles(self, h):
+        # (p95, p99) 초, 표본이 부족하면 (None, None)
+        with self._lock:
+            if len(h.latencies) < self.min_samples: return None, None
+            values = sorted(h.latencies)
+        return _percentile(values, 0.95), _percentile(values, 0.99)
+
+    def _timeout(self, h):
+        _, p99 = self._percentiles(h)
+        return self._timeout_for(p99)
+
+    def _timeout_for(self, p99):
+        if p99 is None: return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_factor))
+
+    # ---- 회로 차단기 ----
+
+    def _set_state(self, host, h, state):
+        # self._lock 을 잡은 상태에서 호출
+        old, h.state = h.state, state
+        if state == OPEN:
+            h.opened_at = time.monotonic()
+            h.trips += 1
+        self.transitions.append({"time": time.time(), "host": host, "from": old, "to": state})
+        return old
+
+    def _notify(self, host, old, new):
+        if self.on_state_change is not None and old != new:
+            try: self.on_state_change(host, old, new)
+            except Exception: pass
+
+    def _allow(self, host, h):
+        # (보내도 되는지, 상태 확인 요청인지). open 이 cooldown 을 넘겼으면 half_open 으로 바꾸고 상태 확인 요청 하나만 허용
+        changed = None
+        probe = False
+        with self._lock:
+            if h.state == OPEN and time.monotonic() - h.opened_at >= self.cooldown:
+                changed = self._set_state(host, h, HALF_OPEN), HALF_OPEN
+            if h.state == HALF_OPEN and not h.probing:
+                h.probing = probe = allowed = True
+            else:
+                allowed = h.state == CLOSED
+            if not allowed: self.counters["fast_fails"] += 1
+        if changed: self._notify(host, *changed)
+        return allowed, probe
+
+    def _success(self, host, h, elapsed):
+        changed = None
+        with self._lock:
+            if elapsed is not None: h.latencies.append(elapsed)
+            h.failures = 0
+            h.probing = False
+            if h.state != CLOSED: changed = self._set_state(host, h, CLOSED), CLOSED
+        if changed: self._notify(host, *changed)
+
+    def _failure(self, host, h):
+        changed = None
+        with self._lock:
+            self.counters["failures"] += 1
+            h.failures += 1
+            h.probing = False
+            if h.state == HALF_OPEN or (h.state == CLOSED and h.failures >= self.failure_threshold):
+                changed = self._set_state(host, h, OPEN), OPEN
+        if changed: self._notify(host, *changed)
+
+    # ---- 요청 ----
+
+    def get(self, url, max_redirects=3, cancel=None, timeout=None, extract=None):
+        # timeout: 주면 적응형 타임아웃의 상한으로 쓴다
+        host = urlsplit(url).hostname
+        h = self._host(host)
+        self._count("requests")
+        failed = False
+        for attempt in range(self.retries + 1):
+            allowed, probe = self._allow(host, h)
+            if not allowed: raise CircuitOpen(host)
+            try:
+                return self._attempt(host, h, url, max_redirects, cancel, timeout, extract)
+            except RequestCancelled:
+                if probe:
+                    with self._lock: h.probing = False
+                raise
+            except Exception as e:
+                retry = _retryable(e)
+                if isinstance(e, HttpError) and not retry:
+                    # 404 등 정상적인 응답은 호스트 상태로는 성공
+                    self._success(host, h, None)
+                    raise
+                if isinstance(e, TimeoutError): self._count("timeouts")
+                # 같은 요청의 재시도 실패는 다시 세지 않는다 (상태 확인 요청의 실패는 항상 반영해서 다시 open)
+                if probe or not failed: self._failure(host, h)
+                failed = True
+                if not retry or attempt == self.retries: raise
+            self._count("retries")
+            self._sleep(self._rng.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)), cancel)
+
+    def _sleep(self, seconds, cancel):
+        # 백오프 대기 (취소되면 바로 중단)
+        deadline = time.monotonic() + seconds
+        while True:
+            if cancel is not None and cancel(): raise RequestCancelled()
+            left = deadline - time.monotonic()
+            if left <= 0: return
+            time.sleep(min(left, 0.05))
+
+    def _call(self, url, max_redirects, cancel, timeout, extract):
+        t0 = time.monotonic()
+        self._count("attempts")
+        body = self.inner.get(url, max_redirects, cancel, timeout=timeout, extract=extract)
+        return body, time.monotonic() - t0
+
+    def _attempt(self, host, h, url, max_redirects, cancel, limit, extract):
+        timeout = self._timeout(h) if limit is None else min(limit, self._timeout(h))
+        p95, _ = self._percentiles(h)
+        if not self.hedge or p95 is None or h.state != CLOSED or not self._hedge_allowed():
+            body, elapsed = self._call(url, max_redirects, cancel, timeout, extract)
+            self._success(host, h, elapsed)
+            return body
+        # 헤지: 첫 요청이 p95 안에 끝나지 않으면 하나 더 보내고, 먼저 성공한 쪽을 쓰고 나머지는 취소
+        done = threading.Event()
+        stop = lambda: done.is_set() or (cancel is not None and cancel())
+        executor = self._get_executor()
+        first = executor.submit(self._call, url, max_redirects, stop, timeout, extract)
+        pending = {first}
+        finished, _ = wait(pending, timeout=p95)
+        if not finished and self._hedge_allowed(reserve=True):
+            pending.add(executor.submit(self._call, url, max_redirects, stop, timeout, extract))
+        error = None
+        try:
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in finished:
+                    try: body, elapsed = f.result()
+                    except Exception as e:
+                        if error is None or f is first: error = e
+                        continue
+                    if f is not first: self._count("hedge_wins")
+                    self._success(host, h, elapsed)
+                    return body
+        finally:
+            done.set()
+        raise error
+
+    def _hedge_allowed(self, reserve=False):
+        with self._lock:
+            allowed = self.counters["hedges"] < self.hedge_budget * self.counters["requests"] + 1
+            if allowed and reserve: self.counters["hedges"] += 1
+            return allowed
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._hedge_workers, thread_name_prefix="hedge")
+            return self._executor
+
+    def stats(self):
+        with self._lock:
+            hosts = {host: (h.state, h.failures, h.trips, sorted(h.latencies)) for host, h in self._hosts.items()}
+            out = dict(self.counters, transitions=list(self.transitions))
+        out["hosts"] = {}
+        for host, (state, failures, trips, values) in hosts.items():
+            entry = {"state": state, "failures": failures, "trips": trips, "samples": len(values)}
+            if values:
+                entry["p50_ms"] = round(_percentile(values, 0.5) * 1000, 1)
+                entry["p95_ms"] = round(_percentile(values, 0.95) * 1000, 1)
+            p99 = _percentile(values, 0.99) if len(values) >= self.min_samples else None
+            entry["timeout_ms"] = round(self._timeout_for(p99) * 1000, 1)
+            out["hosts"][host] = entry
+        return out
+
+    def is_healthy(self):
+        # 차단된 호스트가 없는지
+        with self._lock: return all(h.state == CLOSED for h in self._hosts.values())
+
+    def close(self):
+        with self._lock: executor, self._executor = self._executor, None
+        if executor is not None: executor.shutdown(wait=False, cancel_futures=True)
+        self.inner.close()
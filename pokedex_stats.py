@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+
+import updown_engine as engine
+
+# 모험 기록 스키마와 집계 색인
+# 기록 한 줄에는 PC 박스 표시용 문자열(date, pokemon, generation, attempts, items)과 함께
+# 구조화된 필드(outcome, number, name, tries, item_keys)를 같이 저장한다. 예전 기록은 표시용 문자열에서 복원한다.
+# AdventureStats 는 기록이 추가될 때마다 O(1) 로 갱신되는 집계라서, 통계 화면은 기록 수와 무관하게 바로 열린다.
+
+NO_ITEM = "none"
+OUTCOMES = ("성공", "실패", "도망")
+
+_ITEM_KEYS = {name: key for key, name in engine.ITEM_NAMES.items()}
+_TRIES = re.compile(r"(\d+)회(?: \((.+)\))?$")
+_POKEMON = re.compile(r"(.*) \(No\.(\d+)\)$")
+_RANGE_SUFFIX = re.compile(r" \(\d+~\d+\)$")  # "1세대: 관동 (1~151)" 과 "1세대: 관동" 을 같은 지역으로 집계
+
+
+def region_name(generation):
+    # 지역 이름 (범위 표기를 뗀 세대 프리셋 이름, 예전 기록과 같은 값으로 묶기 위함)
+    return _RANGE_SUFFIX.sub("", generation or "?")
+
+
+def make_record(outcome, number, name, generation, tries, item_keys, date=None):
+    # save_record 가 저널에 쓰는 기록 한 줄
+    return {
+        "date": (date or datetime.now()).strftime("%Y-%m-%d %H:%M"),
+        "pokemon": f"{name} (No.{number})",
+        "generation": generation,
+        "attempts": f"{tries}회" if outcome == "성공" else f"{tries}회 ({outcome})",
+        "items": ", ".join(engine.ITEM_NAMES.get(k, k) for k in item_keys) if item_keys else "사용 안함",
+        "outcome": outcome,
+        "number": number,
+        "name": name,
+        "tries": tries,
+        "item_keys": list(item_keys),
+    }
+
+
+def parse_record(record):
+    # 구조화된 필드 (예전 기록은 표시용 문자열에서 복원, 알아볼 수 없는 값은 None)
+    if "outcome" in record: return record
+    tries = outcome = number = None
+    name = record.get("pokemon", "")
+    m = _TRIES.match(record.get("attempts", ""))
+    if m:
+        tries = int(m.group(1))
+        outcome = m.group(2) or "성공"
+    m = _POKEMON.match(name)
+    if m: name, number = m.group(1), int(m.group(2))
+    items = record.get("items", "")
+    item_keys = [] if items in ("", "사용 안함") else [_ITEM_KEYS.get(n, n) for n in items.split(", ")]
+    return {"outcome": outcome, "number": number, "name": name, "tries": tries, "item_keys": item_keys,
+            "generation": record.get("generation", "")}
+
+
+class AdventureStats:
+    # 모험 기록 집계. size/last_len/last_crc 는 저널의 어디(바이트)까지 반영했는지와 그 마지막 줄의 확인 값
+    def __init__(self):
+        self.size = 0
+        self.last_len = 0
+        self.last_crc = 0
+        self.games = 0
+        self.outcomes = {}     # 결과 -> 판 수
+        self.generations = {}  # 지역 -> [판 수, 성공, 성공한 판의 시도 합]
+        self.items = {}        # 도구 키 (NO_ITEM: 사용 안함) -> [판 수, 성공]
+        self.attempts = {}     # 성공한 판의 시도 횟수(문자열) -> 판 수
+        self.streak = 0        # 현재 연속 포획
+        self.best_streak = 0
+
+    def add(self, record, line=None, end=None):
+        # line/end: 저널에 쓰인 줄(바이트)과 그 줄이 끝나는 위치
+        r = parse_record(record)
+        outcome = r.get("outcome")
+        won = outcome == "성공"
+        self.games += 1
+        self.outcomes[outcome or "?"] = self.outcomes.get(outcome or "?", 0) + 1
+        gen = self.generations.setdefault(region_name(r.get("generation")), [0, 0, 0])
+        gen[0] += 1
+        for key in r.get("item_keys") or [NO_ITEM]:
+            item = self.items.setdefault(key, [0, 0])
+            item[0] += 1
+            item[1] += won
+        if won:
+            gen[1] += 1
+            tries = r.get("tries") or 0
+            gen[2] += tries
+            self.attempts[str(tries)] = self.attempts.get(str(tries), 0) + 1
+            self.streak += 1
+            self.best_streak = max(self.best_streak, self.streak)
+        else:
+            self.streak = 0
+        if line is not None:
+            self.size = end
+            self.last_len = len(line)
+            self.last_crc = zlib.crc32(line)
+
+    def matches(self, f):
+        # 열린 저널 f 의 앞부분이 이 집계가 반영한 내용과 같은지 (마지막 반영 줄로 확인)
+        if self.size == 0: return True
+        size = f.seek(0, os.SEEK_END)
+        if size < self.size: return False
+        f.seek(self.size - self.last_len)
+        return zlib.crc32(f.read(self.last_len)) == self.last_crc
+
+    def scan(self, f):
+        # self.size 부터 파일 끝까지 완전한 줄만 반영 (깨진 줄은 건너뜀)
+        f.seek(self.size)
+        pos = self.size
+        for line in f:
+            if not line.endswith(b"\n"): break
+            pos += len(line)
+            try: record = json.loads(line)
+            except ValueError: record = None
+            if isinstance(record, dict): self.add(record, line, pos)
+            else: self.size = pos
+
+    def summary(self):
+        wins = self.outcomes.get("성공", 0)
+        tries = sum(g[2] for g in self.generations.values())
+        return {
+            "games": self.games, "wins": wins, "win_rate": wins / self.games if self.games else 0.0,
+            "avg_attempts": tries / wins if wins else 0.0, "outcomes": dict(self.outcomes),
+            "streak": self.streak, "best_streak": self.best_streak,
+            "generations": {name: {"games": g, "wins": w, "win_rate": w / g if g else 0.0, "avg_attempts": t / w if w else 0.0}
+                            for name, (g, w, t) in self.generations.items()},
+            "items": {key: {"games": g, "wins": w, "win_rate": w / g if g else 0.0} for key, (g, w) in self.items.items()},
+            "attempts": {int(k): v for k, v in sorted(self.attempts.items(), key=lambda kv: int(kv[0]))},
+        }
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, d):
+        s = cls()
+        for name in vars(s):
+            if name in d: setattr(s, name, d[name])
+        return s
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+    def save(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
@@ -0,0 +1,261 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from pokedex_http import HttpClient, HttpError
+from pokedex_resilience import ResilientTransport
+
+# PokeApi 가 쓰는 HTTP 전송 계층 교체용 모듈 (HttpClient 와 같은 get(url, max_redirects, cancel, timeout, extract) 인터페이스)
+#   live   : 실제 PokeAPI (HttpClient 그대로)
+#   record : 실제 PokeAPI 응답/스프라이트를 픽스처 폴더에 저장하면서 사용
+#   replay : 픽스처 폴더를 로컬 HTTP 대역 서버로 띄우고 그 서버에서 받는다 (지연/흔들림/오류 주입 가능)
+# 네트워크 없는 환경에서도 같은 조건으로 반복 가능한 성능 측정을 하기 위한 것.
+
+MODES = ("live", "record", "replay")
+FIXTURE_DIR = "pokedex_fixtures"
+
+
+def _fixture_key(url):
+    # 스킴을 뺀 "호스트/경로?쿼리" (대역 서버의 요청 경로와 같은 형태)
+    p = urlsplit(url)
+    return p.hostname + (p.path or "/") + (f"?{p.query}" if p.query else "")
+
+
+class FixtureStore:
+    # 픽스처 폴더: 응답 본문 파일들 + 인덱스 저널(index.jsonl, 한 줄에 {key, file, status})
+    def __init__(self, path=FIXTURE_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = {}
+        os.makedirs(path, exist_ok=True)
+        try:
+            with open(os.path.join(path, "index.jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    try: entry = json.loads(line)
+                    except ValueError: continue  # 기록 도중 잘린 줄
+                    self._index[entry["key"]] = entry
+        except FileNotFoundError:
+            pass
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, url):
+        return _fixture_key(url) in self._index
+
+    def get_key(self, key):
+        # (상태 코드, 본문) 또는 None
+        entry = self._index.get(key)
+        if entry is None: return None
+        if not entry["file"]: return entry["status"], b""
+        try:
+            with open(os.path.join(self.path, entry["file"]), "rb") as f:
+                return entry["status"], f.read()
+        except OSError:
+            return None
+
+    def put(self, url, status, body=b""):
+        key = _fixture_key(url)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".bin" if body else ""
+        if body:
+            full = os.path.join(self.path, name)
+            tmp = f"{full}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, full)
+        entry = {"key": key, "file": name, "status": status}
+        with self._lock:
+            self._index[key] = entry
+            with open(os.path.join(self.path, "index.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class RecordingTransport:
+    # 실제 전송 계층을 감싸서 받은 응답(4xx/5xx 포함)을 픽스처로 저장한다
+    def __init__(self, inner, store):
+        self.inner = inner
+        self.store = store
+
+    def get(self, url, max_redirects=3, cancel=None, timeout=None, extract=None):
+        # 픽스처에는 원래 응답 그대로 저장해야 하므로 끝까지 받은 뒤에 추출한다
+        try:
+            body = self.inner.get(url, max_redirects, cancel, timeout)
+        except HttpError as e:
+            self.store.put(url, e.status)
+            raise
+        self.store.put(url, 200, body)
+        if extract is None: return body
+        extractor = extract()
+        extractor.feed(body)
+        return extractor.close()
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayTransport:
+    # 원래 URL 을 대역 서버 주소로 바꿔서 요청 (연결 풀, 취소, 오류 처리는 HttpClient 그대로)
+    def __init__(self, server_url, pool_size=4, timeout=5):
+        self.server_url = server_url.rstrip("/")
+        self.http = HttpClient(pool_size=pool_size, timeout=timeout)
+
+    def get(self, url, max_redirects=3, cancel=None, timeout=None, extract=None):
+        return self.http.get(f"{self.server_url}/{_fixture_key(url)}", max_redirects, cancel, timeout, extract)
+
+    def close(self):
+        self.http.close()
+
+
+class FixtureServer:
+    # 픽스처를 돌려주는 로컬 PokeAPI 대역 서버 (keep-alive 지원)
+    #   latency_ms: 모든 응답에 더하는 고정 지연, jitter_ms: 0~jitter_ms 사이 추가 지연
+    #   error_rate: 이 비율만큼 503 응답, seed: 지연/오류 순서를 재현하기 위한 난수 시드
+    def __init__(self, store, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.requests = 0
+        self.misses = 0
+        self.injected_errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                delay, fail = server._next_fault()
+                if delay: time.sleep(delay)
+                if fail:
+                    self._send(503, b"injected error")
+                    return
+                hit = server.store.get_key(self.path.lstrip("/"))
+                if hit is None:
+                    with server._lock: server.misses += 1
+                    self._send(404, b"no fixture")
+                    return
+                status, body = hit
+                self._send(status, body)
+
+            def _send(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _next_fault(self):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail: self.injected_errors += 1
+        return delay / 1000, fail
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "misses": self.misses, "injected_errors": self.injected_errors}
+
+
+def make_transport(mode="live", fixtures=FIXTURE_DIR, pool_size=4, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None, resilience=True):
+    # (전송 계층, 대역 서버 또는 None)
+    # resilience: True 면 적응형 타임아웃/재시도/헤지/회로 차단기(ResilientTransport)로 감싼다 (dict 면 그 설정으로, False 면 감싸지 않음)
+    server = None
+    if mode == "live":
+        http = HttpClient(pool_size=pool_size)
+    elif mode == "record":
+        http = RecordingTransport(HttpClient(pool_size=pool_size), FixtureStore(fixtures))
+    elif mode == "replay":
+        server = FixtureServer(FixtureStore(fixtures), latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate, seed=seed).start()
+        http = ReplayTransport(server.url, pool_size=pool_size)
+    else:
+        raise ValueError(f"알 수 없는 전송 모드: {mode}")
+    if resilience:
+        http = ResilientTransport(http, **(resilience if isinstance(resilience, dict) else {}))
+    return http, server
+
+
+def record(fixtures, first, last, items=("scope-lens", "x-attack", "sitrus-berry"), workers=8, log=print):
+    # 게임을 하지 않고 도감 범위 전체(데이터 + 스프라이트)와 아이템 아이콘을 미리 녹화
+    from concurrent.futures import ThreadPoolExecutor
+    from pokedex_api import PokeApi
+
+    api = PokeApi(http=RecordingTransport(HttpClient(pool_size=workers), FixtureStore(fixtures)))
+
+    def fetch(number):
+        d = api.pokemon(number)
+        api.species(number)
+        if d["sprites"]["front_default"]: api.get_bytes(d["sprites"]["front_default"])
+
+    def fetch_item(name):
+        d = api.item(name)
+        if d["sprites"]["default"]: api.get_bytes(d["sprites"]["default"])
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(fetch, n) for n in range(first, last + 1)] + [ex.submit(fetch_item, name) for name in items]
+        for fut in futures:
+            try: fut.result()
+            except Exception: failed += 1
+    log(f"완료: {fixtures} (No.{first}~{last} + 아이템 {len(items)}개, 실패 {failed}개)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PokeAPI 픽스처 녹화 / 로컬 대역 서버")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_rec = sub.add_parser("record", help="실제 PokeAPI 에서 범위 전체를 픽스처로 저장")
+    p_rec.add_argument("--fixtures", default=FIXTURE_DIR)
+    p_rec.add_argument("--first", type=int, default=1)
+    p_rec.add_argument("--last", type=int, default=151)
+    p_rec.add_argument("--workers", type=int, default=8)
+    p_srv = sub.add_parser("serve", help="픽스처를 로컬 HTTP 서버로 제공")
+    p_srv.add_argument("--fixtures", default=FIXTURE_DIR)
+    p_srv.add_argument("--port", type=int, default=8765)
+    p_srv.add_argument("--latency-ms", type=float, default=0)
+    p_srv.add_argument("--jitter-ms", type=float, default=0)
+    p_srv.add_argument("--error-rate", type=float, default=0.0)
+    p_srv.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.fixtures, args.first, args.last, workers=args.workers)
+    else:
+        server = FixtureServer(FixtureStore(args.fixtures), port=args.port, latency_ms=args.latency_ms,
+                               jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed)
+        print(f"{server.url} 에서 픽스처 {len(server.store)}개 제공 중 (Ctrl+C 로 종료)")
+        try: server.serve_forever()
+        except KeyboardInterrupt: pass
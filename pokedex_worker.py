@@ -0,0 +1,189 @@
+import heapq
+import itertools
+import threading
+from concurrent.futures import CancelledError, Future
+
+# 우선순위 레인 (숫자가 작을수록 먼저 처리)
+PRIORITY_GUESS = 0   # 플레이어 추측 결과 조회
+PRIORITY_GAME = 1    # 게임 시작 시 필요한 데이터 (타겟 이름, 아이템 아이콘)
+PRIORITY_DECOR = 2   # 메인 화면 장식용 스프라이트
+PRIORITY_PREFETCH = 3  # 다음 추측 예상 번호 미리 받기
+
+_local = threading.local()
+
+
+def current_task_cancelled():
+    # 작업 함수 안에서 호출: 지금 실행 중인 작업을 기다리는 요청이 모두 낡았으면 True
+    task = getattr(_local, "task", None)
+    return task is not None and task.is_cancelled()
+
+
+class RequestToken:
+    __slots__ = ("sequencer", "generation")
+
+    def __init__(self, sequencer, generation):
+        self.sequencer = sequencer
+        self.generation = generation
+
+    @property
+    def stale(self):
+        return self.generation != self.sequencer.generation
+
+
+class RequestSequencer:
+    # 새 추측 / 게임 시작 / 메뉴 복귀마다 세대를 올려서 이전 조회 결과를 무효화한다 (마지막 요청만 화면에 반영)
+    def __init__(self):
+        self.generation = 0
+        self.discarded = 0  # 도착했지만 이미 낡아서 버린 결과 수
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            self.generation += 1
+            return RequestToken(self, self.generation)
+
+    def is_stale(self, token, future):
+        # 완료된 Future 의 결과를 쓰기 전에 호출. 낡았으면 True (정상 결과였다면 discarded 로 집계)
+        if not token.stale: return False
+        if not future.cancelled() and future.exception() is None:
+            self.discard()
+        return True
+
+    def discard(self):
+        with self._lock: self.discarded += 1
+
+    def stats(self):
+        return {"generation": self.generation, "discarded": self.discarded}
+
+
+class _Task:
+    __slots__ = ("key", "fn", "args", "future", "priority", "started", "tokens", "pinned")
+
+    def __init__(self, key, fn, args, priority):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.priority = priority
+        self.started = False
+        self.tokens = []
+        self.pinned = False  # 토큰 없이 요청한 쪽이 있으면 끝까지 실행
+
+    def attach(self, token):
+        if token is None: self.pinned = True
+        else: self.tokens.append(token)
+
+    def is_cancelled(self):
+        return not self.pinned and all(t.stale for t in self.tokens)
+
+
+class WorkerPool:
+    # 게임 전체가 공유하는 고정 크기 작업 풀
+    # 같은 key 의 작업이 이미 대기/진행 중이면 새로 만들지 않고 같은 Future 를 돌려준다
+    def __init__(self, max_workers=4, name="pokedex-worker"):
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.coalesced = 0
+        self.cancelled = 0  # 실행 전에 취소됐거나 다운로드 도중 중단된 작업 수
+        self._queue = []  # (priority, seq, task)
+        self._seq = itertools.count()
+        self._inflight = {}
+        self._active = 0
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._threads = [threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True) for i in range(max_workers)]
+        for t in self._threads: t.start()
+
+    def submit(self, key, fn, *args, priority=PRIORITY_GAME, token=None):
+        # token 을 주면 그 토큰이 낡았을 때 작업이 취소될 수 있다 (기다리는 쪽이 모두 낡은 경우에만)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("WorkerPool is shut down")
+            task = self._inflight.get(key) if key is not None else None
+            if task is not None and not task.future.cancelled():
+                self.coalesced += 1
+                task.attach(token)
+                if priority < task.priority and not task.started:
+                    # 더 급한 요청이 합류하면 대기열에서 앞쪽 레인으로 다시 넣는다 (이전 항목은 꺼낼 때 무시됨)
+                    task.priority = priority
+                    heapq.heappush(self._queue, (priority, next(self._seq), task))
+                    self._cond.notify()
+                return task.future
+            task = _Task(key, fn, args, priority)
+            task.attach(token)
+            if key is not None: self._inflight[key] = task
+            heapq.heappush(self._queue, (priority, next(self._seq), task))
+            self.submitted += 1
+            self._pending += 1
+            self._cond.notify()
+            return task.future
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._shutdown:
+                    self._cond.wait()
+                if not self._queue: return
+                _, _, task = heapq.heappop(self._queue)
+                if task.started: continue
+                task.started = True
+                self._pending -= 1
+                self._active += 1
+
+            if task.is_cancelled():
+                self._finish(task, cancelled=True)
+                task.future.cancel()
+                task.future.set_running_or_notify_cancel()
+                continue
+            if task.future.set_running_or_notify_cancel():
+                _local.task = task
+                try:
+                    result = task.fn(*task.args)
+                except BaseException as e:
+                    _local.task = None
+                    if task.is_cancelled():  # 다운로드 도중 중단된 경우
+                        self._finish(task, cancelled=True)
+                        task.future.set_exception(CancelledError())
+                    else:
+                        self._finish(task)
+                        task.future.set_exception(e)
+                else:
+                    _local.task = None
+                    self._finish(task)
+                    task.future.set_result(result)
+            else:
+                self._finish(task)
+
+    def _finish(self, task, cancelled=False):
+        # 결과를 알리기 전에 먼저 in-flight 목록에서 빼야 콜백 안에서 같은 key 를 다시 요청할 수 있다
+        with self._cond:
+            self._active -= 1
+            if cancelled: self.cancelled += 1
+            if task.key is not None and self._inflight.get(task.key) is task:
+                del self._inflight[task.key]
+
+    def cancel_stale(self):
+        # 대기열에 남은 작업 중 기다리는 요청이 모두 낡은 것을 바로 취소한다
+        dropped = []
+        with self._cond:
+            for _, _, task in self._queue:
+                if not task.started and task.is_cancelled():
+                    task.started = True
+                    self._pending -= 1
+                    self.cancelled += 1
+                    if task.key is not None and self._inflight.get(task.key) is task:
+                        del self._inflight[task.key]
+                    dropped.append(task)
+        for task in dropped: task.future.cancel()
+        return len(dropped)
+
+    def shutdown(self):
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {"workers": self.max_workers, "active": self._active, "queued": self._pending,
+                    "submitted": self.submitted, "coalesced": self.coalesced, "cancelled": self.cancelled}
@@ -0,0 +1,182 @@
+import random
+import time
+
+# 게임 규칙만 담은 UI 없는 엔진 (Tk, 네트워크와 무관)
+# PokedexGame 은 이 엔진의 상태를 화면에 그리기만 하고, 부하 테스트/밸런스 조정은 창 없이 이 모듈만으로 돌린다.
+
+MAX_LIVES = 7
+X_ATTACK_TURNS = 3      # 플러스파워 지속 턴
+X_ATTACK_RATE = 0.05    # 플러스파워 추가 압축률 (현재 범위 폭 기준)
+SITRUS_HEAL = 3         # 자뭉열매 회복량
+SCOPE_DIVISOR = 4       # 스코프렌즈: 정답 기준 (범위 폭 / 4) 이내로 축소
+
+# 세대별 도감 범위 프리셋
+GENERATIONS = {
+    "1세대: 관동 (1~151)": (1, 151),
+    "2세대: 성도 (152~251)": (152, 251),
+    "3세대: 호연 (252~386)": (252, 386),
+    "4세대: 신오 (387~493)": (387, 493),
+    "5세대: 하나 (494~649)": (494, 649),
+    "6세대: 칼로스 (650~721)": (650, 721),
+    "7세대: 알로라 (722~809)": (722, 809),
+    "8세대: 가라르 (810~905)": (810, 905),
+    "9세대: 팔데아 (906~1025)": (906, 1025),
+}
+CUSTOM_RANGE = "사용자 설정"  # 범위를 직접 정한 게임의 지역 이름
+
+ITEMS = ("scope-lens", "x-attack", "sitrus-berry")
+ITEM_NAMES = {"scope-lens": "스코프렌즈", "x-attack": "플러스파워", "sitrus-berry": "자뭉열매"}
+
+# step 이 돌려주는 이벤트
+OUT_OF_RANGE = "out-of-range"  # 범위 밖 입력 (시도 횟수/몬스터볼 변화 없음)
+CAUGHT = "caught"              # 정답
+UP = "up"                      # 정답이 더 큼
+DOWN = "down"                  # 정답이 더 작음
+LOST = "lost"                  # 몬스터볼 소진
+ITEM_USED = "item-used"
+ITEM_REJECTED = "item-rejected"  # 이번 게임에서 이미 도구를 사용함
+
+# 행동 종류
+GUESS = 0
+ITEM = 1
+
+
+class GameState:
+    # 게임 한 판의 전체 상태. 시뮬레이션에서 수십만 개를 만들 수 있도록 __slots__ 로 가볍게 유지한다
+    __slots__ = ("min_num", "max_num", "secret", "lo", "hi", "lives", "max_lives", "attempts",
+                 "xturns", "squeeze", "item_used", "items", "history")
+
+    def __init__(self, min_num, max_num, secret, max_lives=MAX_LIVES):
+        self.min_num = min_num
+        self.max_num = max_num
+        self.secret = secret
+        self.lo = min_num          # 화면에 보이는 현재 범위
+        self.hi = max_num
+        self.lives = max_lives
+        self.max_lives = max_lives
+        self.attempts = 0
+        self.xturns = 0            # 플러스파워 남은 턴 (0 이면 효과 없음)
+        self.squeeze = 0           # 마지막 추측에서 플러스파워로 추가로 줄어든 폭
+        self.item_used = False     # 도구는 게임당 한 번
+        self.items = []            # 사용한 도구 키 (사용 순서)
+        self.history = []          # (추측 번호, "UP"/"DOWN"/"정답"/"실패")
+
+    def copy(self, secret=None):
+        # 같은 진행 상태의 복사본 (secret 을 주면 정답만 바꾼 가정 상태)
+        c = GameState.__new__(GameState)
+        for name in GameState.__slots__: setattr(c, name, getattr(self, name))
+        c.items = list(self.items)
+        c.history = list(self.history)
+        if secret is not None: c.secret = secret
+        return c
+
+    @property
+    def x_attack(self):
+        return self.xturns > 0
+
+    def __repr__(self):
+        return (f"GameState(secret={self.secret}, range={self.lo}~{self.hi}, lives={self.lives}/{self.max_lives}, "
+                f"attempts={self.attempts}, xturns={self.xturns}, item_used={self.item_used})")
+
+
+def new_game(min_num, max_num, rng=random, max_lives=MAX_LIVES):
+    return GameState(min_num, max_num, rng.randint(min_num, max_num), max_lives)
+
+
+def guess(s, n):
+    # 추측 한 번. 기존 UI 의 동작을 그대로 따른다 (끝난 게임에 대한 입력도 막지 않음)
+    if n < s.lo or n > s.hi: return OUT_OF_RANGE
+    s.attempts += 1
+    secret = s.secret
+    if n == secret:
+        s.history.append((n, "정답"))
+        return CAUGHT
+    s.lives -= 1
+    if s.lives <= 0:
+        s.history.append((n, "실패"))
+        return LOST
+
+    lo, hi = s.lo, s.hi
+    sq = 0
+    if s.xturns > 0:
+        sq = max(1, int((hi - lo) * X_ATTACK_RATE))
+        s.xturns -= 1
+    s.squeeze = sq
+    # 마지막 턴에는 효과가 끝난 뒤라 반대쪽 경계는 줄지 않는다
+    if n < secret:
+        lo = max(lo, n + 1 + sq)
+        if s.xturns > 0: hi = max(secret, hi - sq)
+        s.history.append((n, "UP"))
+        event = UP
+    else:
+        hi = min(hi, n - 1 - sq)
+        if s.xturns > 0: lo = min(secret, lo + sq)
+        s.history.append((n, "DOWN"))
+        event = DOWN
+    if lo > hi: lo = hi = secret
+    s.lo, s.hi = lo, hi
+    return event
+
+
+def use_item(s, key):
+    # 도구 사용 (몬스터볼 1개 소모)
+    if s.item_used: return ITEM_REJECTED
+    s.item_used = True
+    s.lives -= 1
+    s.items.append(key)
+    if key == "scope-lens":
+        dist = max(1, (s.hi - s.lo) // SCOPE_DIVISOR)
+        s.lo = max(s.lo, s.secret - dist)
+        s.hi = min(s.hi, s.secret + dist)
+    elif key == "x-attack":
+        s.xturns = X_ATTACK_TURNS
+    elif key == "sitrus-berry":
+        s.lives = min(s.max_lives, s.lives + SITRUS_HEAL)
+    return LOST if s.lives <= 0 else ITEM_USED
+
+
+def step(s, action, arg):
+    # action: GUESS(arg=번호) 또는 ITEM(arg=도구 키)
+    return guess(s, arg) if action == GUESS else use_item(s, arg)
+
+
+def bisect_strategy(s):
+    # 기본 전략: 도구 없이 범위 가운데만 찌른다
+    return GUESS, (s.lo + s.hi) // 2
+
+
+def play(s, strategy=bisect_strategy):
+    # 한 판을 끝까지 진행하고 마지막 이벤트(CAUGHT/LOST)를 돌려준다
+    while True:
+        action, arg = strategy(s)
+        event = guess(s, arg) if action == GUESS else use_item(s, arg)
+        if event is CAUGHT or event is LOST: return event
+
+
+def simulate(games, min_num=1, max_num=151, strategy=bisect_strategy, seed=None, max_lives=MAX_LIVES):
+    # 여러 판을 돌려 승률/평균 시도 횟수를 집계한다
+    rand = random.Random(seed).random  # randint 보다 훨씬 싸다 (정답 분포는 동일하게 균등)
+    width = max_num - min_num + 1
+    wins = attempts = 0
+    for _ in range(games):
+        s = GameState(min_num, max_num, min_num + int(rand() * width), max_lives)
+        if play(s, strategy) is CAUGHT:
+            wins += 1
+            attempts += s.attempts
+    return {"games": games, "wins": wins, "win_rate": wins / games if games else 0.0,
+            "avg_attempts": attempts / wins if wins else 0.0}
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="UP & DOWN 규칙 엔진 시뮬레이션 (UI 없음)")
+    parser.add_argument("--games", type=int, default=200000)
+    parser.add_argument("--min", type=int, default=1)
+    parser.add_argument("--max", type=int, default=151)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    t0 = time.perf_counter()
+    result = simulate(args.games, args.min, args.max, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    print(f"{result['games']:,}판 ({args.min}~{args.max}): 승률 {result['win_rate']:.2%}, "
+          f"평균 {result['avg_attempts']:.2f}회, {elapsed:.2f}초 ({result['games'] / elapsed:,.0f}판/초)")
@@ -1,26 +1,49 @@
+import time
+_T_START = time.perf_counter()  # 첫 화면 표시 시간 측정 기준 (모듈 로드 시점)
+import importlib.util
 import random
 import tkinter as tk
 from tkinter import messagebox, Toplevel, Label, Entry, Button, ttk, Canvas
-import urllib.request
-import urllib.error
-import json
-import threading
-import ssl
-import os
+import argparse
 import platform 
+import re
+import threading
 from datetime import datetime
 from io import BytesIO
 
-# PIL 라이브러리 확인 및 임포트
-try:
-    from PIL import Image, ImageTk
-except ImportError:
+# PIL 라이브러리 확인 (실제 임포트는 첫 스프라이트를 디코딩할 때, 시작 시간 단축)
+if importlib.util.find_spec("PIL") is None:
     import tkinter.messagebox as msgbox
     msgbox.showerror("오류", "Pillow 라이브러리가 필요합니다.\n설치 후 다시 실행해주세요.\n(pip install pillow)")
     exit()
+Image = ImageTk = None
+
+def _load_pil():
+    global Image, ImageTk
+    if ImageTk is None:
+        from PIL import Image as _Image, ImageTk as _ImageTk
+        Image, ImageTk = _Image, _ImageTk
+
+def _photo_image(image):
+    _load_pil()
+    return ImageTk.PhotoImage(image)
+
+from pokedex_atlas import SpriteAtlas
+from pokedex_bundle import PokedexBundle
+from pokedex_cache import DiskCache, ImageCache
+from pokedex_dispatch import UiDispatcher
+from pokedex_log import AdventureLog
+from pokedex_names import NameIndex
+from pokedex_perf import LagMonitor, dump_json, hit_ratio, perf
+from pokedex_stats import NO_ITEM, OUTCOMES, make_record, region_name
+from pokedex_worker import PRIORITY_DECOR, PRIORITY_GAME, PRIORITY_GUESS, RequestSequencer, WorkerPool, current_task_cancelled
+import updown_engine as engine
+from updown_solver import Belief, PolicyTable
 
 class PokedexGame(tk.Tk):
-    def __init__(self):
+    def __init__(self, offline=False, pool_size=4, workers=4, image_cache_mb=32, prefetch=True, transport="live", fixtures="pokedex_fixtures",
+                 latency_ms=0, jitter_ms=0, error_rate=0.0, perf_overlay=False, perf_dump=None, perf_interval=5.0,
+                 lazy_start=True, history_backend="jsonl", resilience=True):
         super().__init__()
         self.title("포켓몬 도감 (서바이벌 모드)")
         self.geometry("500x900") 
@@ -53,52 +76,89 @@ class PokedexGame(tk.Tk):
         self.FONT_NORMAL = (self.FONT_FAMILY, 10)
         self.FONT_SMALL = (self.FONT_FAMILY, 9)
         
-        # 기록 저장 파일명
-        self.HISTORY_FILE = "pokedex_adventure_log.json"
+        # 기록 저장 파일명 (한 줄에 한 기록씩 덧붙이는 저널, 예전 JSON 파일은 처음 실행 시 자동 변환)
+        self.HISTORY_FILE = "pokedex_adventure_log.jsonl"
+        self.LEGACY_HISTORY_FILE = "pokedex_adventure_log.json"
+        # history_backend="sqlite": 기간/지역/결과/포켓몬 필터와 정렬을 색인 조회로 처리하는 SQLite 저장소 (기존 기록은 처음 한 번 옮김)
+        self.HISTORY_DB_FILE = "pokedex_adventure_log.db"
+        if history_backend == "sqlite":
+            from pokedex_history_db import HistoryDB
+            self.history = HistoryDB(self.HISTORY_DB_FILE, journal_path=self.HISTORY_FILE, legacy_path=self.LEGACY_HISTORY_FILE)
+        else:
+            self.history = AdventureLog(self.HISTORY_FILE, legacy_path=self.LEGACY_HISTORY_FILE)
+        
+        # PokeAPI 응답/스프라이트 디스크 캐시 (offline=True 면 캐시만 사용)
+        # 네트워크 요청은 호스트별 keep-alive 연결 풀(pool_size)을 공유한다
+        # transport: live(실제 API) / record(픽스처로 저장) / replay(픽스처를 로컬 대역 서버로 재생, 지연/오류 주입)
+        # record/replay 에서는 모든 요청이 전송 계층을 거치도록 디스크 캐시를 쓰지 않는다
+        # resilience: 적응형 타임아웃/재시도/헤지 요청/회로 차단기 (API 가 계속 실패하면 기다리지 않고 캐시된 데이터만 사용)
+        # 네트워크 모듈과 연결은 첫 화면을 그린 뒤 _init_network 에서 준비한다
+        self.CACHE_DIR = "pokedex_cache"
+        self.offline = offline
+        self.transport_options = dict(mode=transport, fixtures=fixtures, pool_size=pool_size, latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate, resilience=resilience)
+        self.api = None
+        self.fixture_server = None
+        # 디코딩 + 리사이즈된 이미지 메모리 캐시 (같은 포켓몬/메뉴 스프라이트는 다시 디코딩하지 않음)
+        self.images = ImageCache(max_bytes=image_cache_mb * 1024 * 1024)
+        # 오프라인 도감 번들 (python pokedex_bundle.py build 로 생성). 번들에 있는 번호는 네트워크 없이 조회
+        self.BUNDLE_FILE = "pokedex.bundle"
+        self.bundle = PokedexBundle.open(self.BUNDLE_FILE)
+        # 스프라이트 아틀라스 (python pokedex_atlas.py build 로 생성). 세대를 고르면 그 범위의 시트를 한 번 디코딩해 두고 잘라 쓴다
+        self.ATLAS_DIR = "pokedex_atlas"
+        self.atlas = SpriteAtlas.open(self.ATLAS_DIR)
+        # 오박사 힌트/자동 플레이용 최적 행동 테이블 (python updown_solver.py build 로 생성)
+        self.POLICY_FILE = "updown_policy.bin"
+        self.policy = None
+        # 한국어/영어/일본어 이름 색인 (python pokedex_names.py build 로 생성). 이름 입력/자동 완성과 정답 이름 조회에 사용
+        self.NAMES_FILE = "pokedex_names.idx"
+        self.names = None
+        self.suggest_numbers = []  # 자동 완성 목록에 보이는 번호
+        # 모든 백그라운드 작업은 이 풀 하나로 처리 (같은 자원 중복 요청은 하나로 합쳐짐)
+        self.workers = WorkerPool(max_workers=workers)
+        # 작업 결과는 모두 이 큐로 들어오고, 메인 스레드가 프레임(16ms)마다 한 번에 화면에 반영한다
+        # (작업 스레드에서는 라벨 갱신이나 PhotoImage 생성을 하지 않는다)
+        self.ui = UiDispatcher(self)
+        self.ui.start()
+        # 추측/게임 시작/메뉴 복귀마다 세대가 바뀌고, 이전 세대의 조회 결과는 화면에 반영하지 않는다
+        self.requests = RequestSequencer()
+        # 범위가 바뀔 때마다 다음 추측 후보를 낮은 우선순위로 미리 받아 둔다 (prefetch=False 면 끔)
+        self.prefetch = prefetch
+        self.prefetcher = None
         
         self.configure(bg=self.COLOR_BODY)
 
-        # 세대별 도감 범위
-        self.generations = {
-            "1세대: 관동 (1~151)": (1, 151),
-            "2세대: 성도 (152~251)": (152, 251),
-            "3세대: 호연 (252~386)": (252, 386),
-            "4세대: 신오 (387~493)": (387, 493),
-            "5세대: 하나 (494~649)": (494, 649),
-            "6세대: 칼로스 (650~721)": (650, 721),
-            "7세대: 알로라 (722~809)": (722, 809),
-            "8세대: 가라르 (810~905)": (810, 905),
-            "9세대: 팔데아 (906~1025)": (906, 1025),
-            "직접 설정": (1, 1025)
-        }
+        # 세대별 도감 범위 (프리셋은 엔진/시뮬레이터와 공유)
+        self.generations = {**engine.GENERATIONS, "직접 설정": (1, 1025)}
 
-        # 게임 변수
+        # 게임 변수 (규칙과 진행 상태는 updown_engine 이 관리하고, 여기서는 화면에 그리기만 한다)
         self.min_num = 1
         self.max_num = 151
-        self.current_min = 1
-        self.current_max = 151
-        self.secret_number = 0
-        self.attempts = 0
-        self.max_lives = 7 
-        self.current_lives = 7
+        self.max_lives = engine.MAX_LIVES
+        self.game = engine.GameState(self.min_num, self.max_num, 0, self.max_lives)
+        self.belief = Belief(self.game)  # 지금까지의 판정으로 좁혀진 정답 후보 구간
+        self.auto_play = False
+        self.auto_job = None
         self.current_image = None 
+        self.top_screen_num = None  # 상단 화면에 표시 중인 도감 번호
+        self.top_name_is_kor = False
         self.menu_image = None 
         self.target_name_kor = "알 수 없음"
         self.current_gen_name = "1세대: 관동"
         
-        # 아이템 관련 변수
-        self.buff_x_attack = False 
-        self.buff_x_attack_turns = 0
-        self.item_used_turn = False 
+        # 아이템 아이콘
         self.item_images = {}
-        self.inventory = {}
-        self.used_items_log = [] 
         
-        self.guess_history = [] 
         self.warning_flash_job = None
         
         # 윈도우 관리 변수
         self.log_window = None 
+        self.history_reader = None  # PC 박스에서 아직 읽지 않은 기록을 이어서 읽는 리더
+        self.stats_frame = None     # PC 박스 통계 패널
+        self.history_filters = {}   # PC 박스 검색 조건 (SQLite 저장소에서만)
+        self.history_sort = "recent"
+        self.HISTORY_SORT_NAMES = {"recent": "최신순", "oldest": "오래된순", "tries": "시도 적은 순", "tries_desc": "시도 많은 순"}
+        self.LOG_PAGE_SIZE = 50     # 스크롤이 끝에 가까워질 때마다 추가로 넣는 행 수
+        self.styles_ready = False   # ttk 스타일은 처음 쓸 때 한 번만 설정
 
         # 타입 한글 변환
         self.type_map = {
@@ -113,12 +173,79 @@ class PokedexGame(tk.Tk):
         self.menu_frame = tk.Frame(self, bg=self.COLOR_BODY)
         self._create_menu_widgets()
         self.game_frame = tk.Frame(self, bg=self.COLOR_BODY)
-        self._create_game_widgets()
+        self.game_widgets_ready = False
 
         self.menu_frame.pack(expand=True, fill='both', padx=20, pady=10)
-        
+
+        # 성능 계측 (F3 로 상단 화면 오버레이 토글, perf_dump 를 주면 perf_interval 초마다 JSON 으로 저장)
+        # 오버레이나 저장이 켜져 있을 때만 구간 시간과 이벤트 루프 지연을 모은다
+        self.PERF_DUMP_FILE = perf_dump
+        self.perf_interval_ms = int(perf_interval * 1000)
+        self.lag_monitor = LagMonitor(self)
+        self.perf_label = None
+        self.perf_overlay_job = None
+        self.guess_started = None  # (토큰, 시각): 추측 -> 상단 화면 이미지 표시까지 측정
+        self.bind("<F3>", lambda e: self.toggle_perf_overlay())
+        if perf_dump:
+            self._enable_perf()
+            self.after(self.perf_interval_ms, self._dump_perf)
+        if perf_overlay: self.toggle_perf_overlay()
+
+        # 빠른 시작(lazy_start): 메뉴만 먼저 그리고, 네트워크 준비와 메뉴 스프라이트 요청은 첫 화면 직후,
+        # 게임 화면 구성은 그 다음 유휴 시간으로 미룬다. lazy_start=False 면 예전처럼 전부 준비한 뒤 표시
+        self.lazy_start = lazy_start
+        if not lazy_start:
+            self._ensure_game_widgets()
+            self._finish_startup()
+        self.after(0, self._on_first_frame)
+
+    def _on_first_frame(self):
+        self.update_idletasks()
+        ms = (time.perf_counter() - _T_START) * 1000
+        perf.record("startup.first_frame", ms)
+        if perf.enabled: print(f"첫 화면 표시: {ms:.0f}ms ({'빠른 시작' if self.lazy_start else '일반 시작'})")
+        if self.lazy_start:
+            self._finish_startup()
+            self.after_idle(self._ensure_game_widgets)
+
+    def _finish_startup(self):
+        self._init_network()
+        self.policy = PolicyTable.open(self.POLICY_FILE)
+        # 이름 색인은 처음 이름을 입력하기 전까지만 준비되면 되므로 백그라운드에서 연다
+        self.workers.submit(("names",), NameIndex.open, self.NAMES_FILE, priority=PRIORITY_GAME).add_done_callback(lambda f: self.ui.post(self._set_name_index, f))
         # 앱 시작 시 메인 화면 랜덤 포켓몬 로드
-        threading.Thread(target=self._load_random_menu_sprite, daemon=True).start()
+        self._load_random_menu_sprite(self.requests.next())
+        self._preload_atlas(self.min_num, self.max_num)
+
+    def _init_network(self):
+        # 네트워크 모듈(http.client, ssl 등)은 여기서 처음 불러온다
+        from pokedex_api import PokeApi
+        from pokedex_prefetch import Prefetcher
+        from pokedex_transport import make_transport
+        http, self.fixture_server = make_transport(**self.transport_options)
+        self.api = PokeApi(DiskCache(self.CACHE_DIR) if self.transport_options["mode"] == "live" else None, http, offline=self.offline)
+        if hasattr(http, "on_state_change"): http.on_state_change = lambda host, old, new: self.ui.post(self._on_network_state, key="network-state")
+        if self.prefetch: self.prefetcher = Prefetcher(self.workers, self.api, self.images, self._decode_sprite, skip=self._in_bundle, skip_sprite=self._in_atlas)
+
+    def _set_name_index(self, future):
+        try: self.names = future.result()
+        except: self.names = None
+
+    def _ensure_game_widgets(self):
+        # 게임 화면은 첫 화면 이후 유휴 시간에 만든다 (그 전에 탐색을 시작하면 그때 바로 만든다)
+        if self.game_widgets_ready: return
+        self._create_game_widgets()
+        self.game_widgets_ready = True
+
+    def _configure_styles(self):
+        if self.styles_ready: return
+        style = ttk.Style()
+        style.theme_use("clam")
+        style.configure("Ingame.Treeview", background="white", fieldbackground="white", font=("Malgun Gothic", 10), rowheight=25)
+        style.configure("Ingame.Treeview.Heading", font=("Malgun Gothic", 10, "bold"), background="#ddd")
+        style.configure("Log.Treeview", background="#E0F7FA", fieldbackground="#E0F7FA", font=(self.FONT_FAMILY, 9), rowheight=25)
+        style.configure("Log.Treeview.Heading", font=(self.FONT_FAMILY, 10, "bold"), background="#4DD0E1", foreground="white")
+        self.styles_ready = True
 
     def _create_header_lens(self):
         header = Canvas(self, width=500, height=60, bg=self.COLOR_BODY, highlightthickness=0)
@@ -184,23 +311,90 @@ class PokedexGame(tk.Tk):
         Button(btn_frame, text="📜 모험 기록", font=(self.FONT_FAMILY, 11, "bold"), bg="#FF9800", fg="white", relief="raised", bd=3, command=self.open_adventure_log).pack(side="left", expand=True, padx=5, fill="x")
         Button(btn_frame, text="탐색 개시!", font=(self.FONT_FAMILY, 11, "bold"), bg="#2196F3", fg="white", relief="raised", bd=3, command=self.start_game).pack(side="right", expand=True, padx=5, fill="x")
 
-    def _load_random_menu_sprite(self):
+    def _in_bundle(self, number):
+        return self.bundle is not None and number in self.bundle
+
+    def _in_atlas(self, number):
+        return self.atlas is not None and number in self.atlas
+
+    def _preload_atlas(self, lo, hi):
+        if self.atlas is not None:
+            self.workers.submit(("atlas-preload", lo, hi), self.atlas.preload, lo, hi, priority=PRIORITY_DECOR)
+
+    def _atlas_image(self, resource, crop, key, size):
+        # 아틀라스 시트에서 잘라 낸 스프라이트/아이콘 (메모리 캐시 우선, 시트는 처음 한 번만 디코딩)
+        image = self.images.get(resource, size)
+        if image is None:
+            _load_pil()
+            with perf.span("atlas.crop"):
+                image = crop(key)
+                if image is None: return None
+                image = image.resize(size, Image.NEAREST)
+            self.images.put(resource, size, image)
+        return image
+
+    def _local_sprite(self, number, size):
+        # 네트워크 없이 구할 수 있는 스프라이트: 아틀라스 -> 번들 순
+        if self._in_atlas(number): return self._atlas_image(f"atlas:{number}", self.atlas.sprite, number, size)
+        if self._in_bundle(number): return self._bundle_sprite(number, size)
+        return None
+
+    def _bundle_sprite(self, number, size):
+        # 번들에 든 스프라이트를 (메모리 캐시 우선으로) 디코딩
+        resource = f"bundle:{number}"
+        image = self.images.get(resource, size)
+        if image is None:
+            data = self.bundle.sprite(number)
+            if data is None: return None
+            image = self._decode_sprite(resource, data, size)
+        return image
+
+    def _load_random_menu_sprite(self, token):
+        rand_id = random.randint(1, 1000)
+        if self._in_atlas(rand_id) or self._in_bundle(rand_id):
+            self.workers.submit(("local-sprite", rand_id, 120), self._local_sprite, rand_id, (120, 120), priority=PRIORITY_DECOR, token=token).add_done_callback(lambda f: self._on_menu_local_sprite(token, f))
+            return
+        self.workers.submit(("pokemon", rand_id), self.api.pokemon, rand_id, current_task_cancelled, priority=PRIORITY_DECOR, token=token).add_done_callback(lambda f: self._on_menu_pokemon_fetched(token, f))
+
+    def _on_menu_pokemon_fetched(self, token, future):
+        if self.requests.is_stale(token, future): return
+        try: img_url = future.result()['sprites']['front_default']
+        except: return
+        if not img_url: return
+        pil_img = self.images.get(img_url, (120, 120))
+        if pil_img is not None:
+            self._show_menu_sprite(pil_img)
+        else:
+            self.workers.submit(("bytes", img_url), self.api.get_bytes, img_url, current_task_cancelled, priority=PRIORITY_DECOR, token=token).add_done_callback(lambda f: self._on_menu_sprite_fetched(token, img_url, f))
+
+    def _on_menu_local_sprite(self, token, future):
+        if self.requests.is_stale(token, future): return
+        try: pil_img = future.result()
+        except: return
+        if pil_img is not None: self._show_menu_sprite(pil_img)
+
+    def _on_menu_sprite_fetched(self, token, img_url, future):
+        if self.requests.is_stale(token, future): return
+        try: self._show_menu_sprite(self._decode_sprite(img_url, future.result(), (120, 120)))
+        except: pass
+
+    def _show_menu_sprite(self, pil_img):
+        self.ui.post(self._apply_menu_sprite, pil_img, key="menu-sprite")
+
+    def _apply_menu_sprite(self, pil_img):
         try:
-            ctx = ssl.create_default_context(); ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
-            rand_id = random.randint(1, 1000)
-            url = f"https://pokeapi.co/api/v2/pokemon/{rand_id}"
-            with urllib.request.urlopen(url, context=ctx, timeout=5) as r:
-                d = json.loads(r.read().decode())
-                img_url = d['sprites']['front_default']
-            
-            if img_url:
-                with urllib.request.urlopen(img_url, context=ctx, timeout=5) as r:
-                    raw_data = r.read()
-                    pil_img = Image.open(BytesIO(raw_data)).resize((120, 120), Image.NEAREST)
-                    self.menu_image = ImageTk.PhotoImage(pil_img)
-                    self.after_idle(lambda: self.menu_img_label.config(image=self.menu_image))
+            self.menu_image = _photo_image(pil_img)
+            self.menu_img_label.config(image=self.menu_image)
         except: pass
 
+    def _decode_sprite(self, resource, data, size):
+        # 디코딩 + 리사이즈 결과를 메모리 캐시에 넣어 두고, 다음부터는 self.images.get 으로 바로 꺼내 쓴다
+        _load_pil()
+        with perf.span("decode"):
+            image = Image.open(BytesIO(data)).resize(size, Image.NEAREST)
+        self.images.put(resource, size, image)
+        return image
+
     def _create_game_widgets(self):
         top_bezel = tk.Frame(self.game_frame, bg=self.COLOR_BEZEL, padx=10, pady=10, bd=3, relief="sunken")
         top_bezel.pack(fill="x", padx=10, pady=(10, 5))
@@ -247,9 +441,19 @@ class PokedexGame(tk.Tk):
         input_sub_frame = tk.Frame(control_frame, bg=self.COLOR_BOTTOM_BG)
         input_sub_frame.pack()
         Label(input_sub_frame, text="No.", font=("Arial", 12, "bold"), bg=self.COLOR_BOTTOM_BG).pack(side="left")
-        self.guess_entry = Entry(input_sub_frame, font=("Arial", 16), width=6, justify='center', bd=2, relief="sunken")
+        self.guess_entry = Entry(input_sub_frame, font=("Arial", 16), width=9, justify='center', bd=2, relief="sunken")
         self.guess_entry.pack(side="left", padx=5)
         self.guess_entry.bind("<Return>", self._check_guess_event)
+        # 이름 자동 완성 (이름 색인이 있을 때만): 입력창 아래에 겹쳐 띄우고, 현재 범위 안의 포켓몬만 보여 준다
+        self.suggest_box = tk.Listbox(self.play_mode_frame, height=6, font=self.FONT_NORMAL, activestyle="dotbox", exportselection=False)
+        self.suggest_box.bind("<ButtonRelease-1>", lambda e: self._pick_suggestion())
+        self.guess_entry.bind("<KeyRelease>", self._on_guess_typed)
+        self.guess_entry.bind("<Down>", lambda e: self._move_suggestion(1))
+        self.guess_entry.bind("<Up>", lambda e: self._move_suggestion(-1))
+        self.guess_entry.bind("<Escape>", lambda e: self._hide_suggestions())
+        Button(input_sub_frame, text="🎓 박사", font=self.FONT_SMALL, command=self.show_professor_hint).pack(side="left", padx=(5, 2))
+        self.auto_btn = Button(input_sub_frame, text="▶ 자동", font=self.FONT_SMALL, command=self.toggle_auto_play)
+        self.auto_btn.pack(side="left")
 
         battle_menu = tk.Frame(self.play_mode_frame, bg="#404040", bd=3, relief="raised")
         battle_menu.pack(side="bottom", fill="x", padx=10, pady=10)
@@ -277,41 +481,46 @@ class PokedexGame(tk.Tk):
         selected = self.gen_var.get()
         min_val, max_val = self.generations[selected]
         if selected == "직접 설정": 
-            self.current_gen_name = "사용자 설정"
+            self.current_gen_name = engine.CUSTOM_RANGE
             self._open_custom_range()
         else:
             self.current_gen_name = selected
             self.min_num, self.max_num = min_val, max_val
             self.range_label.config(text=f"범위: {self.min_num} ~ {self.max_num}")
+            self._preload_atlas(self.min_num, self.max_num)
 
     def show_menu(self):
         self.game_frame.pack_forget()
         self.menu_frame.pack(expand=True, fill='both', padx=20, pady=20)
-        threading.Thread(target=self._load_random_menu_sprite, daemon=True).start()
+        if self.prefetcher: self.prefetcher.cancel()
+        self._stop_auto_play()
+        self._load_random_menu_sprite(self._new_request_token())
+
+    def _new_request_token(self):
+        # 세대를 올리고 대기열에 남은 이전 세대 작업은 바로 취소
+        token = self.requests.next()
+        self.workers.cancel_stale()
+        return token
 
     def start_game(self):
-        self.secret_number = random.randint(self.min_num, self.max_num)
-        self.attempts = 0
-        self.current_lives = self.max_lives
-        self.current_min = self.min_num
-        self.current_max = self.max_num
-        self.buff_x_attack = False
-        self.buff_x_attack_turns = 0 
-        self.item_used_turn = False
-        self.guess_history = []
-        self.used_items_log = [] 
+        self._ensure_game_widgets()
+        self._new_request_token()
+        self.game = engine.new_game(self.min_num, self.max_num, max_lives=self.max_lives)
+        self.belief = Belief(self.game)
         self.target_name_kor = "???"
-        self.inventory = {"scope-lens": 1, "x-attack": 1, "sitrus-berry": 1}
+        self._stop_auto_play()
         
         self._cancel_warning_flash() 
         self._update_lives_ui()
-        self.game_range_label.config(text=f"범위: {self.current_min} ~ {self.current_max}")
+        self.game_range_label.config(text=f"범위: {self.game.lo} ~ {self.game.hi}")
         self.basic_info_label.config(text="타겟 포착 중...", fg="white")
         self.stats_label.config(text="")
         self.desc_label.config(text="야생의 포켓몬이 튀어나왔다!\n도감 번호를 맞춰서 잡아야 한다!\n(숫자 입력 후 '몬스터볼' 버튼 클릭)")
         self.img_label.config(image='')
         self.current_image = None
+        self.top_screen_num = None
         self.guess_entry.delete(0, tk.END)
+        self._hide_suggestions()
         
         self.bag_mode_frame.pack_forget()
         self.history_mode_frame.pack_forget()
@@ -320,29 +529,41 @@ class PokedexGame(tk.Tk):
         self.game_frame.pack(expand=True, fill='both')
         self.guess_entry.focus_set()
         
-        threading.Thread(target=self._load_item_icons, daemon=True).start()
-        threading.Thread(target=self._fetch_target_name_hidden, args=(self.secret_number,), daemon=True).start()
+        self._load_item_icons()
+        self._fetch_target_name_hidden(self.game.secret)
+        self._prefetch_range()
+
+    def _prefetch_range(self):
+        if self.prefetcher: self.prefetcher.update(self.game.lo, self.game.hi)
 
     def _fetch_target_name_hidden(self, number):
+        if self._in_bundle(number):
+            self.target_name_kor = self.bundle.get(number)["name_ko"]
+            return
+        if self.names is not None and self.names.name(number):
+            self.target_name_kor = self.names.name(number)
+            return
+        self.workers.submit(("species", number), self.api.species, number, priority=PRIORITY_GAME).add_done_callback(lambda f: self.ui.post(self._on_target_species_fetched, number, f))
+
+    def _on_target_species_fetched(self, number, future):
+        if number != self.game.secret: return  # 그 사이 새 게임이 시작된 경우
         try:
-            ctx = ssl.create_default_context(); ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
-            url = f"https://pokeapi.co/api/v2/pokemon-species/{number}"
-            with urllib.request.urlopen(url, context=ctx, timeout=5) as r:
-                d = json.loads(r.read().decode())
-                for n in d['names']:
-                    if n['language']['name'] == 'ko':
-                        self.target_name_kor = n['name']
-                        break
+            d = future.result()
+            for n in d['names']:
+                if n['language']['name'] == 'ko':
+                    self.target_name_kor = n['name']
+                    break
         except: pass
 
     def _update_lives_ui(self):
-        balls = "◎" * self.current_lives
-        empty = "○" * (self.max_lives - self.current_lives)
+        lives = self.game.lives
+        balls = "◎" * lives
+        empty = "○" * (self.game.max_lives - lives)
         self.hp_label.config(text=f"몬스터볼: {balls}{empty}")
-        if self.current_lives == 1: self._start_warning_flash()
+        if lives == 1: self._start_warning_flash()
         else:
             self._cancel_warning_flash()
-            if self.current_lives <= 2: self.hp_label.config(fg="red")
+            if lives <= 2: self.hp_label.config(fg="red")
             else: self.hp_label.config(fg="#FF5555")
 
     def _start_warning_flash(self):
@@ -376,11 +597,7 @@ class PokedexGame(tk.Tk):
         list_frame = tk.Frame(self.history_mode_frame, bg=self.COLOR_BOTTOM_BG)
         list_frame.pack(fill="both", expand=True, padx=10)
         
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("Ingame.Treeview", background="white", fieldbackground="white", font=("Malgun Gothic", 10), rowheight=25)
-        style.configure("Ingame.Treeview.Heading", font=("Malgun Gothic", 10, "bold"), background="#ddd")
-
+        self._configure_styles()
         tree = ttk.Treeview(list_frame, columns=("turn", "guess", "result"), show="headings", style="Ingame.Treeview")
         tree.heading("turn", text="순서"); tree.column("turn", width=40, anchor="center")
         tree.heading("guess", text="입력"); tree.column("guess", width=60, anchor="center")
@@ -392,10 +609,10 @@ class PokedexGame(tk.Tk):
         tree.pack(side="left", fill="both", expand=True)
         sb.pack(side="right", fill="y")
         
-        if not self.guess_history:
+        if not self.game.history:
             tree.insert("", "end", values=("-", "-", "기록 없음"))
         else:
-            for i, (num, result) in enumerate(self.guess_history, 1):
+            for i, (num, result) in enumerate(self.game.history, 1):
                 tree.insert("", "end", values=(i, num, result))
                 
         Button(self.history_mode_frame, text="✖ 닫기", font=self.FONT_NORMAL, command=self.close_history_menu).pack(pady=10)
@@ -410,7 +627,7 @@ class PokedexGame(tk.Tk):
         self.bag_mode_frame.pack(fill="both", expand=True)
         for w in self.bag_contents_frame.winfo_children(): w.destroy()
         
-        can_use = not self.item_used_turn
+        can_use = not self.game.item_used
         state = "normal" if can_use else "disabled"
         msg = "어떤 도구를 사용할까? (턴 소모)" if can_use else "도구는 이미 사용했다!"
         self.bag_status_label.config(text=msg, fg="blue" if can_use else "red")
@@ -421,52 +638,63 @@ class PokedexGame(tk.Tk):
 
     def _create_item_btn(self, key, name, desc, bg, state):
         img = self.item_images.get(key)
-        btn = Button(self.bag_contents_frame, text=f" {name}\n {desc}", font=self.FONT_NORMAL, bg=bg, fg="white", relief="raised", bd=3, justify="left", state=state, command=lambda: self.use_item(key, name))
+        btn = Button(self.bag_contents_frame, text=f" {name}\n {desc}", font=self.FONT_NORMAL, bg=bg, fg="white", relief="raised", bd=3, justify="left", state=state, command=lambda: self.use_item(key))
         if img: btn.config(image=img, compound="left", padx=10)
         btn.pack(fill="x", pady=5, ipady=5)
 
     def _load_item_icons(self):
         items = ["scope-lens", "x-attack", "sitrus-berry"]
-        ctx = ssl.create_default_context(); ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
         for item in items:
             if item in self.item_images: continue
-            try:
-                with urllib.request.urlopen(f"https://pokeapi.co/api/v2/item/{item}", context=ctx, timeout=5) as r:
-                    d = json.loads(r.read().decode())
-                    url = d['sprites']['default']
-                if url:
-                    with urllib.request.urlopen(url, context=ctx, timeout=5) as r:
-                        img = ImageTk.PhotoImage(Image.open(BytesIO(r.read())).resize((40, 40), Image.NEAREST))
-                        self.item_images[item] = img
-            except: pass
+            if self.atlas is not None and self.atlas.has_item(item):
+                self.workers.submit(("atlas-item", item), self._atlas_image, f"atlas-item:{item}", self.atlas.item, item, (40, 40), priority=PRIORITY_GAME).add_done_callback(lambda f, item=item: self._on_atlas_icon(item, f))
+                continue
+            self.workers.submit(("item", item), self.api.item, item, priority=PRIORITY_GAME).add_done_callback(lambda f, item=item: self._on_item_fetched(item, f))
+
+    def _on_atlas_icon(self, item, future):
+        try: image = future.result()
+        except: return
+        if image is not None: self.ui.post(self._set_item_icon, item, image, key=("item-icon", item))
+
+    def _on_item_fetched(self, item, future):
+        try: url = future.result()['sprites']['default']
+        except: return
+        if not url: return
+        image = self.images.get(url, (40, 40))
+        if image is not None:
+            self.ui.post(self._set_item_icon, item, image, key=("item-icon", item))
+        else:
+            self.workers.submit(("bytes", url), self.api.get_bytes, url, priority=PRIORITY_GAME).add_done_callback(lambda f: self._on_item_sprite_fetched(item, url, f))
 
-    def use_item(self, key, item_name_display):
-        if self.item_used_turn: return
-        self.item_used_turn = True
-        self.current_lives -= 1 
-        
-        clean_name = item_name_display.split(" ")[1] 
-        self.used_items_log.append(clean_name)
+    def _on_item_sprite_fetched(self, item, url, future):
+        try: image = self._decode_sprite(url, future.result(), (40, 40))
+        except: return
+        self.ui.post(self._set_item_icon, item, image, key=("item-icon", item))
+
+    def _set_item_icon(self, item, image):
+        try: self.item_images[item] = _photo_image(image)
+        except: pass
+
+    def use_item(self, key):
+        before = self.game.copy()
+        event = engine.use_item(self.game, key)
+        if event == engine.ITEM_REJECTED: return
+        if self.policy: self.belief.update(before, engine.ITEM, key, event, self.game)
 
         log = ""
         if key == "scope-lens":
-            dist = max(1, (self.current_max - self.current_min) // 4)
-            self.current_min = max(self.current_min, self.secret_number - dist)
-            self.current_max = min(self.current_max, self.secret_number + dist)
             log = "스코프렌즈를 사용했다!\n초점이 맞춰져 범위가 대폭 줄어들었다!"
         elif key == "x-attack":
-            self.buff_x_attack = True
-            self.buff_x_attack_turns = 3 
             log = "플러스파워를 사용했다!\n3턴 동안 공격력이 크게 상승한다!"
         elif key == "sitrus-berry":
-            self.current_lives = min(self.max_lives, self.current_lives + 3) 
             log = "자뭉열매를 사용했다!\n몬스터볼 개수가 회복되었다!"
             
         self._update_lives_ui()
-        self.game_range_label.config(text=f"범위: {self.current_min} ~ {self.current_max}")
+        self.game_range_label.config(text=f"범위: {self.game.lo} ~ {self.game.hi}")
+        if key in ("scope-lens", "x-attack"): self._prefetch_range()
         self.close_bag_menu()
         self.desc_label.config(text=f"{log}\n(몬스터볼 1개 소모)")
-        if self.current_lives <= 0: self.game_over()
+        if event == engine.LOST: self.game_over()
 
     def close_bag_menu(self):
         self.bag_mode_frame.pack_forget()
@@ -474,6 +702,7 @@ class PokedexGame(tk.Tk):
         self.guess_entry.focus_set()
 
     def game_over(self):
+        self._stop_auto_play()
         self.save_record("실패") # [수정] 실패 시 기록 저장
         self._start_fade_out()
 
@@ -500,7 +729,7 @@ class PokedexGame(tk.Tk):
         lbl_msg.pack(pady=(300, 20))
         lbl_main = Label(self.fade_window, text="트레이너는 눈앞이 깜깜해졌다!", font=("Malgun Gothic", 24, "bold"), bg="black", fg="#F8F8F8")
         lbl_main.pack()
-        lbl_ans = Label(self.fade_window, text=f"(정답: 도감 No.{self.secret_number})", font=("Malgun Gothic", 11), bg="black", fg="#888")
+        lbl_ans = Label(self.fade_window, text=f"(정답: 도감 No.{self.game.secret})", font=("Malgun Gothic", 11), bg="black", fg="#888")
         lbl_ans.pack(side="bottom", pady=50)
         
         for w in (self.fade_window, lbl_msg, lbl_main, lbl_ans): w.bind("<Button-1>", self._end_blackout)
@@ -512,115 +741,352 @@ class PokedexGame(tk.Tk):
         if hasattr(self, 'fade_window'): self.fade_window.destroy()
         self.show_menu()
 
-    def _get_pokemon_data_thread(self, number):
-        url_m = f"https://pokeapi.co/api/v2/pokemon/{number}"
-        url_s = f"https://pokeapi.co/api/v2/pokemon-species/{number}"
+    def _get_pokemon_data(self, number, token):
+        if self._in_bundle(number):
+            # 번들에 있는 번호는 네트워크 없이 한 번에 표시 (디코딩만 작업 풀에서)
+            self.workers.submit(("bundle", number), self._bundle_lookup, number, priority=PRIORITY_GUESS, token=token).add_done_callback(lambda f: self._on_bundle_lookup(number, token, f))
+            return
+        # species 요청은 번호만 있으면 되므로 pokemon 요청과 동시에 보내고,
+        # 스프라이트는 pokemon 응답의 URL이 오는 즉시 이어서 받는다
+        # 이름 색인에 있는 번호는 한글 이름을 응답을 기다리지 않고 바로 올린다 (species 는 도감 설명용으로만 필요)
+        if self.names is not None and self.names.name(number):
+            self._post_top_update(number, token, name=self.names.name(number), name_is_kor=True)
+        # 아틀라스에 있는 스프라이트는 pokemon 응답을 기다리지 않고 시트에서 바로 잘라 쓴다 (PNG 다운로드/디코딩 없음)
+        if self._in_atlas(number):
+            self.workers.submit(("local-sprite", number, 180), self._local_sprite, number, (180, 180), priority=PRIORITY_GUESS, token=token).add_done_callback(lambda f: self._on_local_sprite(number, token, f))
+        self.workers.submit(("pokemon", number), self.api.pokemon, number, current_task_cancelled, priority=PRIORITY_GUESS, token=token).add_done_callback(lambda f: self._on_pokemon_fetched(number, token, f))
+        self.workers.submit(("species", number), self.api.species, number, current_task_cancelled, priority=PRIORITY_GUESS, token=token).add_done_callback(lambda f: self._on_species_fetched(number, token, f))
+
+    def _bundle_lookup(self, number):
+        return self.bundle.get(number), self._local_sprite(number, (180, 180))
+
+    def _on_bundle_lookup(self, number, token, future):
+        if self.requests.is_stale(token, future): return
         try:
-            ctx = ssl.create_default_context(); ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
-            hdr = {"User-Agent": "Mozilla/5.0"}
-            
-            with urllib.request.urlopen(urllib.request.Request(url_m, headers=hdr), timeout=5, context=ctx) as r:
-                d_m = json.loads(r.read().decode())
-                h = d_m['height'] / 10; w = d_m['weight'] / 10
-                types = ", ".join([self.type_map.get(t['type']['name'], t['type']['name']) for t in d_m['types']])
-                img_url = d_m['sprites']['front_default']
-                img_data = None
-                if img_url:
-                    with urllib.request.urlopen(urllib.request.Request(img_url, headers=hdr), timeout=5, context=ctx) as ir:
-                        img_data = ir.read()
-
-            with urllib.request.urlopen(urllib.request.Request(url_s, headers=hdr), timeout=5, context=ctx) as r:
-                d_s = json.loads(r.read().decode())
-                name = d_m['name']
-                for n in d_s['names']:
-                    if n['language']['name'] == 'ko': name = n['name']; break
-                desc = "설명 없음"
-                for d in d_s['flavor_text_entries']:
-                    if d['language']['name'] == 'ko':
-                        desc = d['flavor_text'].replace("\n", " ").replace("\f", " ")
-                        break
-            
-            self.after_idle(lambda: self._update_ui_complete(number, name, types, h, w, desc, img_data))
+            entry, image = future.result()
+            types = ", ".join([self.type_map.get(t, t) for t in entry['types']])
         except:
-            self.after_idle(lambda: self.desc_label.config(text="데이터 로딩 실패..."))
+            self.ui.post(self._show_load_error, token)
+            return
+        self._post_top_update(number, token, name=entry['name_ko'], types=types, h=entry['height'] / 10, w=entry['weight'] / 10,
+                              desc=entry['flavor'], image=image, name_is_kor=True)
 
-    def _update_ui_complete(self, num, name, types, h, w, desc, img_data):
-        self.basic_info_label.config(text=f"No.{num:03d} {name}")
-        if img_data:
-            try:
-                p_img = Image.open(BytesIO(img_data)).resize((180, 180), Image.NEAREST)
-                tk_img = ImageTk.PhotoImage(p_img)
-                self.img_label.config(image=tk_img)
-                self.current_image = tk_img
-            except: self.img_label.config(image='')
-        else: self.img_label.config(image='')
-        
-        stats_text = f"타입: {types} | 키: {h}m | 몸무게: {w}kg"
-        self.stats_label.config(text=stats_text)
-        
-        curr_hint = self.desc_label.cget("text").split("\n")[0]
-        if "분석" in curr_hint or "튀어" in curr_hint: curr_hint = ""
-        self.desc_label.config(text=f"{curr_hint}\n\n{desc}")
+    def _on_pokemon_fetched(self, number, token, future):
+        if self.requests.is_stale(token, future): return
+        try:
+            d_m = future.result()
+            h = d_m['height'] / 10; w = d_m['weight'] / 10
+            types = ", ".join([self.type_map.get(t['type']['name'], t['type']['name']) for t in d_m['types']])
+            img_url = d_m['sprites']['front_default']
+        except:
+            self.ui.post(self._show_load_error, token)
+            return
+        self._post_top_update(number, token, name=d_m['name'], types=types, h=h, w=w)
+        if img_url and not self._in_atlas(number):
+            image = self.images.get(img_url, (180, 180))
+            if image is not None:
+                self._post_top_update(number, token, image=image)
+            else:
+                self.workers.submit(("bytes", img_url), self.api.get_bytes, img_url, current_task_cancelled, priority=PRIORITY_GUESS, token=token).add_done_callback(lambda f: self._on_sprite_fetched(number, token, img_url, f))
+
+    def _on_local_sprite(self, number, token, future):
+        if self.requests.is_stale(token, future): return
+        try: image = future.result()
+        except: return
+        if image is not None: self._post_top_update(number, token, image=image)
+
+    def _on_sprite_fetched(self, number, token, img_url, future):
+        if self.requests.is_stale(token, future): return
+        try: image = self._decode_sprite(img_url, future.result(), (180, 180))
+        except: return
+        self._post_top_update(number, token, image=image)
+
+    def _on_species_fetched(self, number, token, future):
+        if self.requests.is_stale(token, future): return
+        try:
+            d_s = future.result()
+            name = None
+            for n in d_s['names']:
+                if n['language']['name'] == 'ko': name = n['name']; break
+            desc = "설명 없음"
+            for d in d_s['flavor_text_entries']:
+                if d['language']['name'] == 'ko':
+                    desc = d['flavor_text'].replace("\n", " ").replace("\f", " ")
+                    break
+        except:
+            self.ui.post(self._show_load_error, token)
+            return
+        self._post_top_update(number, token, name=name, desc=desc, name_is_kor=True)
+
+    def _show_load_error(self, token):
+        if token.stale: return
+        if self._network_healthy(): self.desc_label.config(text="데이터 로딩 실패...")
+        else: self.desc_label.config(text="네트워크 불안정: 캐시에 없는 데이터라 불러오지 못했습니다.")
+
+    def _network_healthy(self):
+        http = self.api.http if self.api is not None else None
+        return not hasattr(http, "is_healthy") or http.is_healthy()
+
+    def _on_network_state(self):
+        # 회로 차단기가 열리면(연속 실패) 창 제목에 표시 (그동안 요청은 바로 실패하고 캐시된 데이터만 사용)
+        title = "포켓몬 도감 (서바이벌 모드)"
+        self.title(title if self._network_healthy() else f"{title} - 네트워크 불안정 (캐시 사용 중)")
+
+    def _post_top_update(self, num, token, **fields):
+        # 같은 프레임 안에 도착한 상단 화면 조각(이름/타입/설명/이미지)은 합쳐서 한 번에 그린다
+        self.ui.post(self._update_ui_complete, num, token, key="top-screen", merge=self._merge_top_fields, **fields)
+
+    @staticmethod
+    def _merge_top_fields(old, new):
+        merged = dict(old)
+        for k, v in new.items():
+            if v is not None and k not in ("name", "name_is_kor"): merged[k] = v
+        # 한글 이름이 먼저 와 있으면 영문 이름으로 덮지 않는다
+        if new.get("name") and (new.get("name_is_kor") or not old.get("name_is_kor")):
+            merged["name"] = new["name"]
+            merged["name_is_kor"] = new.get("name_is_kor", False)
+        return merged
+
+    def _update_ui_complete(self, num, token, name=None, types=None, h=None, w=None, desc=None, image=None, name_is_kor=False):
+        # 요청별 결과가 도착하는 순서대로 부분 갱신 (이름/타입 -> 설명/이미지)
+        # 화면에 올리기 직전에도 한 번 더 확인해서, 그 사이 새 요청이 생겼으면 디코딩 없이 버린다
+        if token.stale:
+            self.requests.discard()
+            return
+        with perf.span("ui.update"):
+            if self.top_screen_num != num:
+                self.top_screen_num = num
+                self.top_name_is_kor = False
+                self.img_label.config(image='')
+                self.current_image = None
+            if name and (name_is_kor or not self.top_name_is_kor):
+                self.basic_info_label.config(text=f"No.{num:03d} {name}")
+                self.top_name_is_kor = name_is_kor
+            if image is not None:
+                try:
+                    tk_img = _photo_image(image)
+                    self.img_label.config(image=tk_img)
+                    self.current_image = tk_img
+                    if self.guess_started is not None and self.guess_started[0] is token:
+                        perf.record("guess.image", (time.perf_counter() - self.guess_started[1]) * 1000)
+                        self.guess_started = None
+                except: self.img_label.config(image='')
+
+            if types is not None:
+                stats_text = f"타입: {types} | 키: {h}m | 몸무게: {w}kg"
+                self.stats_label.config(text=stats_text)
+
+            if desc is not None:
+                curr_hint = self.desc_label.cget("text").split("\n")[0]
+                if "분석" in curr_hint or "튀어" in curr_hint: curr_hint = ""
+                self.desc_label.config(text=f"{curr_hint}\n\n{desc}")
+
+    def _check_guess_event(self, event):
+        # 자동 완성 목록에서 고른 항목이 있으면 번호만 채우고, 없으면 바로 추측
+        if self.suggest_numbers and self.suggest_box.curselection():
+            self._pick_suggestion()
+            return
+        self._check_guess()
+
+    def _on_guess_typed(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Escape"): return
+        text = self.guess_entry.get().strip()
+        if self.names is None or not text or text.isdigit():
+            self._hide_suggestions()
+            return
+        with perf.span("names.search"):
+            results = self.names.search(text, self.game.lo, self.game.hi, limit=6)
+        if not results:
+            self._hide_suggestions()
+            return
+        self.suggest_numbers = [number for number, _, _ in results]
+        self.suggest_box.delete(0, tk.END)
+        for number, name, lang in results:
+            kor = self.names.name(number) or name
+            self.suggest_box.insert(tk.END, f"No.{number:03d} {kor}" + (f" ({name})" if lang != "ko" else ""))
+        self.suggest_box.config(height=len(results))
+        self.suggest_box.place(in_=self.guess_entry, relx=0, rely=1.0, y=2, width=240)
+        self.suggest_box.lift()
+
+    def _move_suggestion(self, step):
+        if not self.suggest_numbers: return
+        sel = self.suggest_box.curselection()
+        i = (sel[0] + step) % len(self.suggest_numbers) if sel else (0 if step > 0 else len(self.suggest_numbers) - 1)
+        self.suggest_box.selection_clear(0, tk.END)
+        self.suggest_box.selection_set(i)
+        self.suggest_box.see(i)
+        return "break"
+
+    def _pick_suggestion(self):
+        sel = self.suggest_box.curselection()
+        if not sel or not self.suggest_numbers: return
+        number = self.suggest_numbers[sel[0]]
+        self._hide_suggestions()
+        self.guess_entry.delete(0, tk.END)
+        self.guess_entry.insert(0, str(number))
+        self.guess_entry.focus_set()
 
-    def _check_guess_event(self, event): self._check_guess()
+    def _hide_suggestions(self):
+        self.suggest_numbers = []
+        self.suggest_box.place_forget()
+
+    def _resolve_guess(self, val):
+        # 입력 -> 도감 번호: 숫자, 이름 색인의 정확한 이름(한/영/일), 또는 현재 범위에서 하나뿐인 접두어 후보
+        val = val.strip()
+        if val.isdigit() or self.names is None: return int(val)
+        number = self.names.lookup(val)
+        if number is not None: return number
+        results = self.names.search(val, self.game.lo, self.game.hi, limit=2)
+        if len(results) == 1: return results[0][0]
+        raise ValueError(val)
 
     def _check_guess(self):
         try:
             val = self.guess_entry.get()
-            if not val: return
-            guess = int(val)
-            if guess < self.current_min or guess > self.current_max:
+            if not val.strip(): return
+            self._hide_suggestions()
+            guess = self._resolve_guess(val)
+            before = self.game.copy()
+            event = engine.guess(self.game, guess)
+            if event == engine.OUT_OF_RANGE:
                 messagebox.showwarning("범위 이탈", "범위를 벗어났다!")
                 return
+            if self.policy: self.belief.update(before, engine.GUESS, guess, event, self.game)
             
-            self.attempts += 1
             self.desc_label.config(text=f"도감 No.{guess}...\n데이터를 대조하고 있다...")
-            threading.Thread(target=self._get_pokemon_data_thread, args=(guess,), daemon=True).start()
+            token = self._new_request_token()
+            if perf.enabled: self.guess_started = (token, time.perf_counter())
+            self._get_pokemon_data(guess, token)
 
-            if guess == self.secret_number:
-                self.guess_history.append((guess, "정답"))
+            if event == engine.CAUGHT:
                 self.save_record("성공") # [수정] 성공 시 기록 저장
-                messagebox.showinfo("성공", f"신난다! 포켓몬을 잡았다!\n(남은 볼: {self.current_lives}개)\n정답: 도감 No.{self.secret_number}")
+                messagebox.showinfo("성공", f"신난다! 포켓몬을 잡았다!\n(남은 볼: {self.game.lives}개)\n정답: 도감 No.{self.game.secret}")
                 self.show_menu()
             else:
-                self.current_lives -= 1
                 self._update_lives_ui()
-                if self.current_lives <= 0:
-                    self.guess_history.append((guess, "실패"))
+                if event == engine.LOST:
                     self.game_over()
                     return
                 
-                sq = 0
-                if self.buff_x_attack and self.buff_x_attack_turns > 0:
-                    sq = max(1, int((self.current_max - self.current_min) * 0.05))
-                    self.buff_x_attack_turns -= 1 
-                    if self.buff_x_attack_turns <= 0:
-                        self.buff_x_attack = False 
-                
-                hint = ""
-                if guess < self.secret_number:
-                    self.current_min = max(self.current_min, guess + 1 + sq)
-                    if self.buff_x_attack: self.current_max = max(self.secret_number, self.current_max - sq)
-                    hint = f"▲ UP! (더 높은 숫자입니다)"
-                    self.guess_history.append((guess, "UP"))
-                else:
-                    self.current_max = min(self.current_max, guess - 1 - sq)
-                    if self.buff_x_attack: self.current_min = min(self.secret_number, self.current_min + sq)
-                    hint = f"▼ DOWN! (더 낮은 숫자입니다)"
-                    self.guess_history.append((guess, "DOWN"))
-                
-                if sq > 0:
-                    hint += f"\n(플러스파워 효과로 범위가 더 좁혀졌다! 남은 턴: {self.buff_x_attack_turns})"
-                elif self.buff_x_attack == False and self.buff_x_attack_turns == 0 and sq > 0: 
-                     hint += "\n(플러스파워의 효과가 사라졌다!)"
-
-                if self.current_min > self.current_max:
-                    self.current_min = self.secret_number; self.current_max = self.secret_number
+                if event == engine.UP: hint = f"▲ UP! (더 높은 숫자입니다)"
+                else: hint = f"▼ DOWN! (더 낮은 숫자입니다)"
+                if self.game.squeeze > 0:
+                    hint += f"\n(플러스파워 효과로 범위가 더 좁혀졌다! 남은 턴: {self.game.xturns})"
                 
-                self.game_range_label.config(text=f"범위: {self.current_min} ~ {self.current_max}")
+                self.game_range_label.config(text=f"범위: {self.game.lo} ~ {self.game.hi}")
                 self.desc_label.config(text=hint)
+                self._prefetch_range()
+            self.guess_entry.delete(0, tk.END)
+        except ValueError:
+            if self.names is None: messagebox.showwarning("오류", "숫자만 입력할 수 있다!")
+            else: messagebox.showwarning("오류", "그런 포켓몬은 도감에 없다!\n(도감 번호나 이름을 입력하자)")
+
+    def _policy_move(self):
+        # 최적 행동 테이블 조회 (테이블이 없거나 범위가 테이블보다 넓으면 None)
+        if self.policy is None: return None
+        return self.policy.lookup(self.game, self.belief)
+
+    def show_professor_hint(self):
+        if self.policy is None:
+            self.desc_label.config(text="오박사: 연구 자료가 없다네...\n(python updown_solver.py build 로 테이블을 만들어 주게)")
+            return
+        move = self._policy_move()
+        if move is None:
+            self.desc_label.config(text="오박사: 범위가 너무 넓어 아직 모르겠군.\n일단 가운데부터 찔러 보게!")
+            return
+        action, arg, p = move
+        if action == engine.ITEM: text = f"오박사: 지금은 {engine.ITEM_NAMES[arg]}을(를) 쓰는 게 좋겠군!"
+        else: text = f"오박사: 도감 No.{arg} 을(를) 노려 보게!"
+        self.desc_label.config(text=f"{text}\n(예상 포획 확률 {p:.0%})")
+
+    def toggle_auto_play(self):
+        if self.auto_play:
+            self._stop_auto_play()
+            return
+        self.auto_play = True
+        self.auto_btn.config(text="■ 정지")
+        self.auto_job = self.after(300, self._auto_step)
+
+    def _stop_auto_play(self):
+        self.auto_play = False
+        if self.auto_job:
+            self.after_cancel(self.auto_job)
+            self.auto_job = None
+        self.auto_btn.config(text="▶ 자동")
+
+    def _auto_step(self):
+        # 테이블의 최적 행동을 하나 실행 (테이블 밖이면 후보 구간 가운데를 추측)
+        self.auto_job = None
+        if not self.auto_play: return
+        move = self._policy_move()
+        if move is None:
+            lo, hi = max(self.belief.a, self.game.lo), min(self.belief.b, self.game.hi)
+            if lo > hi: lo, hi = self.game.lo, self.game.hi
+            move = (engine.GUESS, (lo + hi) // 2, None)
+        action, arg, _ = move
+        if action == engine.ITEM:
+            self.use_item(arg)
+        else:
             self.guess_entry.delete(0, tk.END)
-        except ValueError: messagebox.showwarning("오류", "숫자만 입력할 수 있다!")
+            self.guess_entry.insert(0, str(arg))
+            self._check_guess()
+        if self.auto_play: self.auto_job = self.after(800, self._auto_step)
+
+    def _enable_perf(self):
+        perf.enable()
+        self.lag_monitor.start()
+
+    def perf_metrics(self):
+        # 오버레이와 JSON 저장이 함께 쓰는 지표 (구간 시간, 캐시 적중률, 스레드/작업 풀 상태)
+        metrics = {"time": datetime.now().isoformat(timespec="seconds"), "spans": perf.snapshot(), "threads": threading.active_count(),
+                   "workers": self.workers.stats(), "requests": self.requests.stats(), "ui": self.ui.stats(), "image_cache": self.images.stats()}
+        if self.api is not None and self.api.cache is not None: metrics["disk_cache"] = self.api.cache.stats()
+        if self.prefetcher: metrics["prefetch"] = self.prefetcher.stats()
+        if self.atlas is not None: metrics["atlas"] = self.atlas.stats()
+        if self.fixture_server: metrics["fixture_server"] = self.fixture_server.stats()
+        if self.api is not None and hasattr(self.api.http, "stats"): metrics["network"] = self.api.http.stats()
+        for key in ("image_cache", "disk_cache"):
+            if key in metrics: metrics[key]["hit_ratio"] = hit_ratio(metrics[key])
+        return metrics
+
+    def toggle_perf_overlay(self):
+        if self.perf_label is not None:
+            self.after_cancel(self.perf_overlay_job)
+            self.perf_label.destroy()
+            self.perf_label = None
+            if not self.PERF_DUMP_FILE:
+                perf.disable()
+                self.lag_monitor.stop()
+            return
+        self._enable_perf()
+        # 메뉴/게임 어느 화면이든 상단 화면 왼쪽 위에 겹쳐 표시
+        self.perf_label = Label(self, font=("Courier", 8), bg="black", fg="#00FF00", justify="left", anchor="nw")
+        self.perf_label.place(x=35, y=80)
+        self._refresh_perf_overlay()
+
+    def _refresh_perf_overlay(self):
+        m = self.perf_metrics()
+        lines = [f"{'구간':<12}{'p50':>7}{'p95':>7}{'max':>7} ms"]
+        for name, s in m["spans"].items():
+            lines.append(f"{name:<12}{s['p50_ms']:>7.1f}{s['p95_ms']:>7.1f}{s['max_ms']:>7.1f} ({s['count']})")
+        for key, label in (("disk_cache", "디스크"), ("image_cache", "이미지")):
+            ratio = m.get(key, {}).get("hit_ratio")
+            if ratio is not None: lines.append(f"{label} 캐시 적중 {ratio:.0%}")
+        w = m["workers"]
+        lines.append(f"스레드 {m['threads']} | 작업 {w['active']}/{w['workers']} 대기 {w['queued']}")
+        net = m.get("network")
+        if net:
+            for host, h in net["hosts"].items():
+                lines.append(f"{host[:18]:<18} {h['state']:<9} 타임아웃 {h['timeout_ms']:.0f}ms")
+            lines.append(f"재시도 {net['retries']} 헤지 {net['hedges']}({net['hedge_wins']}승) 차단 {net['fast_fails']}")
+        self.perf_label.config(text="\n".join(lines))
+        self.perf_label.lift()
+        self.perf_overlay_job = self.after(500, self._refresh_perf_overlay)
+
+    def _dump_perf(self):
+        try: dump_json(self.PERF_DUMP_FILE, self.perf_metrics())
+        except OSError as e: print(f"계측 저장 오류: {e}")
+        self.after(self.perf_interval_ms, self._dump_perf)
 
     def open_adventure_log(self):
         if hasattr(self, 'log_window') and self.log_window is not None and self.log_window.winfo_exists():
@@ -637,11 +1103,15 @@ class PokedexGame(tk.Tk):
         
         Button(header, text="✖ 닫기", font=self.FONT_SMALL, command=self.log_window.destroy).pack(side="right")
         Button(header, text="🗑️ 기록 초기화", font=self.FONT_SMALL, bg="#FF3333", fg="white", command=self.reset_history).pack(side="right", padx=10)
-
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("Log.Treeview", background="#E0F7FA", fieldbackground="#E0F7FA", font=(self.FONT_FAMILY, 9), rowheight=25)
-        style.configure("Log.Treeview.Heading", font=(self.FONT_FAMILY, 10, "bold"), background="#4DD0E1", foreground="white")
+        Button(header, text="📊 통계", font=self.FONT_SMALL, command=self.toggle_stats_panel).pack(side="right")
+        self.stats_frame = None
+        self.log_count_label = Label(header, text="", font=self.FONT_SMALL, bg="#6890F0", fg="white")
+        self.log_count_label.pack(side="right")
+
+        self._configure_styles()
+        if hasattr(self.history, "query"):
+            self.log_window.geometry("720x460")
+            self._build_history_filter_bar()
         
         cols = ("date", "gen", "poke", "try", "item")
         self.history_tree = ttk.Treeview(self.log_window, columns=cols, show="headings", style="Log.Treeview") 
@@ -659,7 +1129,7 @@ class PokedexGame(tk.Tk):
         self.history_tree.column("item", width=120, anchor="w")
         
         sb = ttk.Scrollbar(self.log_window, orient="vertical", command=self.history_tree.yview)
-        self.history_tree.configure(yscrollcommand=sb.set)
+        self.history_tree.configure(yscrollcommand=lambda first, last: self._on_history_scroll(sb, first, last))
         
         self.history_tree.pack(side="left", fill="both", expand=True, padx=(10,0), pady=10)
         sb.pack(side="right", fill="y", pady=10, padx=(0,10))
@@ -670,72 +1140,182 @@ class PokedexGame(tk.Tk):
         
         self.load_history_to_tree()
 
+    def _build_history_filter_bar(self):
+        # 검색 조건: 기간(앞부분만 입력 가능: 2026, 2026-01, 2026-01-15), 지역, 결과, 포켓몬(이름 앞부분 또는 도감 번호), 정렬
+        bar = tk.Frame(self.log_window, bg="#E8EEF9", padx=10, pady=5)
+        bar.pack(fill="x")
+        self.filter_date_from = Entry(bar, width=10, font=self.FONT_SMALL)
+        self.filter_date_to = Entry(bar, width=10, font=self.FONT_SMALL)
+        regions = sorted({region_name(name) for name in engine.GENERATIONS} | set((self.history.stats_summary() or {}).get("generations", {})))
+        self.filter_region = ttk.Combobox(bar, values=["전체 지역"] + regions, state="readonly", width=14, font=self.FONT_SMALL)
+        self.filter_outcome = ttk.Combobox(bar, values=["전체 결과", *OUTCOMES], state="readonly", width=7, font=self.FONT_SMALL)
+        self.filter_pokemon = Entry(bar, width=9, font=self.FONT_SMALL)
+        self.filter_sort = ttk.Combobox(bar, values=list(self.HISTORY_SORT_NAMES.values()), state="readonly", width=9, font=self.FONT_SMALL)
+        for widget, text in ((self.filter_date_from, "기간"), (self.filter_date_to, "~"), (self.filter_region, None), (self.filter_outcome, None),
+                             (self.filter_pokemon, "포켓몬"), (self.filter_sort, None)):
+            if text: Label(bar, text=text, font=self.FONT_SMALL, bg="#E8EEF9").pack(side="left", padx=(4, 2))
+            widget.pack(side="left", padx=2)
+        Button(bar, text="↺", font=self.FONT_SMALL, command=self._reset_history_filters).pack(side="right")
+        Button(bar, text="🔍 검색", font=self.FONT_SMALL, command=self._apply_history_filters).pack(side="right", padx=4)
+        for entry in (self.filter_date_from, self.filter_date_to, self.filter_pokemon):
+            entry.bind("<Return>", lambda e: self._apply_history_filters())
+        for combo in (self.filter_region, self.filter_outcome, self.filter_sort):
+            combo.bind("<<ComboboxSelected>>", lambda e: self._apply_history_filters())
+        self._show_history_filters()
+
+    def _show_history_filters(self):
+        f = self.history_filters
+        for entry, key in ((self.filter_date_from, "date_from"), (self.filter_date_to, "date_to"), (self.filter_pokemon, "pokemon")):
+            entry.delete(0, "end"); entry.insert(0, f.get(key, ""))
+        self.filter_region.set(f.get("generation") or "전체 지역")
+        self.filter_outcome.set(f.get("outcome") or "전체 결과")
+        self.filter_sort.set(self.HISTORY_SORT_NAMES[self.history_sort])
+
+    def _apply_history_filters(self):
+        filters = {}
+        for entry, key in ((self.filter_date_from, "date_from"), (self.filter_date_to, "date_to")):
+            value = entry.get().strip()
+            if value and not re.fullmatch(r"\d{4}(-\d{2}(-\d{2})?)?", value):
+                messagebox.showwarning("검색", "기간은 2026, 2026-01, 2026-01-15 형식으로 입력해 주세요.", parent=self.log_window)
+                return
+            if value: filters[key] = value
+        if self.filter_region.get() != "전체 지역": filters["generation"] = self.filter_region.get()
+        if self.filter_outcome.get() != "전체 결과": filters["outcome"] = self.filter_outcome.get()
+        if self.filter_pokemon.get().strip(): filters["pokemon"] = self.filter_pokemon.get().strip()
+        self.history_filters = filters
+        self.history_sort = next(key for key, name in self.HISTORY_SORT_NAMES.items() if name == self.filter_sort.get())
+        self.load_history_to_tree()
+
+    def _reset_history_filters(self):
+        self.history_filters = {}
+        self.history_sort = "recent"
+        self._show_history_filters()
+        self.load_history_to_tree()
+
     def load_history_to_tree(self):
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
+        # 전체를 한 번에 넣지 않고 최신 기록부터 화면 한 페이지 + 미리 읽기 한 페이지만 넣는다
+        # 나머지는 스크롤이 끝에 가까워질 때 _load_more_history 가 이어서 넣는다
+        # SQLite 저장소면 검색 조건/정렬을 색인 조회로 처리하고, 다음 페이지는 마지막 행 다음부터 이어 읽는다
+        with perf.span("history.load"):
+            for item in self.history_tree.get_children():
+                self.history_tree.delete(item)
+            if self.history_reader is not None: self.history_reader.close()
+            if hasattr(self.history, "query"):
+                self.history_reader = self.history.query(self.history_filters, self.history_sort)
+            else:
+                self.history_reader = self.history.reverse_reader()
+            self.history_total = None
+            self.history_shown = 0
+
+            self._load_more_history(self.LOG_PAGE_SIZE * 2)
+            if self.history_shown == 0:
+                self.history_tree.insert("", "end", values=("조건에 맞는 기록 없음" if self.history_filters else "기록 없음", "-", "-", "-", "-"))
+            self._update_log_count_label()
+        # 전체 개수는 줄 수만 세면 되므로 백그라운드에서 센다 (검색 중이면 조건에 맞는 개수)
+        filters = dict(self.history_filters) if hasattr(self.history, "query") else None
+        count = self.history.count if filters is None else (lambda: self.history.count(filters))
+        self.workers.submit(("history-count", repr(filters)), count, priority=PRIORITY_GAME).add_done_callback(
+            lambda future: self._on_history_counted(future, filters))
+
+    def _on_history_counted(self, future, filters=None):
+        try: total = future.result()
+        except: return
+        self.ui.post(self._set_history_total, total, filters, key="history-count")
+
+    def _set_history_total(self, total, filters=None):
+        if filters is not None and filters != self.history_filters: return  # 그 사이 검색 조건이 바뀜
+        self.history_total = total
+        self._update_log_count_label()
+
+    def _update_log_count_label(self):
+        if self.log_window is None or not self.log_window.winfo_exists(): return
+        total = "..." if self.history_total is None else f"{self.history_total:,}"
+        prefix = "검색" if self.history_filters and hasattr(self.history, "query") else "총"
+        self.log_count_label.config(text=f"{prefix} {total}건 (표시 {self.history_shown:,}건)")
+
+    def _on_history_scroll(self, sb, first, last):
+        sb.set(first, last)
+        if float(last) > 0.9 and self.history_reader is not None and not self.history_reader.exhausted:
+            self._load_more_history(self.LOG_PAGE_SIZE)
+            self._update_log_count_label()
+
+    def _load_more_history(self, size):
+        try:
+            for item in self.history_reader.next_page(size):
+                # [수정] 태그 로직 변경: 실패/도망/성공 구분
+                attempts_str = item["attempts"]
+                if "실패" in attempts_str:
+                    tag = "fail"
+                elif "도망" in attempts_str:
+                    tag = "gray"
+                else:
+                    tag = "success"
+                    
+                self.history_tree.insert("", "end", values=(
+                    item.get("date",""), item.get("generation",""), 
+                    item.get("pokemon",""), attempts_str, item.get("items","")
+                ), tags=(tag,))
+                self.history_shown += 1
+        except: pass
 
-        if os.path.exists(self.HISTORY_FILE):
-            try:
-                with open(self.HISTORY_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    for item in data:
-                        # [수정] 태그 로직 변경: 실패/도망/성공 구분
-                        attempts_str = item["attempts"]
-                        if "실패" in attempts_str:
-                            tag = "fail"
-                        elif "도망" in attempts_str:
-                            tag = "gray"
-                        else:
-                            tag = "success"
-                            
-                        self.history_tree.insert("", "end", values=(
-                            item.get("date",""), item.get("generation",""), 
-                            item.get("pokemon",""), attempts_str, item.get("items","")
-                        ), tags=(tag,))
-            except: pass
-        else:
-            self.history_tree.insert("", "end", values=("기록 없음", "-", "-", "-", "-"))
+    def toggle_stats_panel(self):
+        # PC 박스 위쪽 통계 패널 (집계 색인만 읽으므로 기록 수와 무관하게 바로 열린다)
+        if self.stats_frame is not None:
+            self.stats_frame.destroy()
+            self.stats_frame = None
+            return
+        self.stats_frame = tk.Frame(self.log_window, bg="#E3F2FD", bd=2, relief="groove", padx=10, pady=5)
+        self.stats_frame.pack(side="top", fill="x", padx=10, pady=(10, 0), before=self.history_tree)
+        self.stats_summary_label = Label(self.stats_frame, text="", font=self.FONT_SMALL, bg="#E3F2FD", justify="left", anchor="w")
+        self.stats_summary_label.pack(fill="x")
+        self.stats_tree = ttk.Treeview(self.stats_frame, columns=("name", "games", "rate", "avg"), show="headings", height=6, style="Log.Treeview")
+        self.stats_tree.heading("name", text="지역 / 도구"); self.stats_tree.column("name", width=200, anchor="w")
+        self.stats_tree.heading("games", text="판 수"); self.stats_tree.column("games", width=70, anchor="center")
+        self.stats_tree.heading("rate", text="포획률"); self.stats_tree.column("rate", width=70, anchor="center")
+        self.stats_tree.heading("avg", text="평균 시도"); self.stats_tree.column("avg", width=70, anchor="center")
+        self.stats_tree.tag_configure("item", foreground="#6A1B9A")
+        self.stats_tree.pack(fill="x", pady=(5, 0))
+        self._refresh_stats_panel()
+
+    def _refresh_stats_panel(self):
+        if self.stats_frame is None or not self.stats_frame.winfo_exists(): return
+        s = self.history.stats_summary()
+        if s is None:
+            # 시작 시 집계를 저널에 맞추는 중 (처음 한 번만, 백그라운드)
+            self.stats_summary_label.config(text="기록 집계 중...")
+            self.after(200, self._refresh_stats_panel)
+            return
+        outcomes = s["outcomes"]
+        self.stats_summary_label.config(text=f"총 {s['games']:,}판 | 포획 {s['wins']:,}회 ({s['win_rate']:.1%}) | 실패 {outcomes.get('실패', 0):,} | 도망 {outcomes.get('도망', 0):,}\n"
+                                             f"포획까지 평균 {s['avg_attempts']:.2f}회 | 연속 포획 {s['streak']}회 (최고 {s['best_streak']}회)")
+        for row in self.stats_tree.get_children(): self.stats_tree.delete(row)
+        for name, g in sorted(s["generations"].items()):
+            self.stats_tree.insert("", "end", values=(name, f"{g['games']:,}", f"{g['win_rate']:.1%}", f"{g['avg_attempts']:.2f}" if g["wins"] else "-"))
+        for key, it in sorted(s["items"].items(), key=lambda kv: -kv[1]["games"]):
+            name = "도구 사용 안함" if key == NO_ITEM else engine.ITEM_NAMES.get(key, key)
+            self.stats_tree.insert("", "end", values=(f"🎒 {name}", f"{it['games']:,}", f"{it['win_rate']:.1%}", "-"), tags=("item",))
 
     def reset_history(self):
-        if not os.path.exists(self.HISTORY_FILE):
+        if self.history.is_empty():
             messagebox.showinfo("알림", "삭제할 기록이 없습니다.", parent=self.log_window)
             return
 
         if messagebox.askyesno("경고", "정말로 모든 모험 기록을 삭제하시겠습니까?\n삭제된 데이터는 복구할 수 없습니다.", parent=self.log_window):
             try:
-                os.remove(self.HISTORY_FILE)
+                self.history.clear()
                 self.load_history_to_tree() 
+                self._refresh_stats_panel()
                 messagebox.showinfo("완료", "모험 기록이 초기화되었습니다.", parent=self.log_window)
             except Exception as e:
                 messagebox.showerror("오류", f"파일 삭제 중 오류 발생: {e}", parent=self.log_window)
 
     def save_record(self, outcome="성공"):
-        # [수정] 결과(성공/실패/도망)에 따른 시도 횟수 포맷
-        if outcome == "성공":
-            try_str = f"{self.attempts}회"
-        else:
-            try_str = f"{self.attempts}회 ({outcome})"
-
-        record_data = {
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "pokemon": f"{self.target_name_kor} (No.{self.secret_number})",
-            "generation": self.current_gen_name,
-            "attempts": try_str,
-            "items": ", ".join(self.used_items_log) if self.used_items_log else "사용 안함"
-        }
-        try:
-            if os.path.exists(self.HISTORY_FILE):
-                with open(self.HISTORY_FILE, "r", encoding="utf-8") as f:
-                    history_list = json.load(f)
-            else:
-                history_list = []
-        except: history_list = []
-        
-        history_list.insert(0, record_data)
-        
+        # 결과(성공/실패/도망)별 표시용 문자열 + 통계용 구조화 필드 (pokedex_stats.make_record)
+        record_data = make_record(outcome, self.game.secret, self.target_name_kor, self.current_gen_name, self.game.attempts, self.game.items)
+        # 저널 끝에 한 줄만 덧붙인다 (기록이 아무리 많아도 비용 동일, 통계 집계도 이 한 건만 반영)
         try:
-            with open(self.HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(history_list, f, ensure_ascii=False, indent=4)
+            with perf.span("history.save"):
+                self.history.append(record_data)
         except Exception as e:
             print(f"저장 오류: {e}")
 
@@ -753,10 +1333,37 @@ class PokedexGame(tk.Tk):
                 if mn < mx:
                     self.min_num, self.max_num = mn, mx
                     self.range_label.config(text=f"범위: {mn} ~ {mx}")
+                    self._preload_atlas(mn, mx)
                     win.destroy()
             except: pass
         Button(win, text="설정", command=apply).pack(pady=10)
 
 if __name__ == "__main__":
-    app = PokedexGame()
-    app.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="포켓몬 도감 UP & DOWN 게임")
+    parser.add_argument("--offline", action="store_true", help="네트워크 없이 디스크 캐시에 있는 데이터만 사용")
+    parser.add_argument("--pool-size", type=int, default=4, help="호스트별 최대 동시 연결 수")
+    parser.add_argument("--workers", type=int, default=4, help="백그라운드 작업 스레드 수")
+    parser.add_argument("--image-cache-mb", type=int, default=32, help="디코딩된 이미지 메모리 캐시 용량(MB)")
+    parser.add_argument("--no-prefetch", action="store_true", help="다음 추측 후보 미리 받기 끄기")
+    parser.add_argument("--transport", choices=["live", "record", "replay"], default="live", help="PokeAPI 전송 방식 (record: 픽스처 저장, replay: 픽스처 재생)")
+    parser.add_argument("--fixtures", default="pokedex_fixtures", help="record/replay 픽스처 폴더")
+    parser.add_argument("--latency-ms", type=float, default=0, help="replay: 응답마다 더할 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="replay: 0~N ms 무작위 추가 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="replay: 503 오류 응답 비율 (0~1)")
+    parser.add_argument("--no-resilience", action="store_true", help="적응형 타임아웃/재시도/헤지 요청/회로 차단기 끄기 (고정 5초 타임아웃)")
+    parser.add_argument("--eager-start", action="store_true", help="게임 화면/네트워크를 모두 준비한 뒤 첫 화면 표시 (시작 시간 비교용)")
+    parser.add_argument("--perf", action="store_true", help="성능 계측 오버레이를 켠 채로 시작 (실행 중 F3 으로 토글)")
+    parser.add_argument("--perf-dump", help="성능 지표를 주기적으로 저장할 JSON 파일")
+    parser.add_argument("--perf-interval", type=float, default=5.0, help="--perf-dump 저장 주기(초)")
+    parser.add_argument("--history", choices=["jsonl", "sqlite"], default="jsonl", help="모험 기록 저장소 (sqlite: PC 박스에서 기간/지역/결과/포켓몬 검색과 정렬)")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="창 없이 다중 세션 게임 서버(HTTP/WebSocket)로 실행 (updown_server.py serve 와 같음)")
+    args = parser.parse_args()
+    if args.serve is not None:
+        from updown_server import run_server
+        run_server(port=args.serve, offline=args.offline, transport=args.transport, fixtures=args.fixtures)
+    else:
+        app = PokedexGame(offline=args.offline, pool_size=args.pool_size, workers=args.workers, image_cache_mb=args.image_cache_mb, prefetch=not args.no_prefetch,
+                          transport=args.transport, fixtures=args.fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                          perf_overlay=args.perf, perf_dump=args.perf_dump, perf_interval=args.perf_interval,
+                          lazy_start=not args.eager_start, history_backend=args.history, resilience=not args.no_resilience)
+        app.mainloop()
@@ -0,0 +1,503 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import updown_engine as engine
+from pokedex_bundle import PokedexBundle, fetch_entry
+from pokedex_log import AdventureLog
+from pokedex_stats import make_record
+
+# 여러 플레이어가 동시에 하는 UP & DOWN 게임 서버 (asyncio, 표준 라이브러리만 사용)
+#   HTTP       POST /sessions {"generation": 프리셋 이름} 또는 {"range": [MIN, MAX]}  -> 새 게임
+#              POST /sessions/<id>/guess {"number": N}
+#              POST /sessions/<id>/item {"item": "scope-lens" | "x-attack" | "sitrus-berry"}
+#              POST /sessions/<id>/run,  GET /sessions/<id>,  GET /pokemon/<N>,  GET /stats
+#   WebSocket  /ws 로 연결한 뒤 {"op": "new" | "guess" | "item" | "run" | "state" | "pokemon", ...} JSON 메시지
+#              (new 로 만든 세션은 그 연결의 기본 세션이 되어 id 를 생략할 수 있다)
+# 세션은 엔진 상태(GameState, __slots__) 와 마지막 사용 시각뿐이고, idle_timeout 동안 쓰지 않은 세션은 정리한다.
+# 도감 데이터(번들, 디스크 캐시, 메모리 캐시)는 모든 세션이 공유하고, 끝난 게임은 save_record 와 같은 형식으로 저널에 남긴다.
+
+DEFAULT_PORT = 8766
+SERVER_LOG = "pokedex_server_log.jsonl"
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY = 64 * 1024
+
+_REASONS = {101: "Switching Protocols", 200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class Session:
+    __slots__ = ("id", "state", "generation", "last_seen")
+
+    def __init__(self, sid, state, generation):
+        self.id = sid
+        self.state = state
+        self.generation = generation
+        self.last_seen = time.monotonic()
+
+
+class SharedPokedex:
+    # 모든 세션이 공유하는 도감 조회: 번들 -> 메모리 -> PokeApi(디스크 캐시). 같은 번호의 동시 요청은 하나로 합친다
+    def __init__(self, bundle=None, api=None):
+        self.bundle = bundle
+        self.api = api
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._inflight = {}
+
+    async def get(self, number):
+        entry = self._entries.get(number)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        task = self._inflight.get(number)
+        if task is None:
+            self.misses += 1
+            task = self._inflight[number] = asyncio.ensure_future(self._load(number))
+            task.add_done_callback(lambda t: self._inflight.pop(number, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, number):
+        if self.bundle is not None and number in self.bundle:
+            entry = self.bundle.get(number)
+        elif self.api is not None:
+            # PokeApi 는 블로킹 호출이므로 스레드 풀에서 (실패는 캐시하지 않음)
+            try: entry = await asyncio.get_running_loop().run_in_executor(None, fetch_entry, self.api, number, False)
+            except Exception: return None
+            entry.pop("sprite", None)
+        else:
+            return None
+        self._entries[number] = entry
+        return entry
+
+    def stats(self):
+        out = {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "inflight": len(self._inflight)}
+        if self.api is not None and hasattr(self.api.http, "stats"): out["network"] = self.api.http.stats()
+        return out
+
+
+class GameServer:
+    def __init__(self, pokedex, log=None, idle_timeout=300.0, max_sessions=100_000, seed=None):
+        self.pokedex = pokedex
+        self.log = log
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()  # 마지막 사용 순 (앞쪽이 가장 오래 쉰 세션)
+        self.created = 0
+        self.finished = 0
+        self.evicted = 0
+        self.guesses = 0
+        self.records = 0
+        self.record_errors = 0
+        self.ws_connections = 0
+        self.started = time.monotonic()
+        self._rng = random.Random(seed)
+        self._tasks = set()
+
+    # ---- 게임 ----
+    def dispatch(self, op, sid, params):
+        # (HTTP 상태 코드, 응답 dict). HTTP 와 WebSocket 이 함께 쓴다
+        if op == "new": return self._new_session(params)
+        s = self.sessions.get(sid)
+        if s is None: return 404, {"error": "세션이 없거나 만료되었습니다"}
+        s.last_seen = time.monotonic()
+        self.sessions.move_to_end(sid)
+        st = s.state
+        if op == "state":
+            return 200, self._view(s)
+        if op == "guess":
+            n = params.get("number")
+            if type(n) is not int: return 400, {"error": "number 는 정수여야 합니다"}
+            self.guesses += 1
+            event = engine.guess(st, n)
+            if event == engine.CAUGHT: self._finish(s, "성공")
+            elif event == engine.LOST: self._finish(s, "실패")
+            return 200, self._view(s, event)
+        if op == "item":
+            key = params.get("item")
+            if key not in engine.ITEMS: return 400, {"error": f"item 은 {', '.join(engine.ITEMS)} 중 하나여야 합니다"}
+            event = engine.use_item(st, key)
+            if event == engine.LOST: self._finish(s, "실패")
+            return 200, self._view(s, event)
+        if op == "run":
+            self._finish(s, "도망")
+            return 200, self._view(s, "run")
+        return 400, {"error": f"알 수 없는 요청: {op}"}
+
+    def _new_session(self, params):
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle()
+            if len(self.sessions) >= self.max_sessions: return 503, {"error": "동시 세션 수 한도 초과"}
+        name = params.get("generation")
+        rng = params.get("range")
+        if rng is not None:
+            if not (isinstance(rng, list) and len(rng) == 2 and all(type(v) is int for v in rng) and rng[0] < rng[1]):
+                return 400, {"error": "range 는 [MIN, MAX] (MIN < MAX) 이어야 합니다"}
+            lo, hi = rng
+            name = engine.CUSTOM_RANGE
+        else:
+            name = name or next(iter(engine.GENERATIONS))
+            if name not in engine.GENERATIONS: return 400, {"error": f"알 수 없는 지역: {name}"}
+            lo, hi = engine.GENERATIONS[name]
+        sid = secrets.token_urlsafe(9)
+        s = self.sessions[sid] = Session(sid, engine.new_game(lo, hi, rng=self._rng), name)
+        self.created += 1
+        return 200, self._view(s, "new")
+
+    def _view(self, s, event=None):
+        st = s.state
+        done = s.id not in self.sessions
+        view = {"id": s.id, "event": event, "generation": s.generation, "lo": st.lo, "hi": st.hi, "lives": st.lives,
+                "max_lives": st.max_lives, "attempts": st.attempts, "xturns": st.xturns, "item_used": st.item_used, "done": done}
+        if done: view["secret"] = st.secret
+        return view
+
+    def _finish(self, s, outcome):
+        del self.sessions[s.id]
+        self.finished += 1
+        if self.log is not None: self._spawn(self._record(s, outcome))
+
+    async def _record(self, s, outcome):
+        # 정답 포켓몬 이름은 공유 도감에서, 저널 쓰기(fsync)는 스레드 풀에서 (응답을 기다리게 하지 않음)
+        st = s.state
+        entry = await self.pokedex.get(st.secret)
+        name = entry["name_ko"] if entry else "???"
+        record = make_record(outcome, st.secret, name, s.generation, st.attempts, st.items)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.log.append, record)
+            self.records += 1
+        except Exception as e:
+            self.record_errors += 1
+            print(f"저장 오류: {e}")
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def evict_idle(self):
+        # 앞쪽(가장 오래 쉰 세션)부터 보다가 아직 쓰이는 세션을 만나면 멈춘다 (정리한 수만큼만 비용)
+        deadline = time.monotonic() - self.idle_timeout
+        n = 0
+        while self.sessions:
+            s = next(iter(self.sessions.values()))
+            if s.last_seen > deadline: break
+            del self.sessions[s.id]
+            n += 1
+        self.evicted += n
+        return n
+
+    async def run_evictor(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            self.evict_idle()
+
+    def stats(self):
+        return {"sessions": len(self.sessions), "created": self.created, "finished": self.finished, "evicted": self.evicted,
+                "guesses": self.guesses, "records": self.records, "record_errors": self.record_errors,
+                "ws_connections": self.ws_connections, "uptime_s": round(time.monotonic() - self.started, 1),
+                "pokedex": self.pokedex.stats()}
+
+    async def _pokemon(self, number):
+        if type(number) is not int: return 400, {"error": "도감 번호는 정수여야 합니다"}
+        entry = await self.pokedex.get(number)
+        if entry is None: return 404, {"error": f"No.{number} 데이터를 찾을 수 없습니다"}
+        return 200, entry
+
+    # ---- HTTP / WebSocket ----
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                req = await _read_request(reader)
+                if req is None: break
+                method, path, headers, body = req
+                if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(reader, writer, headers)
+                    break
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        try: params = json.loads(body) if body else {}
+        except ValueError: params = None
+        if not isinstance(params, dict): return 400, {"error": "본문은 JSON 객체여야 합니다"}
+        if method == "GET" and parts == ["stats"]: return 200, self.stats()
+        if method == "GET" and len(parts) == 2 and parts[0] == "pokemon":
+            return await self._pokemon(int(parts[1]) if parts[1].isdigit() else None)
+        if parts[0] == "sessions":
+            if method == "POST" and len(parts) == 1: return self.dispatch("new", None, params)
+            if method == "GET" and len(parts) == 2: return self.dispatch("state", parts[1], params)
+            if method == "POST" and len(parts) == 3 and parts[2] in ("guess", "item", "run"): return self.dispatch(parts[2], parts[1], params)
+        return 404, {"error": f"없는 경로: {method} {path}"}
+
+    async def _websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            writer.write(_http_response(400, {"error": "Sec-WebSocket-Key 가 없습니다"}, False))
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(f"HTTP/1.1 101 {_REASONS[101]}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n".encode())
+        self.ws_connections += 1
+        sid = None
+        try:
+            while True:
+                opcode, data = await ws_read(reader)
+                if opcode == 8:
+                    writer.write(ws_frame(b"", 8))
+                    break
+                if opcode == 9:
+                    writer.write(ws_frame(data, 10))
+                    continue
+                if opcode != 1: continue
+                try: msg = json.loads(data)
+                except ValueError: msg = None
+                if not isinstance(msg, dict):
+                    status, payload = 400, {"error": "메시지는 JSON 객체여야 합니다"}
+                elif msg.get("op") == "pokemon":
+                    status, payload = await self._pokemon(msg.get("number"))
+                else:
+                    status, payload = self.dispatch(msg.get("op"), msg.get("id", sid), msg)
+                    if msg.get("op") == "new" and status == 200: sid = payload["id"]
+                writer.write(ws_frame(json.dumps({"status": status, **payload}, ensure_ascii=False).encode()))
+                await writer.drain()
+        finally:
+            self.ws_connections -= 1
+
+
+async def _read_request(reader):
+    # (메서드, 경로, 헤더(소문자 키), 본문) 또는 연결이 닫혔으면 None
+    line = await reader.readline()
+    if not line: return None
+    method, path, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""): break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY: raise ValueError("본문이 너무 큽니다")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _http_response(status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    return (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode() + body
+
+
+def _mask(data, key):
+    n = len(data)
+    return (int.from_bytes(data, "big") ^ int.from_bytes((key * (n // 4 + 1))[:n], "big")).to_bytes(n, "big")
+
+
+async def ws_read(reader):
+    # (opcode, 본문). 조각난 메시지는 이어 붙여서 돌려주고, 제어 프레임(close/ping/pong)은 바로 돌려준다
+    opcode, message = None, b""
+    while True:
+        b0, b1 = await reader.readexactly(2)
+        n = b1 & 0x7F
+        if n == 126: n = int.from_bytes(await reader.readexactly(2), "big")
+        elif n == 127: n = int.from_bytes(await reader.readexactly(8), "big")
+        if n > MAX_BODY: raise ValueError("메시지가 너무 큽니다")
+        key = await reader.readexactly(4) if b1 & 0x80 else None
+        data = await reader.readexactly(n)
+        if key: data = _mask(data, key)
+        op = b0 & 0x0F
+        if op >= 8: return op, data
+        if op: opcode = op
+        message += data
+        if b0 & 0x80: return opcode, message
+
+
+def ws_frame(payload, opcode=1, mask=False):
+    # 서버 -> 클라이언트 프레임은 마스크 없이, 클라이언트 -> 서버 프레임은 mask=True
+    n = len(payload)
+    bit = 0x80 if mask else 0
+    if n < 126: head = bytes((0x80 | opcode, bit | n))
+    elif n < 65536: head = bytes((0x80 | opcode, bit | 126)) + n.to_bytes(2, "big")
+    else: head = bytes((0x80 | opcode, bit | 127)) + n.to_bytes(8, "big")
+    if not mask: return head + payload
+    key = os.urandom(4)
+    return head + key + _mask(payload, key)
+
+
+def make_pokedex(bundle_path="pokedex.bundle", offline=False, transport="live", fixtures="pokedex_fixtures", cache_dir="pokedex_cache"):
+    from pokedex_api import PokeApi
+    from pokedex_cache import DiskCache
+    from pokedex_transport import make_transport
+    http, _ = make_transport(transport, fixtures)
+    api = PokeApi(DiskCache(cache_dir) if transport == "live" else None, http, offline=offline)
+    return SharedPokedex(PokedexBundle.open(bundle_path), api)
+
+
+async def serve(server, host="127.0.0.1", port=DEFAULT_PORT):
+    srv = await asyncio.start_server(server.handle_connection, host, port, backlog=4096)
+    evictor = asyncio.ensure_future(server.run_evictor())
+    addr = srv.sockets[0].getsockname()
+    print(f"UP & DOWN 게임 서버: http://{addr[0]}:{addr[1]} (WebSocket: /ws, 유휴 세션 {server.idle_timeout:g}초 후 정리)", flush=True)
+    try:
+        async with srv: await srv.serve_forever()
+    finally:
+        evictor.cancel()
+
+
+def run_server(host="127.0.0.1", port=DEFAULT_PORT, idle_timeout=300.0, max_sessions=100_000, log_path=SERVER_LOG, **pokedex_options):
+    server = GameServer(make_pokedex(**pokedex_options), AdventureLog(log_path) if log_path else None, idle_timeout, max_sessions)
+    try: asyncio.run(serve(server, host, port))
+    except KeyboardInterrupt: pass
+
+
+# ---- 부하 발생기 ----
+class _HttpClient:
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def call(self, op, sid=None, **params):
+        path = "/sessions" if op == "new" else f"/sessions/{sid}/{op}"
+        body = json.dumps(params).encode()
+        self.writer.write(f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""): break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length": length = int(value)
+        return {"status": status, **json.loads(await self.reader.readexactly(length))}
+
+    def close(self):
+        self.writer.close()
+
+
+class _WsClient(_HttpClient):
+    async def open(self):
+        await super().open()
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.writer.write(f"GET /ws HTTP/1.1\r\nHost: {self.host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                          f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+        if b" 101 " not in await self.reader.readline(): raise ConnectionError("WebSocket 연결 거부")
+        while (await self.reader.readline()) not in (b"\r\n", b""): pass
+
+    async def call(self, op, sid=None, **params):
+        self.writer.write(ws_frame(json.dumps({"op": op, "id": sid, **params}).encode(), mask=True))
+        _, data = await ws_read(self.reader)
+        return json.loads(data)
+
+
+async def load_test(host, port, players=200, duration=10.0, mode="http", generation=None):
+    # players 명이 각자 연결 하나로 duration 초 동안 게임을 반복 (가운데 추측), 완료된 게임 수와 추측 응답 시간을 잰다
+    clients = [(_WsClient if mode == "ws" else _HttpClient)(host, port) for _ in range(players)]
+    await asyncio.gather(*(c.open() for c in clients))
+    latencies = []
+    totals = {"games": 0, "wins": 0, "errors": 0}
+    stop_at = time.monotonic() + duration
+    params = {"generation": generation} if generation else {}
+
+    async def player(client):
+        while time.monotonic() < stop_at:
+            r = await client.call("new", **params)
+            if r["status"] != 200:
+                totals["errors"] += 1
+                continue
+            sid, lo, hi = r["id"], r["lo"], r["hi"]
+            while True:
+                t0 = time.perf_counter()
+                r = await client.call("guess", sid, number=(lo + hi) // 2)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                if r["status"] != 200:
+                    totals["errors"] += 1
+                    break
+                if r["done"]:
+                    totals["games"] += 1
+                    totals["wins"] += r["event"] == engine.CAUGHT
+                    break
+                lo, hi = r["lo"], r["hi"]
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(player(c) for c in clients))
+    elapsed = time.perf_counter() - t0
+    for c in clients: c.close()
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] if latencies else 0.0
+    return {"mode": mode, "players": players, "seconds": round(elapsed, 2), **totals,
+            "sessions_per_s": round(totals["games"] / elapsed, 1), "guesses_per_s": round(len(latencies) / elapsed, 1),
+            "guess_p50_ms": round(statistics.median(latencies), 3) if latencies else 0.0,
+            "guess_p99_ms": round(pct(0.99), 3), "guess_max_ms": round(latencies[-1], 3) if latencies else 0.0}
+
+
+def _wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5): return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UP & DOWN 다중 세션 게임 서버 / 부하 발생기")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_srv = sub.add_parser("serve", help="HTTP/WebSocket 게임 서버 실행")
+    p_srv.add_argument("--host", default="127.0.0.1")
+    p_srv.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_srv.add_argument("--idle-timeout", type=float, default=300.0, help="이 시간(초) 동안 요청이 없는 세션은 정리")
+    p_srv.add_argument("--max-sessions", type=int, default=100_000)
+    p_srv.add_argument("--log", default=SERVER_LOG, help="끝난 게임 기록 저널 (빈 문자열이면 저장 안 함)")
+    p_srv.add_argument("--offline", action="store_true", help="도감 데이터는 번들/디스크 캐시에 있는 것만 사용")
+    p_srv.add_argument("--transport", choices=["live", "record", "replay"], default="live")
+    p_srv.add_argument("--fixtures", default="pokedex_fixtures")
+    p_load = sub.add_parser("load", help="부하 발생기 (세션/초, 추측 응답 p99)")
+    p_load.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    p_load.add_argument("--players", type=int, default=200, help="동시 접속 수 (각자 연결 하나)")
+    p_load.add_argument("--duration", type=float, default=10.0)
+    p_load.add_argument("--mode", choices=["http", "ws"], default="http")
+    p_load.add_argument("--generation", help="세대 프리셋 이름 (기본: 1세대)")
+    p_load.add_argument("--spawn", action="store_true", help="--url 의 포트로 서버를 별도 프로세스로 띄운 뒤 측정 (기록 저장 없음, 오프라인)")
+    p_load.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        run_server(args.host, args.port, args.idle_timeout, args.max_sessions, args.log or None,
+                   offline=args.offline, transport=args.transport, fixtures=args.fixtures)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or DEFAULT_PORT
+        proc = None
+        if args.spawn:
+            proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "serve", "--host", host, "--port", str(port), "--log", "", "--offline"])
+            if not _wait_for_port(host, port): sys.exit("서버가 시작되지 않았습니다")
+        try:
+            result = asyncio.run(load_test(host, port, args.players, args.duration, args.mode, args.generation))
+        finally:
+            if proc is not None: proc.terminate()
+        print(f"[{result['mode']}] 동시 {result['players']}명, {result['seconds']}초: 게임 {result['games']:,}판 ({result['sessions_per_s']:,}세션/초), "
+              f"추측 {result['guesses_per_s']:,}회/초, p50 {result['guess_p50_ms']}ms, p99 {result['guess_p99_ms']}ms, 오류 {result['errors']}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
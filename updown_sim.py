@@ -0,0 +1,202 @@
+import argparse
+import json
+import time
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("updown_sim 은 numpy 가 필요합니다. (uv pip install numpy)") from e
+
+import updown_engine as engine
+
+# updown_engine 의 규칙을 NumPy 배열로 옮긴 대량 시뮬레이터
+# 게임 한 판씩 파이썬으로 돌리는 대신, 수십만 판의 상태(정답, 범위, 몬스터볼...)를 배열로 두고
+# "모든 판이 한 번씩 행동" 하는 라운드를 끝날 때까지 반복한다. 라운드 수는 몬스터볼 수 정도라 매우 적다.
+
+ITEM_CODES = {key: i + 1 for i, key in enumerate(engine.ITEMS)}  # 0 은 "도구 없음"
+
+
+class Rules:
+    # 밸런스 조정용 규칙 값 (기본값은 실제 게임과 동일)
+    def __init__(self, max_lives=engine.MAX_LIVES, scope_divisor=engine.SCOPE_DIVISOR, x_rate=engine.X_ATTACK_RATE,
+                 x_turns=engine.X_ATTACK_TURNS, sitrus_heal=engine.SITRUS_HEAL):
+        self.max_lives = max_lives
+        self.scope_divisor = scope_divisor
+        self.x_rate = x_rate
+        self.x_turns = x_turns
+        self.sitrus_heal = sitrus_heal
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class Strategy:
+    # 추측은 항상 범위 가운데, 도구는 정해진 시점에 한 번 쓴다
+    #   timing="first": 첫 행동으로 사용 / "late": 몬스터볼이 late_lives 개 이하로 남았을 때 사용
+    def __init__(self, name, item=None, timing=None, late_lives=2):
+        self.name = name
+        self.item = item
+        self.timing = timing
+        self.late_lives = late_lives
+
+    def item_mask(self, b):
+        # 이번 라운드에 도구를 쓸 판 (아직 도구를 안 쓴 판만)
+        if self.item is None: return None
+        if self.timing == "first": return ~b.used & (b.attempts == 0)
+        return ~b.used & (b.lives <= self.late_lives)
+
+
+def default_strategies():
+    strategies = [Strategy("binary")]
+    for key in engine.ITEMS:
+        strategies.append(Strategy(f"{key}-first", key, "first"))
+        strategies.append(Strategy(f"{key}-late", key, "late"))
+    return strategies
+
+
+class _Batch:
+    # 한 묶음의 게임 상태 배열
+    def __init__(self, min_num, max_num, secrets, rules):
+        n = len(secrets)
+        self.secret = secrets
+        self.lo = np.full(n, min_num, dtype=np.int64)
+        self.hi = np.full(n, max_num, dtype=np.int64)
+        self.lives = np.full(n, rules.max_lives, dtype=np.int64)
+        self.attempts = np.zeros(n, dtype=np.int64)
+        self.xturns = np.zeros(n, dtype=np.int64)
+        self.used = np.zeros(n, dtype=bool)
+        self.done = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+
+
+def _use_items(b, m, item, rules):
+    # engine.use_item 과 같은 규칙
+    b.used |= m
+    b.lives -= m
+    if item == "scope-lens":
+        dist = np.maximum(1, (b.hi - b.lo) // rules.scope_divisor)
+        b.lo = np.where(m, np.maximum(b.lo, b.secret - dist), b.lo)
+        b.hi = np.where(m, np.minimum(b.hi, b.secret + dist), b.hi)
+    elif item == "x-attack":
+        b.xturns[m] = rules.x_turns
+    elif item == "sitrus-berry":
+        b.lives = np.where(m, np.minimum(rules.max_lives, b.lives + rules.sitrus_heal), b.lives)
+    b.done |= m & (b.lives <= 0)
+
+
+def _guess_mid(b, a, rules):
+    # engine.guess 와 같은 규칙 (가운데 추측은 항상 범위 안이므로 범위 이탈은 없다)
+    g = (b.lo + b.hi) // 2
+    b.attempts += a
+    hit = a & (g == b.secret)
+    miss = a & ~hit
+    b.lives -= miss
+    cont = miss & (b.lives > 0)
+
+    buffed = cont & (b.xturns > 0)
+    sq = np.where(buffed, np.maximum(1, ((b.hi - b.lo) * rules.x_rate).astype(np.int64)), 0)
+    b.xturns -= buffed
+    still = b.xturns > 0  # 마지막 턴에는 반대쪽 경계는 줄지 않는다
+    up = cont & (g < b.secret)
+    down = cont & ~up
+    lo = np.where(up, np.maximum(b.lo, g + 1 + sq), b.lo)
+    hi = np.where(up & still, np.maximum(b.secret, b.hi - sq), b.hi)
+    hi = np.where(down, np.minimum(hi, g - 1 - sq), hi)
+    lo = np.where(down & still, np.minimum(b.secret, lo + sq), lo)
+    crossed = cont & (lo > hi)
+    b.lo = np.where(crossed, b.secret, lo)
+    b.hi = np.where(crossed, b.secret, hi)
+
+    b.won |= hit
+    b.done |= hit | (miss & ~cont)
+
+
+def play_batch(min_num, max_num, secrets, strategy, rules):
+    b = _Batch(min_num, max_num, secrets, rules)
+    while not b.done.all():
+        a = ~b.done
+        m = strategy.item_mask(b)
+        if m is not None:
+            m &= a
+            if m.any(): _use_items(b, m, strategy.item, rules)
+            a &= ~m
+        _guess_mid(b, a, rules)
+    return b
+
+
+def simulate_range(min_num, max_num, games, strategies=None, rules=None, rng=None, batch_size=1_000_000):
+    # 같은 정답 배열로 모든 전략을 돌린다 (전략 간 차이가 정답 운에 흔들리지 않도록)
+    strategies = strategies or default_strategies()
+    rules = rules or Rules()
+    rng = rng or np.random.default_rng()
+    max_attempts = 64
+    totals = {s.name: {"wins": 0, "attempts": np.zeros(max_attempts + 1, dtype=np.int64)} for s in strategies}
+    done = 0
+    while done < games:
+        n = min(batch_size, games - done)
+        secrets = rng.integers(min_num, max_num + 1, size=n, dtype=np.int64)
+        for s in strategies:
+            b = play_batch(min_num, max_num, secrets, s, rules)
+            t = totals[s.name]
+            t["wins"] += int(b.won.sum())
+            t["attempts"] += np.bincount(np.minimum(b.attempts[b.won], max_attempts), minlength=max_attempts + 1)
+        done += n
+
+    results = {}
+    base = totals[strategies[0].name]["wins"] / games if games else 0.0
+    for s in strategies:
+        t = totals[s.name]
+        wins = t["wins"]
+        hist = t["attempts"]
+        win_rate = wins / games if games else 0.0
+        results[s.name] = {
+            "games": games,
+            "win_rate": win_rate,
+            "avg_attempts": float((hist * np.arange(len(hist))).sum() / wins) if wins else 0.0,
+            "attempts": {int(k): int(v) for k, v in enumerate(hist) if v},  # 성공한 판의 시도 횟수 분포
+            "item_gain": win_rate - base,  # 첫 번째 전략(도구 없음) 대비 승률 변화
+        }
+    return results
+
+
+def simulate_all(games, ranges=None, strategies=None, rules=None, seed=None):
+    ranges = ranges or engine.GENERATIONS
+    rng = np.random.default_rng(seed)
+    return {name: {"range": [lo, hi], **{"strategies": simulate_range(lo, hi, games, strategies, rules, rng)}}
+            for name, (lo, hi) in ranges.items()}
+
+
+def _print_report(report):
+    for name, r in report.items():
+        lo, hi = r["range"]
+        print(f"\n[{name}] {lo}~{hi}")
+        print(f"  {'전략':<20}{'승률':>9}{'평균 시도':>10}{'도구 효과':>10}  시도 횟수 분포(성공)")
+        for s_name, s in r["strategies"].items():
+            dist = " ".join(f"{k}:{v / s['games']:.1%}" for k, v in s["attempts"].items())
+            print(f"  {s_name:<20}{s['win_rate']:>9.2%}{s['avg_attempts']:>10.2f}{s['item_gain']:>+10.2%}  {dist}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UP & DOWN 대량 시뮬레이션 (전략별 승률, 시도 횟수 분포, 도구 효과)")
+    parser.add_argument("--games", type=int, default=200_000, help="범위 하나당 판 수 (모든 전략이 같은 정답 배열을 사용)")
+    parser.add_argument("--range", type=int, nargs=2, metavar=("MIN", "MAX"), help="세대 프리셋 대신 직접 지정한 범위만 시뮬레이션")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-lives", type=int, default=engine.MAX_LIVES)
+    parser.add_argument("--scope-divisor", type=int, default=engine.SCOPE_DIVISOR)
+    parser.add_argument("--x-rate", type=float, default=engine.X_ATTACK_RATE)
+    parser.add_argument("--x-turns", type=int, default=engine.X_ATTACK_TURNS)
+    parser.add_argument("--sitrus-heal", type=int, default=engine.SITRUS_HEAL)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    rules = Rules(args.max_lives, args.scope_divisor, args.x_rate, args.x_turns, args.sitrus_heal)
+    ranges = {engine.CUSTOM_RANGE: tuple(args.range)} if args.range else None
+    t0 = time.perf_counter()
+    report = simulate_all(args.games, ranges, rules=rules, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    total = args.games * len(report) * len(default_strategies())
+    _print_report(report)
+    print(f"\n총 {total:,}판, {elapsed:.2f}초 ({total / elapsed:,.0f}판/초)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rules": rules.as_dict(), "games": args.games, "results": report}, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,318 @@
+import argparse
+import os
+import struct
+import sys
+import time
+from array import array
+
+import updown_engine as engine
+
+# 승률을 최대로 하는 최적 행동을 동적 계획법(메모이제이션)으로 미리 계산해 두는 모듈
+#
+# 플레이어가 아는 정보 = 화면의 범위 [lo, hi], 남은 몬스터볼, 도구 사용 여부, 플러스파워 남은 턴,
+# 그리고 지금까지의 판정으로 좁혀진 "정답 후보 구간" [a, b] (정답은 이 구간 안에서 균등).
+# 플러스파워/스코프렌즈는 정답 위치에 따라 범위를 다르게 바꾸므로 후보 구간이 화면 범위와 달라질 수 있다
+# (예: 플러스파워로 화면 밖으로 밀려난 후보). 상태는 lo 기준으로 정규화해서 범위 위치와 무관하게 공유한다.
+#   u 상태: 도구 미사용 (후보 = 화면 범위)         -> (후보 수 n, 몬스터볼)
+#   x 상태: 플러스파워 지속 중                      -> (폭 w, a-lo, b-lo, 몬스터볼, 남은 턴)
+#   v 상태: 도구 사용 후, 더 이상 범위 변화 효과 없음 -> (화면 왼쪽 밖 후보 수, 화면 안 후보 수, 오른쪽 밖 후보 수, 몬스터볼)
+# 값은 (승률, 남은 기대 시도 횟수)이고, 승률이 같으면 시도 횟수가 적은 행동을 고른다.
+
+TABLE_FILE = "updown_policy.bin"
+MAGIC = b"UDPOLICY"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHHHHdHI")  # magic, 포맷 버전, 최대 몬스터볼, 플러스파워 턴, 스코프렌즈 나눗수, 플러스파워 압축률, 최대 후보 수, 엔트리 수
+
+# 행동 코드 (0 이상은 추측 위치)
+ACT_SCOPE = -1
+ACT_X_ATTACK = -2
+ACT_SITRUS = -3
+ACT_EDGE = -4  # v 상태에서 화면 안에 후보가 없을 때: 후보 쪽 화면 끝을 찔러 정답을 드러낸다
+ITEM_ACTIONS = {ACT_SCOPE: "scope-lens", ACT_X_ATTACK: "x-attack", ACT_SITRUS: "sitrus-berry"}
+
+_EPS = 1e-12
+_OFFSET = 1024  # 키에 음수 오프셋을 담기 위한 바이어스
+
+
+def _better(p, e, best_p, best_e):
+    return p > best_p + _EPS or (p > best_p - _EPS and e < best_e - _EPS)
+
+
+class Solver:
+    def __init__(self):
+        self.memo = {}  # 키 -> (승률, 기대 시도 횟수, 행동)
+
+    def solve_u(self, n, lives):
+        # 도구 미사용: 후보 = 화면 [0, n-1]
+        key = (0, lives, 0, n, 0, 0)
+        hit = self.memo.get(key)
+        if hit is not None: return hit
+        if lives <= 0:
+            result = (0.0, 0.0, None)
+            self.memo[key] = result
+            return result
+
+        best_p, best_e, best_act = -1.0, 0.0, None
+        nl = lives - 1
+        for k in range(n):
+            if nl <= 0:
+                p, e = 1.0 / n, 1.0
+            else:
+                up, down = n - k - 1, k
+                p_up, e_up, _ = self.solve_u(up, nl) if up else (0.0, 0.0, None)
+                p_dn, e_dn, _ = self.solve_u(down, nl) if down else (0.0, 0.0, None)
+                p = (1 + up * p_up + down * p_dn) / n
+                e = 1 + (up * e_up + down * e_dn) / n
+            if _better(p, e, best_p, best_e): best_p, best_e, best_act = p, e, k
+
+        if nl > 0:
+            # 스코프렌즈: 범위 끝에 걸리지 않은 정답은 새 범위로 위치가 드러나고, 나머지는 가운데 구간으로 좁혀진다
+            dist = max(1, (n - 1) // engine.SCOPE_DIVISOR)
+            g_lo, g_hi = max(0, n - 1 - dist), min(n - 1, dist)
+            g = max(0, g_hi - g_lo + 1)
+            p_g, e_g, _ = self.solve_v(0, g, 0, nl) if g else (0.0, 0.0, None)
+            p = ((n - g) + g * p_g) / n
+            e = ((n - g) + g * e_g) / n
+            if _better(p, e, best_p, best_e): best_p, best_e, best_act = p, e, ACT_SCOPE
+            # 플러스파워
+            p, e, _ = self.solve_x(n - 1, 0, n - 1, nl, engine.X_ATTACK_TURNS)
+            if _better(p, e, best_p, best_e): best_p, best_e, best_act = p, e, ACT_X_ATTACK
+        # 자뭉열매 (몬스터볼 1개 소모 후 회복)
+        p, e, _ = self.solve_v(0, n, 0, min(engine.MAX_LIVES, nl + engine.SITRUS_HEAL))
+        if _better(p, e, best_p, best_e): best_p, best_e, best_act = p, e, ACT_SITRUS
+
+        result = (best_p, best_e, best_act)
+        self.memo[key] = result
+        return result
+
+    def solve_v(self, nl, ni, nr, lives):
+        # 도구 사용 후 (플러스파워 효과 없음): 화면 왼쪽 밖 nl, 화면 안 ni, 오른쪽 밖 nr 개의 후보
+        # 화면 밖 후보는 후보 쪽 화면 끝을 찔러 범위를 뒤집어야(lo > hi) 정답이 드러난다
+        key = (1, lives, 0, nl, ni, nr)
+        hit = self.memo.get(key)
+        if hit is not None: return hit
+        n = nl + ni + nr
+        nlv = lives - 1
+        if lives <= 0:
+            result = (0.0, 0.0, None)
+        elif ni == 0:
+            result = (1.0, 2.0, ACT_EDGE) if nlv > 0 else (0.0, 1.0, ACT_EDGE)
+        else:
+            best_p, best_e, best_act = -1.0, 0.0, None
+            for k in range(ni):
+                if nlv <= 0:
+                    p, e = 1.0 / n, 1.0
+                else:
+                    up, down = ni - k - 1 + nr, nl + k
+                    if not up: p_up = e_up = 0.0
+                    elif k == ni - 1: p_up, e_up = 1.0, 1.0  # 화면 오른쪽 끝 -> 범위가 뒤집혀 정답 공개
+                    else: p_up, e_up, _ = self.solve_v(0, ni - k - 1, nr, nlv)
+                    if not down: p_dn = e_dn = 0.0
+                    elif k == 0 and nl: p_dn, e_dn = 1.0, 1.0
+                    else: p_dn, e_dn, _ = self.solve_v(nl, k, 0, nlv)
+                    p = (1 + up * p_up + down * p_dn) / n
+                    e = 1 + (up * e_up + down * e_dn) / n
+                if _better(p, e, best_p, best_e): best_p, best_e, best_act = p, e, k
+            result = (best_p, best_e, best_act)
+        self.memo[key] = result
+        return result
+
+    def _after(self, lo, hi, a, b, lives, xturns):
+        # 추측 결과로 남은 그룹 하나의 (승률, 기대 시도 횟수)
+        if a > b: return 0.0, 0.0
+        if lo > hi: return 1.0, 1.0  # 범위가 뒤집히면 정답이 공개된다
+        if xturns > 0:
+            p, e, _ = self.solve_x(hi - lo, a - lo, b - lo, lives, xturns)
+            return p, e
+        nl = max(0, min(b, lo - 1) - a + 1)
+        ni = max(0, min(b, hi) - max(a, lo) + 1)
+        nr = max(0, b - max(a, hi + 1) + 1)
+        p, e, _ = self.solve_v(nl, ni, nr, lives)
+        return p, e
+
+    def solve_x(self, w, a, b, lives, xturns):
+        # 플러스파워 지속 중: 화면 [0, w], 후보 [a, b] (화면 밖으로 나갈 수 있음)
+        key = (2, lives, xturns, w, a + _OFFSET, b + _OFFSET)
+        hit = self.memo.get(key)
+        if hit is not None: return hit
+        n = b - a + 1
+        nlv = lives - 1
+        if lives <= 0:
+            result = (0.0, 0.0, None)
+            self.memo[key] = result
+            return result
+
+        sq = max(1, int(w * engine.X_ATTACK_RATE))
+        xt = xturns - 1
+        best_p, best_e, best_act = -1.0, 0.0, None
+        for g in range(w + 1):
+            win = 1 if a <= g <= b else 0
+            if nlv <= 0:
+                p, e = win / n, 1.0
+            else:
+                total_p = float(win)
+                total_e = 0.0
+                # UP: 정답 > g
+                ua, ub = max(a, g + 1), b
+                if ua <= ub:
+                    lo2 = max(0, g + 1 + sq)
+                    if xt > 0:
+                        hi2 = w - sq
+                        revealed = max(0, ub - max(ua, hi2 + 1) + 1)  # hi = 정답 으로 드러난 후보
+                        total_p += revealed; total_e += revealed
+                        ub = min(ub, hi2)
+                    else:
+                        hi2 = w
+                    if ua <= ub:
+                        pg, eg = self._after(lo2, hi2, ua, ub, nlv, xt)
+                        total_p += (ub - ua + 1) * pg; total_e += (ub - ua + 1) * eg
+                # DOWN: 정답 < g
+                da, db = a, min(b, g - 1)
+                if da <= db:
+                    hi2 = min(w, g - 1 - sq)
+                    if xt > 0:
+                        lo2 = sq
+                        revealed = max(0, min(db, lo2 - 1) - da + 1)  # lo = 정답 으로 드러난 후보
+                        total_p += revealed; total_e += revealed
+                        da = max(da, lo2)
+                    else:
+                        lo2 = 0
+                    if da <= db:
+                        pg, eg = self._after(lo2, hi2, da, db, nlv, xt)
+                        total_p += (db - da + 1) * pg; total_e += (db - da + 1) * eg
+                p = total_p / n
+                e = 1 + total_e / n
+            if _better(p, e, best_p, best_e): best_p, best_e, best_act = p, e, g
+        result = (best_p, best_e, best_act)
+        self.memo[key] = result
+        return result
+
+
+def state_key(state, a, b):
+    # 게임 상태 + 후보 구간 -> 정규화 키 (solve_* 의 memo 키와 같은 형식)
+    lo, hi, lives = state.lo, state.hi, state.lives
+    if not state.item_used:
+        return (0, lives, 0, hi - lo + 1, 0, 0)
+    if state.xturns > 0:
+        return (2, lives, state.xturns, hi - lo, a - lo + _OFFSET, b - lo + _OFFSET)
+    nl = max(0, min(b, lo - 1) - a + 1)
+    ni = max(0, min(b, hi) - max(a, lo) + 1)
+    nr = max(0, b - max(a, hi + 1) + 1)
+    return (1, lives, 0, nl, ni, nr)
+
+
+def _pack(key):
+    kind, lives, xturns, f1, f2, f3 = key
+    return kind | lives << 2 | xturns << 6 | f1 << 9 | f2 << 21 | f3 << 33
+
+
+def action_to_move(state, a, b, action, kind):
+    # 테이블의 행동 코드 -> (engine.GUESS, 번호) 또는 (engine.ITEM, 도구 키)
+    if action in ITEM_ACTIONS: return engine.ITEM, ITEM_ACTIONS[action]
+    if action == ACT_EDGE: return engine.GUESS, (state.hi if b > state.hi else state.lo)
+    if kind == 1: return engine.GUESS, max(a, state.lo) + action  # v 상태는 화면 안 후보 기준 위치
+    return engine.GUESS, state.lo + action
+
+
+class Belief:
+    # 지금까지의 판정과 일치하는 정답 후보 구간 [a, b]
+    # 매 행동마다 후보 정답 각각으로 같은 행동을 재현해서, 실제와 같은 결과가 나온 후보만 남긴다
+    def __init__(self, state):
+        self.a, self.b = state.lo, state.hi
+
+    def update(self, before, action, arg, event, after):
+        observed = (after.lo, after.hi, after.lives, after.xturns)
+        keep = []
+        for s in range(self.a, self.b + 1):
+            c = before.copy(secret=s)
+            if engine.step(c, action, arg) == event and (c.lo, c.hi, c.lives, c.xturns) == observed: keep.append(s)
+        if keep: self.a, self.b = keep[0], keep[-1]
+
+
+class PolicyTable:
+    # build() 로 만든 최적 행동 테이블. 조회는 dict 한 번 (O(1))
+    def __init__(self, path=TABLE_FILE):
+        with open(path, "rb") as f:
+            raw = f.read()
+        magic, version, max_lives, x_turns, scope_div, x_rate, self.max_n, count = _HEADER.unpack_from(raw, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 테이블 파일: {path}")
+        if (max_lives, x_turns, scope_div, x_rate) != (engine.MAX_LIVES, engine.X_ATTACK_TURNS, engine.SCOPE_DIVISOR, engine.X_ATTACK_RATE):
+            raise ValueError("게임 규칙이 바뀌어 테이블을 다시 만들어야 합니다")
+        off = _HEADER.size
+        keys = array("Q"); keys.frombytes(raw[off:off + 8 * count]); off += 8 * count
+        actions = array("h"); actions.frombytes(raw[off:off + 2 * count]); off += 2 * count
+        probs = array("H"); probs.frombytes(raw[off:off + 2 * count])
+        if sys.byteorder != "little":
+            for arr in (keys, actions, probs): arr.byteswap()
+        self._table = {k: (act, p) for k, act, p in zip(keys, actions, probs)}
+
+    @classmethod
+    def open(cls, path=TABLE_FILE):
+        # 파일이 없거나 규칙이 다르면 None
+        try: return cls(path)
+        except (OSError, ValueError, struct.error): return None
+
+    def __len__(self):
+        return len(self._table)
+
+    def lookup(self, state, belief):
+        # (행동 종류, 인자, 승률) 또는 테이블 범위 밖이면 None
+        if belief.a == belief.b and state.lo <= belief.a <= state.hi:
+            return engine.GUESS, belief.a, 1.0
+        key = state_key(state, belief.a, belief.b)
+        hit = self._table.get(_pack(key))
+        if hit is None: return None
+        action, p = hit
+        move, arg = action_to_move(state, belief.a, belief.b, action, key[0])
+        return move, arg, p / 65535
+
+
+def build(path=TABLE_FILE, max_n=None, log=print):
+    # 모든 세대 프리셋의 시작 상태에서 도달 가능한 상태를 전부 풀어서 테이블로 저장
+    # 상태는 범위 위치와 무관하므로 가장 넓은 프리셋의 후보 수까지만 풀면 모든 프리셋이 포함된다
+    max_n = max_n or max(hi - lo + 1 for lo, hi in engine.GENERATIONS.values())
+    solver = Solver()
+    t0 = time.perf_counter()
+    for n in range(1, max_n + 1):
+        for lives in range(1, engine.MAX_LIVES + 1):
+            solver.solve_u(n, lives)
+    entries = [(key, act, p) for key, (p, _, act) in solver.memo.items() if act is not None]
+    entries.sort()
+    keys = array("Q", (_pack(k) for k, _, _ in entries))
+    actions = array("h", (act for _, act, _ in entries))
+    probs = array("H", (int(round(p * 65535)) for _, _, p in entries))
+    if sys.byteorder != "little":
+        for arr in (keys, actions, probs): arr.byteswap()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, engine.MAX_LIVES, engine.X_ATTACK_TURNS, engine.SCOPE_DIVISOR,
+                             engine.X_ATTACK_RATE, max_n, len(entries)))
+        f.write(keys.tobytes())
+        f.write(actions.tobytes())
+        f.write(probs.tobytes())
+    os.replace(tmp, path)
+    log(f"완료: {path} (후보 {max_n}개까지, 상태 {len(entries):,}개, {os.path.getsize(path):,} bytes, {time.perf_counter() - t0:.1f}초)")
+    for name, (lo, hi) in engine.GENERATIONS.items():
+        p, e, act = solver.solve_u(hi - lo + 1, engine.MAX_LIVES)
+        log(f"  {name}: 최적 승률 {p:.2%}, 평균 시도 {e:.2f}회, 첫 행동 {ITEM_ACTIONS.get(act, f'No.{lo + act}' if act is not None else '-')}")
+    return solver
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UP & DOWN 최적 행동 테이블 생성/확인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="모든 세대 프리셋에 대한 최적 행동 테이블 생성")
+    p_build.add_argument("--out", default=TABLE_FILE)
+    p_build.add_argument("--max-n", type=int, default=None, help="테이블에 담을 최대 후보 수 (기본: 가장 넓은 세대 프리셋)")
+    p_info = sub.add_parser("info", help="테이블 정보 출력")
+    p_info.add_argument("path", nargs="?", default=TABLE_FILE)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.out, args.max_n)
+    else:
+        table = PolicyTable.open(args.path)
+        if table is None:
+            raise SystemExit(f"테이블을 열 수 없습니다: {args.path}")
+        print(f"{args.path}: 후보 {table.max_n}개까지, 상태 {len(table):,}개, 크기 {os.path.getsize(args.path):,} bytes")